@@ -0,0 +1,135 @@
+"""
+📶 Analog Ramps
+Time-based attack/release for keyboard-driven triggers and stick axes.
+
+Keys only move a ramp's target; the value travels towards it at the
+configured rate, advanced once per engine tick by the elapsed time. All
+ramps live in one RampBank that steps only the ramps still moving and
+hooks itself into the engine ticks only while one is - no timers or
+threads per key, and no cost at all when nothing is ramping.
+
+Times are for a full 0 -> 1 travel; 0 means instant (the old behaviour).
+Attack applies while moving away from center, release towards it.
+"""
+
+import time
+
+# Profile keys (see "ramps" in gamepad_profiles.json) and their defaults
+DEFAULT_RAMPS = {
+    'trigger_attack_ms': 0.0,
+    'trigger_release_ms': 0.0,
+    'stick_attack_ms': 0.0,
+    'stick_release_ms': 0.0,
+}
+
+TRIGGERS = ('LT', 'RT')
+LEFT_STICK_AXES = ('LX', 'LY')
+
+
+def parse_ramps(data):
+    """Profile dict (missing keys -> defaults) -> validated settings dict"""
+    ramps = dict(DEFAULT_RAMPS)
+    for key, value in (data or {}).items():
+        if key not in ramps:
+            raise ValueError(f"Unknown ramp setting: {key}")
+        value = float(value)
+        if value < 0:
+            raise ValueError(f"Invalid {key}: {value}")
+        ramps[key] = value
+    return ramps
+
+
+class AnalogRamp:
+    __slots__ = ('value', 'target', 'attack_per_ns', 'release_per_ns')
+
+    def __init__(self, attack_ms=0.0, release_ms=0.0):
+        self.value = 0.0
+        self.target = 0.0
+        self.configure(attack_ms, release_ms)
+
+    def configure(self, attack_ms, release_ms):
+        # Units per nanosecond; None = instant
+        self.attack_per_ns = 1.0 / (attack_ms * 1_000_000) if attack_ms > 0 else None
+        self.release_per_ns = 1.0 / (release_ms * 1_000_000) if release_ms > 0 else None
+
+    def rate(self):
+        value, target = self.value, self.target
+        attacking = abs(target) > abs(value) and (value == 0 or (value > 0) == (target > 0))
+        return self.attack_per_ns if attacking else self.release_per_ns
+
+    def advance(self, dt_ns):
+        """Move towards target; returns True once it got there"""
+        rate = self.rate()
+        diff = self.target - self.value
+        if rate is None or abs(diff) <= rate * dt_ns:
+            self.value = self.target
+            return True
+        self.value += rate * dt_ns if diff > 0 else -rate * dt_ns
+        return False
+
+
+class RampBank:
+    def __init__(self, apply, engine=None, settings=None):
+        # apply(name, value) - called on the engine thread whenever a value moves
+        self.apply = apply
+        self.engine = engine
+        self.ramps = {name: AnalogRamp() for name in TRIGGERS + LEFT_STICK_AXES}
+        self.active = set()
+        self._last_ns = 0
+        self._hooked = False
+        self.configure(settings or DEFAULT_RAMPS)
+
+    def configure(self, settings):
+        for name in TRIGGERS:
+            self.ramps[name].configure(settings['trigger_attack_ms'], settings['trigger_release_ms'])
+        for name in LEFT_STICK_AXES:
+            self.ramps[name].configure(settings['stick_attack_ms'], settings['stick_release_ms'])
+        self.settings = dict(settings)
+
+    def value(self, name):
+        return self.ramps[name].value
+
+    def set_target(self, name, target):
+        """Retarget a ramp (engine thread); instant ramps apply right away"""
+        ramp = self.ramps[name]
+        ramp.target = target
+        if ramp.value == target:
+            self.active.discard(name)
+        elif ramp.rate() is None:
+            ramp.value = target
+            self.active.discard(name)
+            self.apply(name, target)
+        elif name not in self.active:
+            if not self.active:
+                self._last_ns = time.perf_counter_ns()
+            self.active.add(name)
+        self._update_hook()
+
+    def step(self, now_ns):
+        """Engine tick hook - advance every moving ramp by the elapsed time"""
+        dt = now_ns - self._last_ns
+        self._last_ns = now_ns
+        if dt <= 0:
+            return
+        for name in tuple(self.active):
+            ramp = self.ramps[name]
+            if ramp.advance(dt):
+                self.active.discard(name)
+            self.apply(name, ramp.value)
+        self._update_hook()
+
+    def reset(self):
+        for ramp in self.ramps.values():
+            ramp.value = ramp.target = 0.0
+        self.active.clear()
+        self._update_hook()
+
+    def _update_hook(self):
+        # Only tick while something is moving
+        if self.engine is None or bool(self.active) == self._hooked:
+            return
+        self._hooked = bool(self.active)
+        if self._hooked:
+            self.engine.add_tick_hook(self.step)
+        else:
+            self.engine.remove_tick_hook(self.step)
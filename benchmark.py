@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+📊 Input Storm Benchmark
+Headless throughput / latency benchmark for every front-end.
+
+Each front-end (Professional, Enhanced, Standard GUI and the console) is a
+view on the same PadController (pad_controller.py); 'core' drives that
+controller directly, with no front-end on top. All of them are
+built without a window or input hooks on an in-memory backend
+('recording' for X360 reports, 'ds4_recording' for the DualShock 4
+translation), and its real listener callbacks are fed synthetic input storms:
+
+- mouse_1000hz:  a 1000 Hz mouse tracing circles around the screen center
+- wasd_chording: WASD chords held long enough for OS key auto-repeat
+- button_mash:   all 13 button / trigger bindings tapped in turn, 250/s,
+                 each held 20 ms (a fast keyboard tap)
+
+The events are replayed at their real timing (or as fast as possible with
+--unpaced) while the engine runs exactly as it does live. Reported per run:
+events/s, reports/s, process CPU time, peak traced memory during the storm,
+the capture -> report latency percentiles and the dropped taps: presses
+of a button / trigger binding that never showed up in any report. Memory tracing slows every
+allocation down; use --no-memory for undistorted CPU and latency numbers.
+--profile-io times profile persistence with 1000 (or N) profiles: load
+and full write of the old single JSON file against the per-profile store,
+plus what a single save costs the UI thread and until it is on disk.
+No display, driver or pynput is needed:
+
+    python benchmark.py
+    python benchmark.py --frontends pro,console --duration 5 --json results.json
+    python benchmark.py --backends recording,ds4_recording
+    python benchmark.py --frontends "" --profile-io 1000
+"""
+
+import argparse
+import contextlib
+import importlib
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from key_dispatch import BUTTON_ACTIONS, DEFAULT_BUTTON_MAPPINGS, TRIGGER
+from profile_store import ProfileStore, LEGACY_PROFILES
+from report_scheduler import DEFAULT_REPORT_RATE, parse_report_rate
+
+FRONTENDS = ('core', 'pro', 'enhanced', 'standard', 'console')
+SCENARIOS = ('mouse_1000hz', 'wasd_chording', 'button_mash')
+BACKENDS = ('recording', 'ds4_recording')
+DEFAULT_DURATION_S = 2.0
+DEFAULT_PROFILE_COUNT = 1000
+# Saves of one profile in quick succession (debounce check)
+SAVE_BURST = 50
+
+# GUI front-ends: name -> (module, class)
+GUI_CLASSES = {
+    'pro': ('gamepad_gui_pro', 'GamepadGUIPro'),
+    'enhanced': ('gamepad_gui_enhanced', 'GamepadGUIEnhanced'),
+    'standard': ('gamepad_gui', 'GamepadGUI'),
+}
+
+# Timeline event kinds
+DOWN = 'down'
+UP = 'up'
+MOVE = 'move'
+
+# OS keyboard auto-repeat (Windows defaults): delay before the first repeat, then the interval
+REPEAT_DELAY_NS = 250_000_000
+REPEAT_INTERVAL_NS = 33_000_000
+
+WASD_CHORDS = ('w', 'wa', 'wd', 's', 'sa', 'sd', 'a', 'd', 'wasd')
+CHORD_HOLD_NS = 400_000_000
+CHORD_GAP_NS = 50_000_000
+CHORD_STAGGER_NS = 15_000_000   # keys of a chord never go down on the same instant
+
+MASH_INTERVAL_NS = 4_000_000    # one press every 4 ms...
+MASH_HOLD_NS = 20_000_000       # ...released 20 ms later, like a fast tap
+
+
+class SyntheticKey:
+    """Stand-in for a pynput KeyCode - normalize_key() only reads .char"""
+    __slots__ = ('char',)
+
+    def __init__(self, char):
+        self.char = char
+
+    def __repr__(self):
+        return repr(self.char)
+
+
+_keys = {}
+
+
+def key(char):
+    # One object per key, like pynput, so the producer does not allocate per event
+    if char not in _keys:
+        _keys[char] = SyntheticKey(char)
+    return _keys[char]
+
+
+# ==========================
+# Scenarios - sorted (t_ns, kind, a, b) timelines
+# ==========================
+def mouse_1000hz(duration_s):
+    events = []
+    for i in range(int(duration_s * 1000)):
+        angle = 2 * math.pi * i / 1000
+        x = 960 + round(400 * math.cos(angle))
+        y = 540 + round(300 * math.sin(angle))
+        events.append((i * 1_000_000, MOVE, x, y))
+    return events
+
+
+def wasd_chording(duration_s):
+    end = int(duration_s * 1_000_000_000)
+    events = []
+    t = 0
+    i = 0
+    while t < end:
+        chord = WASD_CHORDS[i % len(WASD_CHORDS)]
+        for n, char in enumerate(chord):
+            events.append((t + n * CHORD_STAGGER_NS, DOWN, key(char), None))
+        # Only the last key pressed auto-repeats
+        release = t + CHORD_HOLD_NS
+        repeat = t + (len(chord) - 1) * CHORD_STAGGER_NS + REPEAT_DELAY_NS
+        while repeat < release:
+            events.append((repeat, DOWN, key(chord[-1]), None))
+            repeat += REPEAT_INTERVAL_NS
+        for char in chord:
+            events.append((release, UP, key(char), None))
+        t = release + CHORD_GAP_NS
+        i += 1
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+def button_mash(duration_s):
+    keys = [key(char) for char in DEFAULT_BUTTON_MAPPINGS.values()]
+    events = []
+    for i in range(int(duration_s * 1_000_000_000) // MASH_INTERVAL_NS):
+        t = i * MASH_INTERVAL_NS
+        k = keys[i % len(keys)]
+        events.append((t, DOWN, k, None))
+        events.append((t + MASH_HOLD_NS, UP, k, None))
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+SCENARIO_BUILDERS = {
+    'mouse_1000hz': mouse_1000hz,
+    'wasd_chording': wasd_chording,
+    'button_mash': button_mash,
+}
+
+
+# ==========================
+# Front-ends
+# ==========================
+def print_log(message, *args):
+    print(message.format(*args))
+
+
+def open_frontend(name, rate, logging, backend='recording'):
+    """Headless front-end -> (engine, on_press, on_release, on_mouse_move)"""
+    if name == 'core':
+        from pad_controller import PadController
+        controller = PadController(backend, rate, log=print_log if logging else None).start()
+        return controller.engine, controller.key_down, controller.key_up, controller.mouse_move
+
+    if name == 'console':
+        import test_gamepad
+        test_gamepad.logging_enabled = logging
+        engine = test_gamepad.setup(backend, rate)
+        return engine, test_gamepad.on_press, test_gamepad.on_release, test_gamepad.on_mouse_move
+
+    module_name, class_name = GUI_CLASSES[name]
+    cls = getattr(importlib.import_module(module_name), class_name)
+    app = cls(backend, headless=True)
+    app.logging_enabled = logging
+    app.is_running = True
+    if rate != app.report_rate:
+        app.controller.set_rate(rate)
+    return app.engine, app.on_key_press, app.on_key_release, app.on_mouse_move
+
+
+def replay(events, on_press, on_release, on_mouse_move, paced=True):
+    """Feed a timeline to the listener callbacks; late events go out back to back"""
+    start = time.perf_counter_ns()
+    for t, kind, a, b in events:
+        if paced:
+            delay = start + t - time.perf_counter_ns()
+            if delay > 0:
+                time.sleep(delay / 1_000_000_000)
+        if kind == MOVE:
+            on_mouse_move(a, b)
+        elif kind == DOWN:
+            on_press(a)
+        else:
+            on_release(a)
+
+
+def dropped_taps(events, gamepad):
+    """Presses of a button / trigger binding that no report showed - None if the reports are not all kept"""
+    if not hasattr(gamepad, 'records') or gamepad.dropped:
+        return None
+    # Key -> (record field, button bit); triggers count as pressed above 0
+    fields = {}
+    for name, char in DEFAULT_BUTTON_MAPPINGS.items():
+        action = BUTTON_ACTIONS[name]
+        if action.kind == TRIGGER:
+            fields[char] = (2 if name == 'LT' else 3, None)
+        else:
+            fields[char] = (1, action.mask)
+    # New presses only - auto-repeats of a held key are not taps
+    presses = dict.fromkeys(fields, 0)
+    held = set()
+    for t, kind, a, b in events:
+        if kind == DOWN and a.char in fields and a.char not in held:
+            held.add(a.char)
+            presses[a.char] += 1
+        elif kind == UP:
+            held.discard(a.char)
+    shown = dict.fromkeys(fields, 0)
+    pressed = dict.fromkeys(fields, False)
+    for record in gamepad.records():
+        for char, (index, mask) in fields.items():
+            on = bool(record[index] & mask) if mask else record[index] > 0
+            if on and not pressed[char]:
+                shown[char] += 1
+            pressed[char] = on
+    return sum(max(presses[char] - shown[char], 0) for char in fields)
+
+
+def run_scenario(frontend, scenario, duration_s=DEFAULT_DURATION_S, rate=DEFAULT_REPORT_RATE,
+                 paced=True, trace_memory=True, logging=False, backend='recording'):
+    events = SCENARIO_BUILDERS[scenario](duration_s)
+    engine, on_press, on_release, on_mouse_move = open_frontend(frontend, rate, logging, backend)
+    # Front-end construction is not part of the measurement
+    engine.call(engine.reset_stats)
+
+    if trace_memory:
+        tracemalloc.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    replay(events, on_press, on_release, on_mouse_move, paced)
+    engine.stop()   # applies whatever is still queued and flushes the last report
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    stats = engine.stats()
+    return {
+        'frontend': frontend,
+        'scenario': scenario,
+        'backend': backend,
+        'paced': paced,
+        'report_rate': rate,
+        'wall_s': wall,
+        'events': len(events),
+        'events_applied': stats['events'],
+        'events_per_s': len(events) / wall,
+        'reports': stats['reports_sent'],
+        'reports_suppressed': stats['reports_suppressed'],
+        'reports_per_s': stats['reports_sent'] / wall,
+        'cpu_s': cpu,
+        'cpu_pct': cpu / wall * 100,
+        'peak_memory_kb': peak / 1024 if peak is not None else None,
+        'max_batch': stats['max_batch'],
+        'errors': stats['errors'],
+        'dropped_taps': dropped_taps(events, engine.gamepad),
+        'latency': {source: summary for source, summary in stats['latency'].items() if summary['count']},
+    }
+
+
+# ==========================
+# Profile persistence
+# ==========================
+def _sample_profile():
+    try:
+        with open(LEGACY_PROFILES, 'r', encoding='utf-8') as f:
+            return next(iter(json.load(f).values()))
+    except (OSError, ValueError, StopIteration):
+        return {'button_mappings': dict(DEFAULT_BUTTON_MAPPINGS), 'sensitivity': 1.0}
+
+
+def _ms(start):
+    return (time.perf_counter() - start) * 1000
+
+
+def run_profile_io(count=DEFAULT_PROFILE_COUNT):
+    """Single JSON file (old) vs one file per profile (ProfileStore), in a temp directory"""
+    sample = _sample_profile()
+    profiles = {f"Profile {i:04d}": dict(sample, sensitivity=1.0 + i / count) for i in range(count)}
+    name = next(iter(profiles))
+    result = {'profiles': count}
+    with tempfile.TemporaryDirectory() as directory:
+        legacy = os.path.join(directory, LEGACY_PROFILES)
+        start = time.perf_counter()
+        with open(legacy, 'w') as f:
+            json.dump(profiles, f, indent=2)
+        result['single_file_write_ms'] = _ms(start)
+        start = time.perf_counter()
+        with open(legacy, 'r') as f:
+            json.load(f)
+        result['single_file_load_ms'] = _ms(start)
+
+        store = ProfileStore(os.path.join(directory, 'profiles'), legacy)
+        start = time.perf_counter()
+        for profile_name, profile in profiles.items():
+            store.save(profile_name, profile)
+        store.flush()
+        result['store_write_all_ms'] = _ms(start)
+        start = time.perf_counter()
+        loaded = ProfileStore(store.directory).load()
+        result['store_load_ms'] = _ms(start)
+        result['store_loaded'] = len(loaded)
+
+        # One save: what the caller (Tk thread) pays, then the time until it is durable
+        start = time.perf_counter()
+        store.save(name, profiles[name])
+        result['store_save_caller_us'] = _ms(start) * 1000
+        store.flush()
+        result['store_save_durable_ms'] = _ms(start)
+
+        writes = store.writes
+        for _ in range(SAVE_BURST):
+            store.save(name, profiles[name])
+        store.flush()
+        result['burst_saves'] = SAVE_BURST
+        result['burst_writes'] = store.writes - writes
+        store.close()
+        result['errors'] = store.errors
+    return result
+
+
+def format_profile_io(r):
+    return "\n".join([
+        f"Profiles: {r['profiles']}",
+        f"  single JSON file   write {r['single_file_write_ms']:8.1f} ms   load {r['single_file_load_ms']:8.1f} ms"
+        f"   (every save rewrote all of it on the Tk thread)",
+        f"  per-profile store  write {r['store_write_all_ms']:8.1f} ms   load {r['store_load_ms']:8.1f} ms"
+        f"   (all profiles, fsync + rename each)",
+        f"  one save: {r['store_save_caller_us']:.0f} us on the caller, durable after {r['store_save_durable_ms']:.1f} ms",
+        f"  {r['burst_saves']} saves in a burst -> {r['burst_writes']} write(s)",
+    ])
+
+
+def run(frontends=FRONTENDS, scenarios=SCENARIOS, duration_s=DEFAULT_DURATION_S, rate=DEFAULT_REPORT_RATE,
+        paced=True, trace_memory=True, logging=False, backends=('recording',), profile_io=0):
+    """Every front-end x scenario x backend (+ profile persistence); returns the JSON document"""
+    results = []
+    for frontend in frontends:
+        for scenario in scenarios:
+            for backend in backends:
+                print(f"⏳ {frontend} / {scenario} / {backend}...", file=sys.stderr)
+                try:
+                    # Core and console logging print every action - keep it off the report
+                    with open(os.devnull, 'w', encoding='utf-8') as sink:
+                        with contextlib.redirect_stdout(sink if frontend in ('core', 'console') else sys.stdout):
+                            results.append(run_scenario(frontend, scenario, duration_s, rate,
+                                                        paced, trace_memory, logging, backend))
+                except Exception as e:
+                    print(f"❌ {frontend} / {scenario} / {backend} failed: {e}", file=sys.stderr)
+                    results.append({'frontend': frontend, 'scenario': scenario, 'backend': backend,
+                                    'error': str(e)})
+    document = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'duration_s': duration_s,
+            'report_rate': rate,
+            'paced': paced,
+            'memory_traced': trace_memory,
+            'logging': logging,
+            'backends': list(backends),
+        },
+        'results': results,
+    }
+    if profile_io:
+        print(f"⏳ profile persistence / {profile_io} profiles...", file=sys.stderr)
+        document['profile_io'] = run_profile_io(profile_io)
+    return document
+
+
+def format_results(document):
+    lines = [f"{'front-end':<10} {'scenario':<14} {'backend':<13} {'events/s':>9} {'reports/s':>9} {'cpu%':>6} "
+             f"{'peak KB':>8} {'p50 us':>8} {'p99 us':>8} {'dropped':>8}"]
+    for r in document['results']:
+        if 'error' in r:
+            lines.append(f"{r['frontend']:<10} {r['scenario']:<14} {r['backend']:<13} error: {r['error']}")
+            continue
+        # Percentiles of the source the scenario drives
+        latency = max(r['latency'].values(), key=lambda s: s['count'], default=None)
+        p50 = f"{latency['p50_us']:.0f}" if latency else '-'
+        p99 = f"{latency['p99_us']:.0f}" if latency else '-'
+        peak = f"{r['peak_memory_kb']:.0f}" if r['peak_memory_kb'] is not None else '-'
+        dropped = r['dropped_taps'] if r['dropped_taps'] is not None else '-'
+        lines.append(f"{r['frontend']:<10} {r['scenario']:<14} {r['backend']:<13} {r['events_per_s']:>9.0f} "
+                     f"{r['reports_per_s']:>9.0f} {r['cpu_pct']:>6.1f} {peak:>8} {p50:>8} {p99:>8} {dropped:>8}")
+    if 'profile_io' in document:
+        lines.append(format_profile_io(document['profile_io']))
+    return "\n".join(lines)
+
+
+def _names(value, allowed):
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    for name in names:
+        if name not in allowed:
+            raise argparse.ArgumentTypeError(f"unknown name {name!r} (choose from {', '.join(allowed)})")
+    return names
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless input storm benchmark for all front-ends")
+    parser.add_argument('--frontends', type=lambda v: _names(v, FRONTENDS), default=list(FRONTENDS),
+                        help=f"comma-separated subset of: {', '.join(FRONTENDS)}")
+    parser.add_argument('--scenarios', type=lambda v: _names(v, SCENARIOS), default=list(SCENARIOS),
+                        help=f"comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument('--backends', type=lambda v: _names(v, BACKENDS), default=['recording'],
+                        help=f"comma-separated subset of: {', '.join(BACKENDS)}")
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION_S,
+                        help="seconds of input per scenario")
+    parser.add_argument('--rate', type=parse_report_rate, default=DEFAULT_REPORT_RATE,
+                        help="report rate: 125/250/500/1000 or 'immediate'")
+    parser.add_argument('--unpaced', action='store_true', help="post events as fast as possible")
+    parser.add_argument('--no-memory', action='store_true', help="skip tracemalloc (faster, undistorted timings)")
+    parser.add_argument('--with-logging', action='store_true', help="keep the front-end action log on")
+    parser.add_argument('--profile-io', nargs='?', type=int, const=DEFAULT_PROFILE_COUNT, default=0, metavar='N',
+                        help=f"also time profile load/save with N profiles (default {DEFAULT_PROFILE_COUNT})")
+    parser.add_argument('--json', metavar='PATH', help="write the results as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    document = run(args.frontends, args.scenarios, args.duration, args.rate,
+                   not args.unpaced, not args.no_memory, args.with_logging, args.backends, args.profile_io)
+    if args.json == '-':
+        json.dump(document, sys.stdout, indent=2)
+        print()
+        return document
+    print(format_results(document))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"💾 Results saved to {args.json}")
+    return document
+
+
+if __name__ == '__main__':
+    main()
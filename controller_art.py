@@ -0,0 +1,313 @@
+"""
+🖼️ Controller Art
+Resolution-independent controller drawing for the GUI canvases.
+
+The layout follows the canvas size: positions are fractions of the width
+and height, sizes scale with the smaller side (600 x 400 = scale 1). The
+static body - shell, grips, stick wells, D-pad, trigger bar wells - is
+rendered with Pillow once per size and theme into a PhotoImage, kept in
+a small LRU, and shown as a single image item. Only the dynamic overlays
+are live canvas items: stick knobs, buttons (highlights) with their
+labels and the trigger bars, moved in place when the size changes
+(pad_canvas.PadCanvas updates them while playing). Resizes are debounced
+on <Configure>.
+
+Pillow is imported on first use (use_images(), after the first frame);
+until then, and without Pillow, the body is drawn with canvas items on
+the same layout.
+
+    python controller_art.py    # resize / play redraw cost: vector body vs cached image
+"""
+
+import math
+import time
+from collections import OrderedDict
+
+# Reference size of the layout (scale 1.0)
+BASE_WIDTH = 600
+BASE_HEIGHT = 400
+# Resizes closer together than this are laid out once, at the end
+RESIZE_DEBOUNCE_MS = 80
+# Body images kept (sizes x themes)
+ART_CACHE_SIZE = 8
+# The body is drawn at this multiple and downsampled (anti-aliased edges)
+SUPERSAMPLE = 2
+
+THEMES = {
+    'pro': {
+        'background': '#2a2a2a', 'body': '#333333', 'body_outline': '#666666',
+        'well': '#444444', 'well_outline': '#777777', 'dpad': '#555555', 'dpad_outline': '#888888',
+        'bar_well': '#1f1f1f', 'bar': '#bb66ff', 'knob': '#00ff00', 'knob_outline': '#00cc00',
+        'label': 'white',
+    },
+    'enhanced': {
+        'background': '#1a1a1a', 'body': '#333333', 'body_outline': '#666666',
+        'well': '#444444', 'well_outline': '#777777', 'dpad': '#555555', 'dpad_outline': '#888888',
+        'bar_well': '#111111', 'bar': '#bb66ff', 'knob': '#00ff00', 'knob_outline': '#00cc00',
+        'label': 'white',
+    },
+}
+
+# name -> (shape, center x, center y (fractions), radius / half size, fill, outline, label, font size)
+BUTTONS = {
+    'A': ('oval', 0.65, 0.45, (15, 15), '#ff0000', '#cc0000', "A", 10),
+    'B': ('oval', 0.70, 0.40, (15, 15), '#00ff00', '#00cc00', "B", 10),
+    'X': ('oval', 0.60, 0.45, (15, 15), '#0000ff', '#0000cc', "X", 10),
+    'Y': ('oval', 0.65, 0.50, (15, 15), '#ffff00', '#cccc00', "Y", 10),
+    'Back': ('oval', 0.45, 0.40, (12, 12), '#ff8800', '#cc6600', "Back", 7),
+    'Start': ('oval', 0.55, 0.40, (12, 12), '#ff8800', '#cc6600', "Start", 7),
+    'Guide': ('oval', 0.50, 0.35, (12, 12), '#ff8800', '#cc6600', "Xbox", 6),
+    'LT': ('rect', 0.20, 0.25, (20, 7), '#8800ff', '#6600cc', "LT", 8),
+    'RT': ('rect', 0.80, 0.25, (20, 7), '#8800ff', '#6600cc', "RT", 8),
+}
+# Stick name (snapshot field) -> center (fractions); well radius, knob radius, knob travel
+STICKS = {'left': (0.25, 0.5), 'right': (0.75, 0.5)}
+WELL_RADIUS, KNOB_RADIUS, KNOB_TRAVEL = 25, 8, 15
+# Trigger bar (snapshot field) -> trigger button it sits under
+BARS = {'lt': 'LT', 'rt': 'RT'}
+
+
+def rounded_points(x1, y1, x2, y2, radius):
+    """Smoothed polygon points of a rounded rectangle (canvas create_polygon(smooth=True))"""
+    points = []
+    for x, y in [(x1, y1 + radius), (x1, y1), (x1 + radius, y1),
+                 (x2 - radius, y1), (x2, y1), (x2, y1 + radius),
+                 (x2, y2 - radius), (x2, y2), (x2 - radius, y2),
+                 (x1 + radius, y2), (x1, y2), (x1, y2 - radius)]:
+        points.extend([x, y])
+    return points
+
+
+def layout(width, height):
+    """Geometry of every part for a canvas size (pixels)"""
+    s = min(width / BASE_WIDTH, height / BASE_HEIGHT)
+    body = {
+        'shell': (width * 0.1, height * 0.3, width * 0.9, height * 0.7, 20 * s, 3 * s),
+        'grips': [(width * 0.05, height * 0.4, width * 0.15, height * 0.6, 15 * s, 2 * s),
+                  (width * 0.85, height * 0.4, width * 0.95, height * 0.6, 15 * s, 2 * s)],
+        'wells': [(width * fx, height * fy, WELL_RADIUS * s) for fx, fy in STICKS.values()],
+        'dpad': (width * 0.4, height * 0.5, 20 * s),
+        'bar_wells': [],
+    }
+    buttons = {}
+    for name, (shape, fx, fy, (rx, ry), *_) in BUTTONS.items():
+        x, y = width * fx, height * fy
+        buttons[name] = (x - rx * s, y - ry * s, x + rx * s, y + ry * s)
+    bars = {}
+    for name, button in BARS.items():
+        x1, y1, x2, y2 = buttons[button]
+        bars[name] = (x1, y2 + 4 * s, x2, y2 + 8 * s)
+        body['bar_wells'].append(bars[name])
+    knobs = {name: (width * fx, height * fy) for name, (fx, fy) in STICKS.items()}
+    return {'scale': s, 'body': body, 'buttons': buttons, 'bars': bars, 'knobs': knobs}
+
+
+def render_body(width, height, theme, Image, ImageDraw):
+    """The static body as a Pillow image (drawn SUPERSAMPLE times larger, then downsampled)"""
+    colors = THEMES[theme]
+    k = SUPERSAMPLE
+    body = layout(width * k, height * k)['body']
+    image = Image.new('RGB', (width * k, height * k), colors['background'])
+    draw = ImageDraw.Draw(image)
+
+    for x1, y1, x2, y2, radius, line in [body['shell']] + body['grips']:
+        draw.rounded_rectangle((x1, y1, x2, y2), radius=radius, fill=colors['body'],
+                               outline=colors['body_outline'], width=max(1, round(line)))
+    for x, y, r in body['wells']:
+        draw.ellipse((x - r, y - r, x + r, y + r), fill=colors['well'],
+                     outline=colors['well_outline'], width=2 * k)
+    x, y, size = body['dpad']
+    draw.polygon([(x, y - size), (x + size, y), (x, y + size), (x - size, y)],
+                 fill=colors['dpad'], outline=colors['dpad_outline'])
+    for bbox in body['bar_wells']:
+        draw.rectangle(bbox, fill=colors['bar_well'])
+    return image.reduce(k) if k > 1 else image
+
+
+class ControllerArt:
+    """Body image + live overlays of one controller canvas"""
+
+    def __init__(self, canvas, theme, view):
+        self.canvas = canvas
+        self.theme = theme
+        self.colors = THEMES[theme]
+        # pad_canvas.PadCanvas - keeps the overlays showing the controller state
+        self.view = view
+        self.size = None
+        self.pil = None
+        self.images = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.layouts = 0
+        self._after_id = None
+        self._pending = None
+
+        # Overlays - created once, placed by relayout(); bindings use the btn_* tags
+        colors = self.colors
+        self.image_item = None
+        self.bar_items = {name: canvas.create_rectangle(0, 0, 0, 0, fill=colors['bar'], width=0)
+                          for name in BARS}
+        self.button_items = {}
+        self.label_items = {}
+        for name, (shape, _, _, _, fill, outline, label, _) in BUTTONS.items():
+            if shape == 'oval':
+                item = canvas.create_oval(0, 0, 0, 0, fill=fill, outline=outline, width=2, tags=f'btn_{name}')
+            else:
+                item = canvas.create_polygon(rounded_points(0, 0, 0, 0, 0), smooth=True, fill=fill,
+                                             outline=outline, width=2, tags=f'btn_{name}')
+            self.button_items[name] = item
+            # Same tag as the button, so a click on the label presses it too
+            self.label_items[name] = canvas.create_text(0, 0, text=label, fill=colors['label'],
+                                                        tags=f'btn_{name}')
+            view.add_button(name, item, fill)
+        self.knob_items = {name: canvas.create_oval(0, 0, 0, 0, fill=colors['knob'],
+                                                    outline=colors['knob_outline'], width=2,
+                                                    tags=f'{name}_joystick')
+                           for name in STICKS}
+
+        self.relayout(canvas.winfo_reqwidth(), canvas.winfo_reqheight())
+        canvas.bind('<Configure>', self.on_configure)
+
+    def use_images(self):
+        """Switch the body to cached Pillow images - False if Pillow is not installed"""
+        try:
+            from PIL import Image, ImageDraw, ImageTk
+        except ImportError:
+            return False
+        self.pil = (Image, ImageDraw, ImageTk)
+        self.relayout(*self.size, force=True)
+        return True
+
+    # ==========================
+    # Resize (Tk thread)
+    # ==========================
+    def on_configure(self, event):
+        # Laid out once the size has settled, not for every step of a drag
+        self._pending = (event.width, event.height)
+        if self._after_id is not None:
+            self.canvas.after_cancel(self._after_id)
+        self._after_id = self.canvas.after(RESIZE_DEBOUNCE_MS, self.apply_pending_size)
+
+    def apply_pending_size(self):
+        self._after_id = None
+        if self._pending:
+            self.relayout(*self._pending)
+
+    def relayout(self, width, height, force=False):
+        width, height = max(int(width), 1), max(int(height), 1)
+        if (width, height) == self.size and not force:
+            return
+        self.size = (width, height)
+        self.layouts += 1
+        canvas = self.canvas
+        geometry = layout(width, height)
+        s = geometry['scale']
+
+        if self.pil is not None:
+            canvas.delete('body')
+            if self.image_item is None:
+                self.image_item = canvas.create_image(0, 0, anchor='nw')
+            canvas.itemconfigure(self.image_item, image=self.body_image(width, height))
+            canvas.tag_lower(self.image_item)
+        else:
+            self.draw_body_vector(geometry['body'])
+
+        for name, (x1, y1, x2, y2) in geometry['buttons'].items():
+            font_size = BUTTONS[name][7]
+            if BUTTONS[name][0] == 'oval':
+                canvas.coords(self.button_items[name], x1, y1, x2, y2)
+            else:
+                canvas.coords(self.button_items[name], *rounded_points(x1, y1, x2, y2, 5 * s))
+            canvas.coords(self.label_items[name], (x1 + x2) / 2, (y1 + y2) / 2)
+            canvas.itemconfigure(self.label_items[name], font=('Arial', max(5, round(font_size * s)), 'bold'))
+        for name, bbox in geometry['bars'].items():
+            self.view.add_bar(name, self.bar_items[name], bbox)
+        for name, center in geometry['knobs'].items():
+            self.view.add_knob(name, self.knob_items[name], center, KNOB_TRAVEL * s, KNOB_RADIUS * s)
+        self.view.flush()
+
+    def body_image(self, width, height):
+        key = (width, height, self.theme)
+        photo = self.images.get(key)
+        if photo is not None:
+            self.images.move_to_end(key)
+            self.hits += 1
+            return photo
+        self.misses += 1
+        Image, ImageDraw, ImageTk = self.pil
+        photo = ImageTk.PhotoImage(render_body(width, height, self.theme, Image, ImageDraw),
+                                   master=self.canvas)
+        self.images[key] = photo
+        if len(self.images) > ART_CACHE_SIZE:
+            self.images.popitem(last=False)
+        return photo
+
+    def draw_body_vector(self, body):
+        # Without Pillow (and before the first frame) - same parts as canvas items
+        canvas = self.canvas
+        colors = self.colors
+        canvas.delete('body')
+        for x1, y1, x2, y2, radius, line in [body['shell']] + body['grips']:
+            canvas.create_polygon(rounded_points(x1, y1, x2, y2, radius), smooth=True, fill=colors['body'],
+                                  outline=colors['body_outline'], width=line, tags='body')
+        for x, y, r in body['wells']:
+            canvas.create_oval(x - r, y - r, x + r, y + r, fill=colors['well'],
+                               outline=colors['well_outline'], width=2, tags='body')
+        x, y, size = body['dpad']
+        canvas.create_polygon(x, y - size, x + size, y, x, y + size, x - size, y,
+                              fill=colors['dpad'], outline=colors['dpad_outline'], width=2, tags='body')
+        for bbox in body['bar_wells']:
+            canvas.create_rectangle(*bbox, fill=colors['bar_well'], width=0, tags='body')
+        canvas.tag_lower('body')
+
+    def format_stats(self):
+        return (f"Art: {self.size[0]}x{self.size[1]} {'image' if self.pil else 'vector'}, "
+                f"{self.layouts} layouts, cache {self.hits} hits / {self.misses} renders")
+
+
+def benchmark(sizes=((600, 400), (800, 533), (1000, 667), (1280, 853)), frames=300):
+    """Tk time per resize and per play frame: vector body vs cached image (needs a display)"""
+    import tkinter as tk
+    from pad_canvas import PadCanvas
+    from render_state import RenderState
+
+    root = tk.Tk()
+    root.geometry(f"{sizes[-1][0]}x{sizes[-1][1]}")
+    results = {}
+    for mode in ('vector', 'image'):
+        canvas = tk.Canvas(root, width=BASE_WIDTH, height=BASE_HEIGHT, bg=THEMES['pro']['background'],
+                           highlightthickness=0)
+        canvas.pack(fill=tk.BOTH, expand=True)
+        root.update()
+        view = PadCanvas(canvas)
+        art = ControllerArt(canvas, 'pro', view)
+        if mode == 'image' and not art.use_images():
+            canvas.destroy()
+            break
+
+        # Resize: every size once (image: cache misses), then again (image: hits)
+        for label in ('resize', 'resize_cached'):
+            start = time.perf_counter()
+            for width, height in sizes:
+                art.relayout(width, height, force=True)
+                canvas.update_idletasks()
+            results[f'{label}_{mode}_ms'] = (time.perf_counter() - start) * 1000 / len(sizes)
+
+        # Play: sticks circling and the triggers pulsing, one render + repaint per frame
+        start = time.perf_counter()
+        for i in range(frames):
+            a = i * 0.1
+            level = (i % 30) / 30
+            snap = RenderState(i, (math.cos(a), math.sin(a)), (math.sin(a), math.cos(a)),
+                               level, 1.0 - level, frozenset(), {})
+            view.render(snap, frozenset(), time.perf_counter())
+            canvas.update_idletasks()
+        results[f'play_{mode}_ms'] = (time.perf_counter() - start) * 1000 / frames
+        canvas.destroy()
+    root.destroy()
+    return results
+
+
+if __name__ == '__main__':
+    for name, value in benchmark().items():
+        print(f"{name:>22}: {value:8.2f} ms")
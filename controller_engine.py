@@ -0,0 +1,335 @@
+"""
+🎛️ Controller Engine
+Single-writer output thread fed by a thread-safe event queue.
+
+Listener callbacks (pynput keyboard/mouse threads, Tk) only post small
+timestamped events. One output thread owns the gamepad: it applies the
+queued events in timestamp order and drives the report scheduler ticks.
+Extra virtual pads (see virtual_pads.py) get their own scheduler, ticked
+by the same thread on the same tick, so all pads go out as one batch.
+
+Every input event carries its capture time and source; once the report
+that first reflects it has been submitted, capture -> submission latency
+goes into that source's histogram.
+"""
+
+import queue
+import threading
+import time
+from collections import namedtuple
+from operator import itemgetter
+
+from report_scheduler import ReportScheduler, DEFAULT_REPORT_RATE
+from render_state import PadState
+from latency_histogram import LatencyHistogram
+
+# Event kinds
+KEY_DOWN = 0
+KEY_UP = 1
+MOUSE_MOVE = 2
+CALL = 3        # run a callable on the output thread
+_STOP = 4
+
+# Event sources (latency histograms are kept per source)
+KEYBOARD = 'keyboard'
+MOUSE = 'mouse'
+GUI_CLICK = 'gui'
+NETWORK = 'network'
+SOURCES = (KEYBOARD, MOUSE, GUI_CLICK, NETWORK)
+
+_DEFAULT_SOURCES = {KEY_DOWN: KEYBOARD, KEY_UP: KEYBOARD, MOUSE_MOVE: MOUSE}
+
+# ts: perf_counter_ns() at capture, a/b: payload (key / x, y / fn, args),
+# source: one of SOURCES (None for internal calls - a CALL posted with a
+# source, e.g. a network frame, is timed like an input event)
+InputEvent = namedtuple('InputEvent', 'ts kind a b source')
+
+# Tick hook clock while the scheduler is in 'immediate' mode
+IMMEDIATE_HOOK_POLL_S = 0.001
+
+_event_time = itemgetter(0)
+
+
+class ControllerEngine:
+    def __init__(self, gamepad, handler=None, rate=DEFAULT_REPORT_RATE):
+        self.gamepad = gamepad
+        # handler(event) is called on the output thread for input events
+        self.handler = handler
+        self.scheduler = ReportScheduler(gamepad, rate, threaded=False)
+
+        # Visible state - written on the output thread, published as an
+        # immutable snapshot that the UI thread reads without locking
+        self.state = PadState()
+        self.snapshot = self.state.snapshot()
+
+        # fn(now_ns) called once per report tick on the output thread, after
+        # the batch was applied - for state that is computed per tick
+        self.tick_hooks = ()
+
+        # Schedulers of the extra pads - replaced whole, read by the output thread
+        self.pad_schedulers = ()
+
+        # Capture -> report latency per source, plus events whose report is not out yet
+        self.latency = {source: LatencyHistogram() for source in SOURCES}
+        self._pending = []
+
+        # Optional InputCapture recording every input event posted (see input_capture.py)
+        self.capture = None
+
+        # threading.Event that cuts the tick wait short for call_now() - set only
+        # while something needs sub-tick timing (macro playback), else plain sleeps
+        self.wake = None
+
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._running = False
+
+        self.reset_stats()
+
+    # ==========================
+    # Producer side (any thread)
+    # ==========================
+    def post(self, kind, a=None, b=None, source=None):
+        """Enqueue an input event - safe to call from any listener thread"""
+        event = InputEvent(time.perf_counter_ns(), kind, a, b, source or _DEFAULT_SOURCES.get(kind))
+        self._queue.put(event)
+        capture = self.capture
+        if capture is not None and kind <= MOUSE_MOVE:
+            capture.record(event)
+
+    def call(self, fn, *args):
+        """Run fn(*args) on the output thread, in order with input events"""
+        self.post(CALL, fn, args)
+
+    def call_now(self, fn, *args):
+        """call() that wakes the output thread right away when self.wake is set"""
+        self.call(fn, *args)
+        wake = self.wake
+        if wake is not None:
+            wake.set()
+
+    def set_rate(self, rate):
+        self.call(self._set_rate, rate)
+
+    def set_gamepad(self, gamepad):
+        """Output thread - switch to another device (a profile asked for another output)"""
+        self.gamepad = gamepad
+        self.scheduler.gamepad = gamepad
+
+    def add_pad(self, gamepad):
+        """Service another gamepad from this thread; returns its scheduler"""
+        scheduler = ReportScheduler(gamepad, self.scheduler.rate, threaded=False)
+        scheduler.start()
+        self.pad_schedulers = self.pad_schedulers + (scheduler,)
+        return scheduler
+
+    def remove_pad(self, scheduler):
+        self.pad_schedulers = tuple(s for s in self.pad_schedulers if s is not scheduler)
+        # Whatever is still pending goes out first
+        self.call(scheduler.stop)
+
+    def add_tick_hook(self, fn):
+        if fn not in self.tick_hooks:
+            self.tick_hooks = self.tick_hooks + (fn,)
+
+    def remove_tick_hook(self, fn):
+        self.tick_hooks = tuple(hook for hook in self.tick_hooks if hook != fn)
+
+    # ==========================
+    # Lifecycle
+    # ==========================
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self.scheduler.start()
+        self._thread = threading.Thread(target=self._run, name="controller-engine", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Apply everything still queued, flush the last report and stop"""
+        if not self._running:
+            return
+        self.post(_STOP)
+        self._thread.join(timeout=2.0)
+        self._thread = None
+        self._running = False
+
+    # ==========================
+    # Output thread
+    # ==========================
+    def _run(self):
+        scheduler = self.scheduler
+        q = self._queue
+        while True:
+            if scheduler.immediate:
+                # Wake up on every event and send right away; tick hooks
+                # still need a clock, so poll at 1 ms while any are set
+                try:
+                    batch = [q.get(timeout=IMMEDIATE_HOOK_POLL_S if self.tick_hooks else None)]
+                except queue.Empty:
+                    batch = []
+                ticked = True
+            else:
+                # False when woken early by call_now() - no tick this round
+                ticked = scheduler.wait_next_tick(self.wake)
+                batch = []
+            while True:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+
+            submitted = self._submitted()
+            stop = self._apply(batch) if batch else False
+            if self.tick_hooks and ticked:
+                self._run_tick_hooks()
+            if ticked and not scheduler.immediate:
+                scheduler.tick()
+                for pad_scheduler in self.pad_schedulers:
+                    pad_scheduler.tick()
+            if self._pending:
+                sent = self._submitted() != submitted
+                # After an early wake unsent events wait for the real tick
+                if sent or ticked:
+                    self._record_latency(sent)
+            if self.state.changed:
+                self.snapshot = self.state.snapshot()
+            if stop:
+                break
+        scheduler.stop()
+        for pad_scheduler in self.pad_schedulers:
+            pad_scheduler.stop()
+
+    def _set_rate(self, rate):
+        self.scheduler.set_rate(rate)
+        for pad_scheduler in self.pad_schedulers:
+            pad_scheduler.set_rate(rate)
+
+    def _submitted(self):
+        # Reports submitted by all pads
+        submitted = self.gamepad.submitted
+        for pad_scheduler in self.pad_schedulers:
+            submitted += pad_scheduler.gamepad.submitted
+        return submitted
+
+    def _requests(self):
+        requests = self.scheduler.requests
+        for pad_scheduler in self.pad_schedulers:
+            requests += pad_scheduler.requests
+        return requests
+
+    def _record_latency(self, sent):
+        # Reports identical to the previous one are suppressed - those events
+        # did not change the output and are only counted
+        if sent:
+            now = time.perf_counter_ns()
+            latency = self.latency
+            for event in self._pending:
+                latency[event.source].record(now - event.ts)
+        else:
+            self.latency_noop += len(self._pending)
+        self._pending.clear()
+
+    def _run_tick_hooks(self):
+        now = time.perf_counter_ns()
+        for hook in self.tick_hooks:
+            try:
+                hook(now)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+
+    def _apply(self, batch):
+        depth = len(batch)
+        if depth > self.max_batch:
+            self.max_batch = depth
+        if depth > 1:
+            # Keyboard and mouse threads post independently - restore capture order
+            batch.sort(key=_event_time)
+
+        stop = False
+        handler = self.handler
+        for event in batch:
+            delay = time.perf_counter_ns() - event.ts
+            self.events += 1
+            self.delay_total_ns += delay
+            if delay > self.delay_max_ns:
+                self.delay_max_ns = delay
+
+            kind = event.kind
+            try:
+                if kind == _STOP:
+                    stop = True
+                elif kind == CALL and not event.source:
+                    event.a(*event.b)
+                elif kind == CALL or handler:
+                    requests = self._requests()
+                    if kind == CALL:
+                        event.a(*event.b)
+                    else:
+                        handler(event)
+                    # Time events that changed a pad (or fed a tick hook) to the
+                    # report that carries them, sent at the end of this iteration
+                    if event.source and (self._requests() != requests or self.tick_hooks):
+                        self._pending.append(event)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+        return stop
+
+    # ==========================
+    # Metrics
+    # ==========================
+    def reset_stats(self):
+        self.events = 0
+        self.errors = 0
+        self.last_error = None
+        self.max_batch = 0
+        self.delay_total_ns = 0
+        self.delay_max_ns = 0
+        self.latency_noop = 0
+        for histogram in self.latency.values():
+            histogram.reset()
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        stats = self.scheduler.stats()
+        if hasattr(self.gamepad, 'diff_stats'):
+            stats.update(self.gamepad.diff_stats())
+        stats.update({
+            'events': self.events,
+            'errors': self.errors,
+            'queue_depth': self.queue_depth,
+            'max_batch': self.max_batch,
+            'queue_delay_avg_us': self.delay_total_ns / max(self.events, 1) / 1000,
+            'queue_delay_max_us': self.delay_max_ns / 1000,
+            'latency_noop': self.latency_noop,
+            'latency': self.latency_stats(),
+        })
+        return stats
+
+    def latency_stats(self):
+        """{source: histogram summary} - capture to report submission"""
+        return {source: histogram.summary() for source, histogram in self.latency.items()}
+
+    def format_latency(self):
+        lines = []
+        for source, histogram in self.latency.items():
+            if histogram.count:
+                lines.append(f"Latency {source}: {histogram.format()}")
+        return '\n'.join(lines) or "Latency: no samples"
+
+    def format_stats(self):
+        s = self.stats()
+        lines = [self.scheduler.format_stats()]
+        if 'reports_sent' in s:
+            lines.append(f"Driver: {s['reports_sent']} sent, {s['reports_suppressed']} duplicates "
+                         f"suppressed ({s['suppressed_pct']:.0f}%)")
+        lines.append(f"Events: {s['events']} | queue depth {s['queue_depth']} (max batch {s['max_batch']}) | "
+                     f"queue delay avg {s['queue_delay_avg_us']:.0f}us max {s['queue_delay_max_us']:.0f}us")
+        lines.append(self.format_latency())
+        return '\n'.join(lines)
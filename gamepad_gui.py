@@ -1,42 +1,72 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import vgamepad as vg
-from pynput import keyboard, mouse
-import threading
-import time
+from output_backends import DEFAULT_BACKEND
+from report_scheduler import REPORT_RATES, DEFAULT_REPORT_RATE, parse_report_rate
+from pad_controller import PadController
+from render_state import RenderLoop
+from pad_canvas import PadCanvas
+from status_log import StatusLog
+from startup_profile import StartupProfile
+from input_capture import InputCapture
+from stick_filters import FILTERS, StickFilter, format_step_response
+from mouse_stick import MOUSE_MODES
 import math
 
 class GamepadGUI:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("🎮 Virtual Xbox Controller - GUI")
-        self.root.geometry("800x600")
-        self.root.configure(bg='#2b2b2b')
-        
-        # Gamepad instance
-        self.gamepad = vg.VX360Gamepad()
+    def __init__(self, backend=DEFAULT_BACKEND, headless=False, startup=None):
+        # headless: no window or input hooks - the engine and handlers only
+        # (benchmark.py drives the listener callbacks directly)
+        self.headless = headless
+        # Startup phases - printed with --startup-profile
+        self.startup = startup or StartupProfile()
         
         # Settings
-        self.sensitivity = 1.0
-        self.mouse_sensitivity = 0.5
-        self.mouse_enabled = True
         self.logging_enabled = True
-        
-        # Mouse center
-        self.mouse_center_x = 960
-        self.mouse_center_y = 540
-        
-        # Pressed keys tracking
-        self.pressed_keys = set()
+        # Status lines from any thread - written to the widget by the render loop
+        self.status_log = StatusLog()
+        
+        # Pad controller - the headless core shared by every front-end: device,
+        # engine (single output thread, report scheduler, pad state), key
+        # dispatch (fixed default layout in this GUI), ramps, curves and the
+        # mouse stick. 'vgamepad' drives the real virtual pad, 'recording'
+        # keeps the reports in memory for headless runs. Plugging in the
+        # virtual device takes a while, so with a window an in-memory stand-in
+        # takes the reports until it is ready (start_device)
+        self.backend = backend
+        self.report_rate = DEFAULT_REPORT_RATE
+        self.controller = PadController(backend, self.report_rate, stand_in=not headless,
+                                        log=self.log_status).start()
+        self.engine = self.controller.engine
+        self.startup.mark("engine")
+        
+        # Window - built while the device is created on a worker thread
+        self.root = None
+        if not headless:
+            self.controller.start_device(self.startup)
+            self.root = tk.Tk()
+            self.root.title("🎮 Virtual Xbox Controller - GUI")
+            self.root.geometry("800x600")
+            self.root.configure(bg='#2b2b2b')
+            self.startup.mark("Tk root")
         
         # GUI state
         self.is_running = False
         self.keyboard_listener = None
+        self.capture = None
         self.mouse_listener = None
         
+        # Render state - Tk is only touched from the render loop on the UI thread;
+        # the view keeps the knob item ID and applies only what changed
+        self.pad_view = None
+        # Created in finish_startup, once the window is on screen
+        self.render_loop = None
+        
         # Create GUI
-        self.create_widgets()
-        self.setup_listeners()
+        if not headless:
+            self.create_widgets()
+            self.startup.mark("widgets (visible tab)")
+            self.setup_listeners()
+            self.startup.mark("listeners")
         
     def create_widgets(self):
         # Main frame
@@ -61,11 +91,14 @@ class GamepadGUI:
         # Controller tab
         self.create_controller_tab(notebook)
         
-        # Settings tab
-        self.create_settings_tab(notebook)
-        
-        # Status tab
-        self.create_status_tab(notebook)
+        # Settings and Status tabs - hidden at startup, so only their frames
+        # exist for the first frame (see build_hidden_tabs)
+        self.hidden_tabs = []
+        for text, build in (("⚙️ Settings", self.create_settings_tab),
+                            ("📊 Status", self.create_status_tab)):
+            frame = tk.Frame(notebook, bg='#2b2b2b')
+            notebook.add(frame, text=text)
+            self.hidden_tabs.append((frame, build))
         
         # Control buttons
         self.create_control_buttons(main_frame)
@@ -92,7 +125,9 @@ class GamepadGUI:
         
         # Draw joystick base
         self.left_joystick_canvas.create_oval(20, 20, 180, 180, fill='#555555', outline='#777777', width=2)
-        self.left_joystick_canvas.create_oval(90, 90, 110, 110, fill='#00ff00', outline='#00cc00', width=2, tags='left_knob')
+        knob = self.left_joystick_canvas.create_oval(90, 90, 110, 110, fill='#00ff00', outline='#00cc00', width=2, tags='left_knob')
+        self.pad_view = PadCanvas(self.left_joystick_canvas)
+        self.pad_view.add_knob('left', knob, (100, 100), 60, 10)
         
         # Right side - Buttons
         right_frame = tk.Frame(controller_frame, bg='#2b2b2b')
@@ -141,6 +176,19 @@ class GamepadGUI:
         self.btn_dpad_down = self.create_button(dpad_buttons_frame, "↓ (2)", '#cccccc', 1, 2)
         self.btn_dpad_right = self.create_button(dpad_buttons_frame, "→ (4)", '#cccccc', 2, 1)
         
+        # Button name -> (widget, idle color), highlighted by the view
+        button_widgets = {
+            'A': (self.btn_a, '#ff0000'), 'B': (self.btn_b, '#00ff00'),
+            'X': (self.btn_x, '#0000ff'), 'Y': (self.btn_y, '#ffff00'),
+            'Back': (self.btn_back, '#ff8800'), 'Start': (self.btn_start, '#ff8800'),
+            'Guide': (self.btn_guide, '#ff8800'),
+            'LT': (self.btn_lt, '#8800ff'), 'RT': (self.btn_rt, '#8800ff'),
+            'DPad_Up': (self.btn_dpad_up, '#cccccc'), 'DPad_Down': (self.btn_dpad_down, '#cccccc'),
+            'DPad_Left': (self.btn_dpad_left, '#cccccc'), 'DPad_Right': (self.btn_dpad_right, '#cccccc')
+        }
+        for button_name, (button_obj, color) in button_widgets.items():
+            self.pad_view.add_widget(button_name, button_obj, color)
+        
     def create_button(self, parent, text, color, row, col):
         btn = tk.Button(parent, text=text, width=8, height=2, 
                        bg=color, fg='white', font=('Arial', 8, 'bold'),
@@ -148,10 +196,12 @@ class GamepadGUI:
         btn.grid(row=row, column=col, padx=2, pady=2)
         return btn
         
-    def create_settings_tab(self, notebook):
-        settings_frame = tk.Frame(notebook, bg='#2b2b2b')
-        notebook.add(settings_frame, text="⚙️ Settings")
+    def build_hidden_tabs(self):
+        for frame, build in self.hidden_tabs:
+            build(frame)
+        self.hidden_tabs = []
         
+    def create_settings_tab(self, settings_frame):
         # Sensitivity settings
         sensitivity_frame = tk.LabelFrame(settings_frame, text="Sensitivity Settings", 
                                         font=('Arial', 12, 'bold'), fg='white', bg='#2b2b2b')
@@ -161,13 +211,13 @@ class GamepadGUI:
         tk.Label(sensitivity_frame, text="Joystick Sensitivity:", 
                 font=('Arial', 10), fg='white', bg='#2b2b2b').pack(anchor=tk.W, padx=10, pady=5)
         
-        self.sensitivity_var = tk.DoubleVar(value=self.sensitivity)
+        self.sensitivity_var = tk.DoubleVar(value=self.controller.sensitivity)
         self.sensitivity_scale = tk.Scale(sensitivity_frame, from_=0.1, to=2.0, resolution=0.1,
                                          orient=tk.HORIZONTAL, variable=self.sensitivity_var,
                                          command=self.update_sensitivity, bg='#404040', fg='white')
         self.sensitivity_scale.pack(fill=tk.X, padx=10, pady=5)
         
-        self.sensitivity_label = tk.Label(sensitivity_frame, text=f"Current: {self.sensitivity:.1f}", 
+        self.sensitivity_label = tk.Label(sensitivity_frame, text=f"Current: {self.controller.sensitivity:.1f}", 
                                          font=('Arial', 10), fg='#00ff00', bg='#2b2b2b')
         self.sensitivity_label.pack(anchor=tk.W, padx=10, pady=5)
         
@@ -175,13 +225,13 @@ class GamepadGUI:
         tk.Label(sensitivity_frame, text="Mouse Sensitivity:", 
                 font=('Arial', 10), fg='white', bg='#2b2b2b').pack(anchor=tk.W, padx=10, pady=5)
         
-        self.mouse_sensitivity_var = tk.DoubleVar(value=self.mouse_sensitivity)
+        self.mouse_sensitivity_var = tk.DoubleVar(value=self.controller.mouse_sensitivity)
         self.mouse_sensitivity_scale = tk.Scale(sensitivity_frame, from_=0.1, to=2.0, resolution=0.1,
                                                orient=tk.HORIZONTAL, variable=self.mouse_sensitivity_var,
                                                command=self.update_mouse_sensitivity, bg='#404040', fg='white')
         self.mouse_sensitivity_scale.pack(fill=tk.X, padx=10, pady=5)
         
-        self.mouse_sensitivity_label = tk.Label(sensitivity_frame, text=f"Current: {self.mouse_sensitivity:.1f}", 
+        self.mouse_sensitivity_label = tk.Label(sensitivity_frame, text=f"Current: {self.controller.mouse_sensitivity:.1f}", 
                                                font=('Arial', 10), fg='#00ff00', bg='#2b2b2b')
         self.mouse_sensitivity_label.pack(anchor=tk.W, padx=10, pady=5)
         
@@ -191,12 +241,32 @@ class GamepadGUI:
         control_frame.pack(fill=tk.X, padx=20, pady=20)
         
         # Mouse control toggle
-        self.mouse_enabled_var = tk.BooleanVar(value=self.mouse_enabled)
+        self.mouse_enabled_var = tk.BooleanVar(value=self.controller.mouse_enabled)
         mouse_check = tk.Checkbutton(control_frame, text="Enable Mouse Control", 
                                    variable=self.mouse_enabled_var, command=self.toggle_mouse_control,
                                    font=('Arial', 10), fg='white', bg='#2b2b2b', selectcolor='#404040')
         mouse_check.pack(anchor=tk.W, padx=10, pady=5)
         
+        # Mouse mode
+        tk.Label(control_frame, text="Mouse Mode:", 
+                font=('Arial', 10), fg='white', bg='#2b2b2b').pack(anchor=tk.W, padx=10, pady=5)
+        
+        self.mouse_mode_var = tk.StringVar(value=self.controller.mouse_mode)
+        mouse_mode_combo = ttk.Combobox(control_frame, textvariable=self.mouse_mode_var,
+                                        values=MOUSE_MODES, state='readonly', width=10)
+        mouse_mode_combo.pack(anchor=tk.W, padx=10, pady=5)
+        mouse_mode_combo.bind('<<ComboboxSelected>>', self.update_mouse_mode)
+        
+        # Right stick filter
+        tk.Label(control_frame, text="Right Stick Filter:", 
+                font=('Arial', 10), fg='white', bg='#2b2b2b').pack(anchor=tk.W, padx=10, pady=5)
+        
+        self.stick_filter_var = tk.StringVar(value=self.controller.stick_filter.kind)
+        stick_filter_combo = ttk.Combobox(control_frame, textvariable=self.stick_filter_var,
+                                          values=FILTERS, state='readonly', width=10)
+        stick_filter_combo.pack(anchor=tk.W, padx=10, pady=5)
+        stick_filter_combo.bind('<<ComboboxSelected>>', self.update_stick_filter)
+        
         # Logging toggle
         self.logging_enabled_var = tk.BooleanVar(value=self.logging_enabled)
         logging_check = tk.Checkbutton(control_frame, text="Enable Logging", 
@@ -204,10 +274,17 @@ class GamepadGUI:
                                      font=('Arial', 10), fg='white', bg='#2b2b2b', selectcolor='#404040')
         logging_check.pack(anchor=tk.W, padx=10, pady=5)
         
-    def create_status_tab(self, notebook):
-        status_frame = tk.Frame(notebook, bg='#2b2b2b')
-        notebook.add(status_frame, text="📊 Status")
+        # Report rate
+        tk.Label(control_frame, text="Report Rate (Hz):", 
+                font=('Arial', 10), fg='white', bg='#2b2b2b').pack(anchor=tk.W, padx=10, pady=5)
+        
+        self.report_rate_var = tk.StringVar(value=str(self.report_rate))
+        report_rate_combo = ttk.Combobox(control_frame, textvariable=self.report_rate_var,
+                                         values=[str(r) for r in REPORT_RATES], state='readonly', width=10)
+        report_rate_combo.pack(anchor=tk.W, padx=10, pady=5)
+        report_rate_combo.bind('<<ComboboxSelected>>', self.update_report_rate)
         
+    def create_status_tab(self, status_frame):
         # Status display
         tk.Label(status_frame, text="Controller Status", font=('Arial', 12, 'bold'), 
                 fg='white', bg='#2b2b2b').pack(pady=10)
@@ -226,6 +303,19 @@ class GamepadGUI:
                             bg='#ff4444', fg='white', font=('Arial', 10, 'bold'))
         clear_btn.pack(pady=10)
         
+        # Capture -> report latency per input source
+        self.latency_label = tk.Label(status_frame, text="Latency: no samples", justify=tk.LEFT,
+                                      font=('Consolas', 9), fg='#00ff00', bg='#2b2b2b')
+        self.latency_label.pack(anchor=tk.W, padx=5, pady=2)
+        
+        latency_btn = tk.Button(status_frame, text="Dump Latency", command=self.dump_latency,
+                                bg='#4444ff', fg='white', font=('Arial', 10, 'bold'))
+        latency_btn.pack(pady=10)
+        
+        self.capture_btn = tk.Button(status_frame, text="⏺ Record Input", command=self.toggle_capture,
+                                     bg='#aa3333', fg='white', font=('Arial', 10, 'bold'))
+        self.capture_btn.pack(pady=10)
+        
     def create_control_buttons(self, parent):
         control_frame = tk.Frame(parent, bg='#2b2b2b')
         control_frame.pack(fill=tk.X, pady=10)
@@ -246,16 +336,37 @@ class GamepadGUI:
         self.reset_btn.pack(side=tk.LEFT, padx=5)
         
     def update_sensitivity(self, value):
-        self.sensitivity = float(value)
-        self.sensitivity_label.config(text=f"Current: {self.sensitivity:.1f}")
+        self.controller.set_sensitivity(float(value))
+        self.sensitivity_label.config(text=f"Current: {self.controller.sensitivity:.1f}")
         
     def update_mouse_sensitivity(self, value):
-        self.mouse_sensitivity = float(value)
-        self.mouse_sensitivity_label.config(text=f"Current: {self.mouse_sensitivity:.1f}")
+        self.controller.set_mouse_sensitivity(float(value))
+        self.mouse_sensitivity_label.config(text=f"Current: {self.controller.mouse_sensitivity:.1f}")
+        
+    def update_mouse_mode(self, event=None):
+        self.set_mouse_mode(self.mouse_mode_var.get())
+        
+    def set_mouse_mode(self, mode):
+        self.controller.set_mouse_mode(mode)
+        self.log_status(f"Mouse mode: {mode}")
+        
+    def update_stick_filter(self, event=None):
+        self.set_stick_filter(StickFilter(self.stick_filter_var.get()))
+        
+    def set_stick_filter(self, stick_filter):
+        self.controller.set_stick_filter(stick_filter)
+        tick_hz = self.report_rate if self.report_rate != 'immediate' else 1000
+        self.log_status(f"Right stick filter: {stick_filter.kind} "
+                        f"({format_step_response(stick_filter.kind, stick_filter.params, tick_hz)})")
+        
+    def update_report_rate(self, event=None):
+        self.report_rate = parse_report_rate(self.report_rate_var.get())
+        self.controller.set_rate(self.report_rate)
+        self.log_status(f"Report rate: {self.report_rate}")
         
     def toggle_mouse_control(self):
-        self.mouse_enabled = self.mouse_enabled_var.get()
-        status = "Enabled" if self.mouse_enabled else "Disabled"
+        self.controller.set_mouse_enabled(self.mouse_enabled_var.get())
+        status = "Enabled" if self.controller.mouse_enabled else "Disabled"
         self.log_status(f"Mouse control: {status}")
         
     def toggle_logging(self):
@@ -263,31 +374,48 @@ class GamepadGUI:
         status = "Enabled" if self.logging_enabled else "Disabled"
         self.log_status(f"Logging: {status}")
         
-    def log_status(self, message):
+    def log_status(self, message, *args):
+        # Safe from any thread - message.format(*args) only runs when the
+        # render loop flushes the entry to the widget (a few times per second)
         if self.logging_enabled:
-            timestamp = time.strftime("%H:%M:%S")
-            log_message = f"[{timestamp}] {message}\n"
-            self.status_text.insert(tk.END, log_message)
-            self.status_text.see(tk.END)
+            self.status_log.append(message, args)
+            
+    def flush_status_log(self):
+        self.status_log.flush(self.status_text)
             
     def clear_status(self):
+        self.status_log.clear()
         self.status_text.delete(1.0, tk.END)
         
-    def update_left_joystick_visual(self, x, y):
-        # Update visual representation
-        center_x, center_y = 100, 100
-        knob_x = center_x + (x * 60)  # Scale to joystick area
-        knob_y = center_y - (y * 60)  # Invert Y for display
-        
-        # Keep knob within bounds
-        knob_x = max(30, min(170, knob_x))
-        knob_y = max(30, min(170, knob_y))
-        
-        self.left_joystick_canvas.coords('left_knob', knob_x-10, knob_y-10, knob_x+10, knob_y+10)
-        
-    def press_button_visual(self, button_name, button_obj):
-        button_obj.config(relief=tk.SUNKEN, bg='#ffffff')
-        self.root.after(100, lambda: button_obj.config(relief=tk.RAISED, bg=button_obj.cget('bg')))
+    def update_latency_display(self):
+        self.latency_label.config(text="\n".join([self.engine.format_latency(), self.controller.keys.format_stats(),
+                                                  self.render_loop.format_stats()]))
+        self.root.after(500, self.update_latency_display)
+        
+    def dump_latency(self):
+        self.log_status("Latency (capture -> report submitted):")
+        for line in self.engine.format_latency().split('\n'):
+            self.log_status(line)
+        
+    def toggle_capture(self):
+        # Records every input event posted to the engine (replay: input_capture.py)
+        if self.capture is None:
+            try:
+                self.capture = InputCapture().start(self.engine)
+            except OSError as e:
+                self.log_status(f"Error starting capture: {e}")
+                return
+            self.capture_btn.config(text="⏹ Stop Recording")
+            self.log_status(f"Recording input to {self.capture.path}")
+        else:
+            self.stop_capture()
+            
+    def stop_capture(self):
+        if self.capture is not None:
+            capture, self.capture = self.capture, None
+            capture.stop()
+            self.capture_btn.config(text="⏺ Record Input")
+            self.log_status(f"Saved {capture.records} input events to {capture.path}")
         
     def start_controller(self):
         if not self.is_running:
@@ -303,22 +431,19 @@ class GamepadGUI:
             self.start_btn.config(state=tk.NORMAL)
             self.stop_btn.config(state=tk.DISABLED)
             self.log_status("Controller stopped!")
+            self.log_status(self.engine.format_stats())
+            self.log_status(self.controller.keys.format_stats())
             self.cleanup_listeners()
             
     def reset_controller(self):
-        # Reset all controller inputs
-        self.gamepad.left_joystick_float(0, 0)
-        self.gamepad.right_joystick_float(0, 0)
-        self.gamepad.left_trigger_float(0)
-        self.gamepad.right_trigger_float(0)
-        self.gamepad.update()
-        
-        # Reset visual
-        self.update_left_joystick_visual(0, 0)
+        # Reset all controller inputs (applied on the engine thread)
+        self.controller.reset()
         self.log_status("Controller reset!")
         
     def setup_listeners(self):
         if self.is_running:
+            from pynput import keyboard, mouse
+            
             # Keyboard listener
             self.keyboard_listener = keyboard.Listener(
                 on_press=self.on_key_press,
@@ -335,241 +460,61 @@ class GamepadGUI:
             self.keyboard_listener.stop()
         if self.mouse_listener:
             self.mouse_listener.stop()
+        self.controller.release_keys()
             
+    # Listener callbacks - only enqueue, the controller's engine thread applies them
     def on_key_press(self, key):
-        try:
-            if hasattr(key, 'char') and key.char:
-                char = key.char.lower()
-                
-                # Movement keys
-                if char in ['w', 'a', 's', 'd']:
-                    self.pressed_keys.add(char)
-                    self.update_movement()
-                    
-                # Action buttons
-                elif char == 't':
-                    self.press_button_visual("A", self.btn_a)
-                    self.gamepad.press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_A)
-                    self.gamepad.update()
-                    self.log_status("Button A pressed")
-                    
-                elif char == 'y':
-                    self.press_button_visual("B", self.btn_b)
-                    self.gamepad.press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_B)
-                    self.gamepad.update()
-                    self.log_status("Button B pressed")
-                    
-                elif char == 'g':
-                    self.press_button_visual("X", self.btn_x)
-                    self.gamepad.press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_X)
-                    self.gamepad.update()
-                    self.log_status("Button X pressed")
-                    
-                elif char == 'h':
-                    self.press_button_visual("Y", self.btn_y)
-                    self.gamepad.press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_Y)
-                    self.gamepad.update()
-                    self.log_status("Button Y pressed")
-                    
-                # System buttons
-                elif char == 'z':
-                    self.press_button_visual("Back", self.btn_back)
-                    self.gamepad.press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_BACK)
-                    self.gamepad.update()
-                    self.log_status("Back button pressed")
-                    
-                elif char == 'x':
-                    self.press_button_visual("Start", self.btn_start)
-                    self.gamepad.press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_START)
-                    self.gamepad.update()
-                    self.log_status("Start button pressed")
-                    
-                elif char == 'c':
-                    self.press_button_visual("Guide", self.btn_guide)
-                    self.gamepad.press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_GUIDE)
-                    self.gamepad.update()
-                    self.log_status("Guide button pressed")
-                    
-                # Triggers
-                elif char == 'u':
-                    self.press_button_visual("LT", self.btn_lt)
-                    self.gamepad.left_trigger_float(1.0)
-                    self.gamepad.update()
-                    self.log_status("LT pressed")
-                    
-                elif char == 'o':
-                    self.press_button_visual("RT", self.btn_rt)
-                    self.gamepad.right_trigger_float(1.0)
-                    self.gamepad.update()
-                    self.log_status("RT pressed")
-                    
-                # D-Pad
-                elif char == '1':
-                    self.press_button_visual("D-Pad Up", self.btn_dpad_up)
-                    self.gamepad.press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP)
-                    self.gamepad.update()
-                    self.log_status("D-Pad Up pressed")
-                    
-                elif char == '2':
-                    self.press_button_visual("D-Pad Down", self.btn_dpad_down)
-                    self.gamepad.press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN)
-                    self.gamepad.update()
-                    self.log_status("D-Pad Down pressed")
-                    
-                elif char == '3':
-                    self.press_button_visual("D-Pad Left", self.btn_dpad_left)
-                    self.gamepad.press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT)
-                    self.gamepad.update()
-                    self.log_status("D-Pad Left pressed")
-                    
-                elif char == '4':
-                    self.press_button_visual("D-Pad Right", self.btn_dpad_right)
-                    self.gamepad.press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT)
-                    self.gamepad.update()
-                    self.log_status("D-Pad Right pressed")
-                    
-        except Exception as e:
-            self.log_status(f"Error in key press: {e}")
-            
-    def on_key_release(self, key):
-        try:
-            if hasattr(key, 'char') and key.char:
-                char = key.char.lower()
-                
-                # Movement keys
-                if char in ['w', 'a', 's', 'd']:
-                    self.pressed_keys.discard(char)
-                    self.update_movement()
-                    
-                # Action buttons
-                elif char == 't':
-                    self.gamepad.release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_A)
-                    self.gamepad.update()
-                    self.log_status("Button A released")
-                    
-                elif char == 'y':
-                    self.gamepad.release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_B)
-                    self.gamepad.update()
-                    self.log_status("Button B released")
-                    
-                elif char == 'g':
-                    self.gamepad.release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_X)
-                    self.gamepad.update()
-                    self.log_status("Button X released")
-                    
-                elif char == 'h':
-                    self.gamepad.release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_Y)
-                    self.gamepad.update()
-                    self.log_status("Button Y released")
-                    
-                # System buttons
-                elif char == 'z':
-                    self.gamepad.release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_BACK)
-                    self.gamepad.update()
-                    self.log_status("Back button released")
-                    
-                elif char == 'x':
-                    self.gamepad.release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_START)
-                    self.gamepad.update()
-                    self.log_status("Start button released")
-                    
-                elif char == 'c':
-                    self.gamepad.release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_GUIDE)
-                    self.gamepad.update()
-                    self.log_status("Guide button released")
-                    
-                # Triggers
-                elif char == 'u':
-                    self.gamepad.left_trigger_float(0)
-                    self.gamepad.update()
-                    self.log_status("LT released")
-                    
-                elif char == 'o':
-                    self.gamepad.right_trigger_float(0)
-                    self.gamepad.update()
-                    self.log_status("RT released")
-                    
-                # D-Pad
-                elif char == '1':
-                    self.gamepad.release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP)
-                    self.gamepad.update()
-                    self.log_status("D-Pad Up released")
-                    
-                elif char == '2':
-                    self.gamepad.release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN)
-                    self.gamepad.update()
-                    self.log_status("D-Pad Down released")
-                    
-                elif char == '3':
-                    self.gamepad.release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT)
-                    self.gamepad.update()
-                    self.log_status("D-Pad Left released")
-                    
-                elif char == '4':
-                    self.gamepad.release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT)
-                    self.gamepad.update()
-                    self.log_status("D-Pad Right released")
-                    
-        except Exception as e:
-            self.log_status(f"Error in key release: {e}")
-            
-    def update_movement(self):
-        x, y = 0.0, 0.0
-        
-        if 'w' in self.pressed_keys: y += 1.0
-        if 's' in self.pressed_keys: y -= 1.0
-        if 'a' in self.pressed_keys: x -= 1.0
-        if 'd' in self.pressed_keys: x += 1.0
-        
-        # Normalize diagonal movement
-        if x != 0 and y != 0:
-            x *= 0.707
-            y *= 0.707
-            
-        # Apply sensitivity
-        adjusted_x = x * self.sensitivity
-        adjusted_y = y * self.sensitivity
+        self.controller.key_down(key)
         
-        # Update controller
-        self.gamepad.left_joystick_float(adjusted_x, adjusted_y)
-        self.gamepad.update()
-        
-        # Update visual
-        self.update_left_joystick_visual(x, y)
+    def on_key_release(self, key):
+        self.controller.key_up(key)
         
-        if x != 0 or y != 0:
-            self.log_status(f"Left joystick: X={adjusted_x:.2f}, Y={adjusted_y:.2f}")
-            
     def on_mouse_move(self, x, y):
-        if not self.mouse_enabled or not self.is_running:
-            return
-            
-        # Calculate distance from center
-        dx = (x - self.mouse_center_x) / self.mouse_center_x
-        dy = (y - self.mouse_center_y) / self.mouse_center_y
-        
-        # Apply sensitivity and limit values
-        dx = max(-1.0, min(1.0, dx * self.mouse_sensitivity))
-        dy = max(-1.0, min(1.0, dy * self.mouse_sensitivity))
-        
-        # Update right joystick
-        self.gamepad.right_joystick_float(dx, -dy)
-        self.gamepad.update()
-        
-        if abs(dx) > 0.1 or abs(dy) > 0.1:
-            self.log_status(f"Right joystick: X={dx:.2f}, Y={-dy:.2f}")
+        if self.is_running:
+            self.controller.mouse_move(x, y)
             
     def run(self):
         self.log_status("🎮 Virtual Xbox Controller GUI Ready!")
         self.log_status("Press 'Start Controller' to begin")
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        # The hidden tabs and the render loop wait for the first frame (finish_startup)
+        self.root.bind('<Map>', self.on_map)
         self.root.mainloop()
         
+    # ==========================
+    # Startup
+    # ==========================
+    def on_map(self, event):
+        # The window is on screen - the next idle round draws the first frame
+        if event.widget is self.root:
+            self.root.unbind('<Map>')
+            self.root.after_idle(self.finish_startup)
+            
+    def finish_startup(self):
+        self.startup.mark_first_frame()
+        # What the first frame does not show
+        self.build_hidden_tabs()
+        self.render_loop = RenderLoop(self.root, self.engine, self.pad_view.render, self.flush_status_log)
+        self.render_loop.start()
+        self.update_latency_display()
+        self.startup.mark("hidden tabs + render loop")
+        self.log_status(f"Started in {self.startup.elapsed_ms():.0f} ms")
+        self.startup.finish()
+        
     def on_closing(self):
         self.stop_controller()
         self.reset_controller()
+        self.stop_capture()
+        self.controller.close()
+        # Closed before the first frame - the render loop never started
+        if self.render_loop:
+            self.render_loop.stop()
         self.root.destroy()
 
 if __name__ == "__main__":
-    app = GamepadGUI()
+    import argparse
+    parser = argparse.ArgumentParser(description="Virtual Xbox Controller - GUI")
+    parser.add_argument('--startup-profile', action='store_true', help="print where the startup time goes")
+    args = parser.parse_args()
+    app = GamepadGUI(startup=StartupProfile(print if args.startup_profile else None))
     app.run()
@@ -1,57 +1,100 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, simpledialog
-import vgamepad as vg
-from pynput import keyboard, mouse
-import threading
-import time
-import json
-import os
-from PIL import Image, ImageTk, ImageDraw
+from tkinter import ttk, messagebox
+from output_backends import OUTPUTS, DEFAULT_OUTPUT, DEFAULT_BACKEND
+from report_scheduler import REPORT_RATES, DEFAULT_REPORT_RATE, parse_report_rate
+from controller_engine import KEY_DOWN, KEY_UP, GUI_CLICK
+from pad_controller import PadController
+from render_state import RenderLoop
+from pad_canvas import PadCanvas
+from controller_art import ControllerArt
+from status_log import StatusLog
+from startup_profile import StartupProfile
+from profile_store import ProfileStore
+from profile_watcher import ProfileWatcher
+from input_capture import InputCapture
+from input_server import InputServer
+from response_curves import ProfileCurves
+from analog_ramps import DEFAULT_RAMPS, parse_ramps
+from macros import parse_macros, macros_to_profile
+from virtual_pads import MAX_PADS, VirtualPad, pad_settings
+from stick_filters import FILTERS, StickFilter, format_step_response
+from mouse_stick import MOUSE_MODES, DEFAULT_MOUSE_MODE
+from key_dispatch import DEFAULT_BUTTON_MAPPINGS
+from collections import deque
 
 class GamepadGUIPro:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("🎮 Virtual Xbox Controller - Professional")
-        self.root.geometry("1200x800")
-        self.root.configure(bg='#1a1a1a')
-        
-        # Gamepad instance
-        self.gamepad = vg.VX360Gamepad()
+    def __init__(self, backend=DEFAULT_BACKEND, headless=False, startup=None):
+        # headless: no window or input hooks - the engine and handlers only
+        # (benchmark.py drives the listener callbacks directly)
+        self.headless = headless
+        # Startup phases - printed with --startup-profile
+        self.startup = startup or StartupProfile()
         
         # Settings
-        self.sensitivity = 1.0
-        self.mouse_sensitivity = 0.5
-        self.mouse_enabled = True
         self.logging_enabled = True
-        
-        # Mouse center
-        self.mouse_center_x = 960
-        self.mouse_center_y = 540
-        
-        # Pressed keys tracking
-        self.pressed_keys = set()
+        # Status lines from any thread - written to the widget by the render loop
+        self.status_log = StatusLog()
+        
+        # Pad controller - the headless core shared by every front-end: device,
+        # engine (single output thread, report scheduler, pad state), key
+        # dispatch, ramps, curves, mouse stick, macros and the extra pads 2-4.
+        # 'vgamepad' drives the real virtual pad, 'recording' keeps the reports
+        # in memory for headless runs; a profile's "output" can switch it to a
+        # DualShock 4 (see set_output). Plugging in the virtual device takes a
+        # while, so with a window an in-memory stand-in takes the reports until
+        # it is ready (start_device)
+        self.backend = backend
+        self.report_rate = DEFAULT_REPORT_RATE
+        self.controller = PadController(backend, self.report_rate, stand_in=not headless,
+                                        log=self.log_status, on_macro_done=self.on_macro_done).start()
+        self.engine = self.controller.engine
+        # Extra virtual pads (2-4) - same engine and listeners, routed by key zone
+        self.pad_router = self.controller.pad_router
+        self.startup.mark("engine")
+        
+        # Window - built while the device is created on a worker thread
+        self.root = None
+        if not headless:
+            self.controller.start_device(self.startup)
+            self.root = tk.Tk()
+            self.root.title("🎮 Virtual Xbox Controller - Professional")
+            self.root.geometry("1200x800")
+            self.root.configure(bg='#1a1a1a')
+            self.startup.mark("Tk root")
         
         # GUI state
         self.is_running = False
         self.keyboard_listener = None
+        self.capture = None
+        self.input_server = None
         self.mouse_listener = None
         
-        # Button mappings
-        self.button_mappings = {
-            'A': 't', 'B': 'y', 'X': 'g', 'Y': 'h',
-            'Back': 'z', 'Start': 'x', 'Guide': 'c',
-            'LT': 'u', 'RT': 'o',
-            'DPad_Up': '1', 'DPad_Down': '2', 'DPad_Left': '3', 'DPad_Right': '4'
-        }
+        # Render state - Tk is only touched from the render loop on the UI thread;
+        # the canvas view keeps the item IDs and applies only what changed
+        self.pad_view = None
+        # Created in finish_startup, once the window is on screen
+        self.render_loop = None
+        self.controller_art = None
+        
+        # Button mappings (the controller holds them compiled)
+        self.button_mappings = DEFAULT_BUTTON_MAPPINGS.copy()
         
         # Current profile
         self.current_profile = "Default"
         self.profiles = {}
+        # One file per profile, written atomically by a background writer
+        self.profile_store = ProfileStore()
+        # External edits to those files, reloaded while running
+        self.profile_watcher = None
+        self.profile_reloads = deque()
         
         # Create GUI
-        self.create_widgets()
-        self.setup_listeners()
-        self.load_default_profile()
+        if not headless:
+            self.create_widgets()
+            self.load_default_profile()
+            self.startup.mark("widgets")
+            self.setup_listeners()
+            self.startup.mark("listeners")
         
     def create_widgets(self):
         # Header with profiles
@@ -80,7 +123,7 @@ class GamepadGUIPro:
         self.create_status_panel(right_frame)
         
     def create_header(self):
-        header_frame = tk.Frame(self.root, bg='#2b2b2b', height=80)
+        header_frame = tk.Frame(self.root, bg='#2b2b2b', height=100)
         header_frame.pack(fill=tk.X, padx=10, pady=10)
         header_frame.pack_propagate(False)
         
@@ -93,6 +136,25 @@ class GamepadGUIPro:
         profile_frame = tk.Frame(header_frame, bg='#2b2b2b')
         profile_frame.pack(side=tk.RIGHT, padx=20, pady=15)
         
+        # Extra pads and their stats, under the profile selection
+        pads_frame = tk.Frame(profile_frame, bg='#2b2b2b')
+        pads_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
+        
+        tk.Button(pads_frame, text="➕ Pad", command=self.add_pad,
+                 bg='#0066cc', fg='white', font=('Arial', 8, 'bold'), width=6).pack(side=tk.LEFT, padx=1)
+        tk.Button(pads_frame, text="➖ Pad", command=self.remove_pad,
+                 bg='#666666', fg='white', font=('Arial', 8, 'bold'), width=6).pack(side=tk.LEFT, padx=1)
+        tk.Label(pads_frame, text="Mouse:", font=('Arial', 8, 'bold'),
+                fg='white', bg='#2b2b2b').pack(side=tk.LEFT, padx=(8, 2))
+        self.mouse_pad_var = tk.StringVar(value="P1")
+        self.mouse_pad_combo = ttk.Combobox(pads_frame, textvariable=self.mouse_pad_var,
+                                          values=["P1"], state='readonly', width=4)
+        self.mouse_pad_combo.pack(side=tk.LEFT)
+        self.mouse_pad_combo.bind('<<ComboboxSelected>>', self.update_mouse_pad)
+        self.pad_stats_label = tk.Label(pads_frame, text="", font=('Arial', 8),
+                                       fg='#00ff00', bg='#2b2b2b')
+        self.pad_stats_label.pack(side=tk.LEFT, padx=(8, 0))
+        
         # Profile selection
         tk.Label(profile_frame, text="Profile:", font=('Arial', 10, 'bold'), 
                 fg='white', bg='#2b2b2b').pack(side=tk.LEFT, padx=(0, 5))
@@ -157,123 +219,10 @@ class GamepadGUIPro:
         self.create_mapping_grid(mapping_frame)
         
     def draw_xbox_controller(self):
-        canvas = self.controller_canvas
-        canvas.delete("all")
-        
-        # Get canvas dimensions
-        width = canvas.winfo_reqwidth()
-        height = canvas.winfo_reqheight()
-        
-        # Controller body (main shape)
-        body_x1, body_y1 = width*0.1, height*0.3
-        body_x2, body_y2 = width*0.9, height*0.7
-        
-        # Main controller body
-        canvas.create_rounded_rectangle(body_x1, body_y1, body_x2, body_y2, radius=20, 
-                                      fill='#333333', outline='#666666', width=3)
-        
-        # Left grip
-        grip_left_x1, grip_left_y1 = width*0.05, height*0.4
-        grip_left_x2, grip_left_y2 = width*0.15, height*0.6
-        canvas.create_rounded_rectangle(grip_left_x1, grip_left_y1, grip_left_x2, grip_left_y2, radius=15, 
-                                      fill='#333333', outline='#666666', width=2)
-        
-        # Right grip
-        grip_right_x1, grip_right_y1 = width*0.85, height*0.4
-        grip_right_x2, grip_right_y2 = width*0.95, height*0.6
-        canvas.create_rounded_rectangle(grip_right_x1, grip_right_y1, grip_right_x2, grip_right_y2, radius=15, 
-                                      fill='#333333', outline='#666666', width=2)
-        
-        # Left joystick
-        left_joy_x, left_joy_y = width*0.25, height*0.5
-        left_joy_radius = 25
-        canvas.create_oval(left_joy_x-left_joy_radius, left_joy_y-left_joy_radius, 
-                          left_joy_x+left_joy_radius, left_joy_y+left_joy_radius, 
-                          fill='#444444', outline='#777777', width=2)
-        canvas.create_oval(left_joy_x-8, left_joy_y-8, left_joy_x+8, left_joy_y+8, 
-                          fill='#00ff00', outline='#00cc00', width=2, tags='left_joystick')
-        
-        # Right joystick
-        right_joy_x, right_joy_y = width*0.75, height*0.5
-        right_joy_radius = 25
-        canvas.create_oval(right_joy_x-right_joy_radius, right_joy_y-right_joy_radius, 
-                          right_joy_x+right_joy_radius, right_joy_y+right_joy_radius, 
-                          fill='#444444', outline='#777777', width=2)
-        canvas.create_oval(right_joy_x-8, right_joy_y-8, right_joy_x+8, right_joy_y+8, 
-                          fill='#00ff00', outline='#00cc00', width=2, tags='right_joystick')
-        
-        # D-Pad
-        dpad_x, dpad_y = width*0.4, height*0.5
-        dpad_size = 20
-        canvas.create_polygon(dpad_x, dpad_y-dpad_size, dpad_x+dpad_size, dpad_y, 
-                            dpad_x, dpad_y+dpad_size, dpad_x-dpad_size, dpad_y, 
-                            fill='#555555', outline='#888888', width=2, tags='dpad')
-        
-        # Action buttons (A, B, X, Y)
-        btn_radius = 15
-        # A button (right)
-        a_x, a_y = width*0.65, height*0.45
-        canvas.create_oval(a_x-btn_radius, a_y-btn_radius, a_x+btn_radius, a_y+btn_radius, 
-                          fill='#ff0000', outline='#cc0000', width=2, tags='btn_A')
-        canvas.create_text(a_x, a_y, text="A", fill='white', font=('Arial', 10, 'bold'))
-        
-        # B button (top)
-        b_x, b_y = width*0.7, height*0.4
-        canvas.create_oval(b_x-btn_radius, b_y-btn_radius, b_x+btn_radius, b_y+btn_radius, 
-                          fill='#00ff00', outline='#00cc00', width=2, tags='btn_B')
-        canvas.create_text(b_x, b_y, text="B", fill='white', font=('Arial', 10, 'bold'))
-        
-        # X button (left)
-        x_x, x_y = width*0.6, height*0.45
-        canvas.create_oval(x_x-btn_radius, x_y-btn_radius, x_x+btn_radius, x_y+btn_radius, 
-                          fill='#0000ff', outline='#0000cc', width=2, tags='btn_X')
-        canvas.create_text(x_x, x_y, text="X", fill='white', font=('Arial', 10, 'bold'))
-        
-        # Y button (bottom)
-        y_x, y_y = width*0.65, height*0.5
-        canvas.create_oval(y_x-btn_radius, y_y-btn_radius, y_x+btn_radius, y_y+btn_radius, 
-                          fill='#ffff00', outline='#cccc00', width=2, tags='btn_Y')
-        canvas.create_text(y_x, y_y, text="Y", fill='white', font=('Arial', 10, 'bold'))
-        
-        # System buttons
-        sys_btn_radius = 12
-        # Back button
-        back_x, back_y = width*0.45, height*0.4
-        canvas.create_oval(back_x-sys_btn_radius, back_y-sys_btn_radius, 
-                          back_x+sys_btn_radius, back_y+sys_btn_radius, 
-                          fill='#ff8800', outline='#cc6600', width=2, tags='btn_Back')
-        canvas.create_text(back_x, back_y, text="Back", fill='white', font=('Arial', 7, 'bold'))
-        
-        # Start button
-        start_x, start_y = width*0.55, height*0.4
-        canvas.create_oval(start_x-sys_btn_radius, start_y-sys_btn_radius, 
-                          start_x+sys_btn_radius, start_y+sys_btn_radius, 
-                          fill='#ff8800', outline='#cc6600', width=2, tags='btn_Start')
-        canvas.create_text(start_x, start_y, text="Start", fill='white', font=('Arial', 7, 'bold'))
-        
-        # Guide button (Xbox logo)
-        guide_x, guide_y = width*0.5, height*0.35
-        canvas.create_oval(guide_x-sys_btn_radius, guide_y-sys_btn_radius, 
-                          guide_x+sys_btn_radius, guide_y+sys_btn_radius, 
-                          fill='#ff8800', outline='#cc6600', width=2, tags='btn_Guide')
-        canvas.create_text(guide_x, guide_y, text="Xbox", fill='white', font=('Arial', 6, 'bold'))
-        
-        # Triggers
-        trigger_width = 40
-        trigger_height = 15
-        # LT
-        lt_x, lt_y = width*0.2, height*0.25
-        canvas.create_rounded_rectangle(lt_x-trigger_width//2, lt_y-trigger_height//2, 
-                                      lt_x+trigger_width//2, lt_y+trigger_height//2, radius=5, 
-                                      fill='#8800ff', outline='#6600cc', width=2, tags='btn_LT')
-        canvas.create_text(lt_x, lt_y, text="LT", fill='white', font=('Arial', 8, 'bold'))
-        
-        # RT
-        rt_x, rt_y = width*0.8, height*0.25
-        canvas.create_rounded_rectangle(rt_x-trigger_width//2, rt_y-trigger_height//2, 
-                                      rt_x+trigger_width//2, rt_y+trigger_height//2, radius=5, 
-                                      fill='#8800ff', outline='#6600cc', width=2, tags='btn_RT')
-        canvas.create_text(rt_x, rt_y, text="RT", fill='white', font=('Arial', 8, 'bold'))
+        # Body pre-rendered per canvas size (controller_art), live overlays on
+        # top updated in place through their item IDs (pad_canvas.PadCanvas)
+        self.pad_view = PadCanvas(self.controller_canvas)
+        self.controller_art = ControllerArt(self.controller_canvas, 'pro', self.pad_view)
         
         # Make buttons clickable
         self.make_buttons_clickable()
@@ -296,10 +245,9 @@ class GamepadGUIPro:
             self.simulate_button_press(button_name)
             
     def on_button_hover(self, tag, entering):
-        if entering:
-            self.controller_canvas.itemconfig(tag, width=4)
-        else:
-            self.controller_canvas.itemconfig(tag, width=2)
+        # Outline of the button item only (not its label), through its cached ID
+        self.pad_view.set_hover(tag.replace('btn_', ''), entering)
+        self.pad_view.flush()
             
     def create_mapping_grid(self, parent):
         # Create scrollable frame for mappings
@@ -362,14 +310,14 @@ class GamepadGUIPro:
         tk.Label(settings_frame, text="Joystick Sensitivity:", 
                 font=('Arial', 9), fg='white', bg='#1a1a1a').pack(anchor=tk.W, padx=5, pady=2)
         
-        self.sensitivity_var = tk.DoubleVar(value=self.sensitivity)
+        self.sensitivity_var = tk.DoubleVar(value=self.controller.sensitivity)
         self.sensitivity_scale = tk.Scale(settings_frame, from_=0.1, to=2.0, resolution=0.1,
                                          orient=tk.HORIZONTAL, variable=self.sensitivity_var,
                                          command=self.update_sensitivity, bg='#404040', fg='white',
                                          length=200)
         self.sensitivity_scale.pack(fill=tk.X, padx=5, pady=2)
         
-        self.sensitivity_label = tk.Label(settings_frame, text=f"Current: {self.sensitivity:.1f}", 
+        self.sensitivity_label = tk.Label(settings_frame, text=f"Current: {self.controller.sensitivity:.1f}", 
                                          font=('Arial', 8), fg='#00ff00', bg='#1a1a1a')
         self.sensitivity_label.pack(anchor=tk.W, padx=5, pady=2)
         
@@ -377,30 +325,70 @@ class GamepadGUIPro:
         tk.Label(settings_frame, text="Mouse Sensitivity:", 
                 font=('Arial', 9), fg='white', bg='#1a1a1a').pack(anchor=tk.W, padx=5, pady=2)
         
-        self.mouse_sensitivity_var = tk.DoubleVar(value=self.mouse_sensitivity)
+        self.mouse_sensitivity_var = tk.DoubleVar(value=self.controller.mouse_sensitivity)
         self.mouse_sensitivity_scale = tk.Scale(settings_frame, from_=0.1, to=2.0, resolution=0.1,
                                                orient=tk.HORIZONTAL, variable=self.mouse_sensitivity_var,
                                                command=self.update_mouse_sensitivity, bg='#404040', fg='white',
                                                length=200)
         self.mouse_sensitivity_scale.pack(fill=tk.X, padx=5, pady=2)
         
-        self.mouse_sensitivity_label = tk.Label(settings_frame, text=f"Current: {self.mouse_sensitivity:.1f}", 
+        self.mouse_sensitivity_label = tk.Label(settings_frame, text=f"Current: {self.controller.mouse_sensitivity:.1f}", 
                                                font=('Arial', 8), fg='#00ff00', bg='#1a1a1a')
         self.mouse_sensitivity_label.pack(anchor=tk.W, padx=5, pady=2)
         
         # Control toggles
-        self.mouse_enabled_var = tk.BooleanVar(value=self.mouse_enabled)
+        self.mouse_enabled_var = tk.BooleanVar(value=self.controller.mouse_enabled)
         mouse_check = tk.Checkbutton(settings_frame, text="Enable Mouse Control", 
                                    variable=self.mouse_enabled_var, command=self.toggle_mouse_control,
                                    font=('Arial', 9), fg='white', bg='#1a1a1a', selectcolor='#404040')
         mouse_check.pack(anchor=tk.W, padx=5, pady=2)
         
+        # Mouse mode
+        tk.Label(settings_frame, text="Mouse Mode:", 
+                font=('Arial', 9), fg='white', bg='#1a1a1a').pack(anchor=tk.W, padx=5, pady=2)
+        
+        self.mouse_mode_var = tk.StringVar(value=self.controller.mouse_mode)
+        mouse_mode_combo = ttk.Combobox(settings_frame, textvariable=self.mouse_mode_var,
+                                        values=MOUSE_MODES, state='readonly', width=10)
+        mouse_mode_combo.pack(anchor=tk.W, padx=5, pady=2)
+        mouse_mode_combo.bind('<<ComboboxSelected>>', self.update_mouse_mode)
+        
+        # Right stick filter
+        tk.Label(settings_frame, text="Right Stick Filter:", 
+                font=('Arial', 9), fg='white', bg='#1a1a1a').pack(anchor=tk.W, padx=5, pady=2)
+        
+        self.stick_filter_var = tk.StringVar(value=self.controller.stick_filter.kind)
+        stick_filter_combo = ttk.Combobox(settings_frame, textvariable=self.stick_filter_var,
+                                          values=FILTERS, state='readonly', width=10)
+        stick_filter_combo.pack(anchor=tk.W, padx=5, pady=2)
+        stick_filter_combo.bind('<<ComboboxSelected>>', self.update_stick_filter)
+        
         self.logging_enabled_var = tk.BooleanVar(value=self.logging_enabled)
         logging_check = tk.Checkbutton(settings_frame, text="Enable Logging", 
                                      variable=self.logging_enabled_var, command=self.toggle_logging,
                                      font=('Arial', 9), fg='white', bg='#1a1a1a', selectcolor='#404040')
         logging_check.pack(anchor=tk.W, padx=5, pady=2)
         
+        # Report rate
+        tk.Label(settings_frame, text="Report Rate (Hz):", 
+                font=('Arial', 9), fg='white', bg='#1a1a1a').pack(anchor=tk.W, padx=5, pady=2)
+        
+        self.report_rate_var = tk.StringVar(value=str(self.report_rate))
+        report_rate_combo = ttk.Combobox(settings_frame, textvariable=self.report_rate_var,
+                                         values=[str(r) for r in REPORT_RATES], state='readonly', width=10)
+        report_rate_combo.pack(anchor=tk.W, padx=5, pady=2)
+        report_rate_combo.bind('<<ComboboxSelected>>', self.update_report_rate)
+        
+        # Controller type (saved per profile)
+        tk.Label(settings_frame, text="Output:", 
+                font=('Arial', 9), fg='white', bg='#1a1a1a').pack(anchor=tk.W, padx=5, pady=2)
+        
+        self.output_var = tk.StringVar(value=self.controller.output)
+        output_combo = ttk.Combobox(settings_frame, textvariable=self.output_var,
+                                    values=list(OUTPUTS), state='readonly', width=10)
+        output_combo.pack(anchor=tk.W, padx=5, pady=2)
+        output_combo.bind('<<ComboboxSelected>>', self.update_output)
+        
     def create_status_panel(self, parent):
         # Status frame
         status_frame = tk.LabelFrame(parent, text="📊 Status Log", 
@@ -417,6 +405,23 @@ class GamepadGUIPro:
                             bg='#ff4444', fg='white', font=('Arial', 9, 'bold'))
         clear_btn.pack(pady=5)
         
+        # Capture -> report latency per input source
+        self.latency_label = tk.Label(status_frame, text="Latency: no samples", justify=tk.LEFT,
+                                      font=('Consolas', 8), fg='#00ff00', bg='#1a1a1a')
+        self.latency_label.pack(anchor=tk.W, padx=5, pady=2)
+        
+        latency_btn = tk.Button(status_frame, text="Dump Latency", command=self.dump_latency,
+                                bg='#4444ff', fg='white', font=('Arial', 9, 'bold'))
+        latency_btn.pack(pady=5)
+        
+        self.capture_btn = tk.Button(status_frame, text="⏺ Record Input", command=self.toggle_capture,
+                                     bg='#aa3333', fg='white', font=('Arial', 9, 'bold'))
+        self.capture_btn.pack(pady=5)
+        
+        self.server_btn = tk.Button(status_frame, text="🌐 Network Input", command=self.toggle_input_server,
+                                    bg='#336699', fg='white', font=('Arial', 9, 'bold'))
+        self.server_btn.pack(pady=5)
+        
     # Profile management methods
     def load_default_profile(self):
         self.profiles = {
@@ -425,6 +430,13 @@ class GamepadGUIPro:
                 "sensitivity": 1.0,
                 "mouse_sensitivity": 0.5,
                 "mouse_enabled": True,
+                "mouse_mode": DEFAULT_MOUSE_MODE,
+                "curves": ProfileCurves().to_profile(),
+                "ramps": dict(DEFAULT_RAMPS),
+                "stick_filter": StickFilter().to_profile(),
+                "macros": {},
+                "repeat": {},
+                "output": DEFAULT_OUTPUT,
                 "logging_enabled": True
             }
         }
@@ -438,15 +450,24 @@ class GamepadGUIPro:
             self.profile_var.set(self.current_profile)
             
     def create_new_profile(self):
+        from tkinter import simpledialog
         name = simpledialog.askstring("New Profile", "Enter profile name:")
         if name and name not in self.profiles:
             self.profiles[name] = {
                 "button_mappings": self.button_mappings.copy(),
-                "sensitivity": self.sensitivity,
-                "mouse_sensitivity": self.mouse_sensitivity,
-                "mouse_enabled": self.mouse_enabled,
+                "sensitivity": self.controller.sensitivity,
+                "mouse_sensitivity": self.controller.mouse_sensitivity,
+                "mouse_enabled": self.controller.mouse_enabled,
+                "mouse_mode": self.controller.mouse_mode,
+                "curves": self.controller.curves.to_profile(),
+                "ramps": dict(self.controller.ramps.settings),
+                "stick_filter": self.controller.stick_filter.to_profile(),
+                "macros": macros_to_profile(self.controller.macro_player.macros),
+                "repeat": dict(self.controller.repeat),
+                "output": self.controller.output,
                 "logging_enabled": self.logging_enabled
             }
+            self.profile_store.save(name, self.profiles[name])
             self.current_profile = name
             self.profile_var.set(name)
             self.update_profile_combo()
@@ -456,12 +477,19 @@ class GamepadGUIPro:
         if self.current_profile in self.profiles:
             self.profiles[self.current_profile] = {
                 "button_mappings": self.button_mappings.copy(),
-                "sensitivity": self.sensitivity,
-                "mouse_sensitivity": self.mouse_sensitivity,
-                "mouse_enabled": self.mouse_enabled,
+                "sensitivity": self.controller.sensitivity,
+                "mouse_sensitivity": self.controller.mouse_sensitivity,
+                "mouse_enabled": self.controller.mouse_enabled,
+                "mouse_mode": self.controller.mouse_mode,
+                "curves": self.controller.curves.to_profile(),
+                "ramps": dict(self.controller.ramps.settings),
+                "stick_filter": self.controller.stick_filter.to_profile(),
+                "macros": macros_to_profile(self.controller.macro_player.macros),
+                "repeat": dict(self.controller.repeat),
+                "output": self.controller.output,
                 "logging_enabled": self.logging_enabled
             }
-            self.save_profiles_to_file()
+            self.profile_store.save(self.current_profile, self.profiles[self.current_profile])
             self.log_status(f"Saved profile: {self.current_profile}")
             
     def load_profile(self):
@@ -469,16 +497,31 @@ class GamepadGUIPro:
         if profile_name in self.profiles:
             profile = self.profiles[profile_name]
             self.button_mappings = profile["button_mappings"].copy()
-            self.sensitivity = profile["sensitivity"]
-            self.mouse_sensitivity = profile["mouse_sensitivity"]
-            self.mouse_enabled = profile["mouse_enabled"]
+            self.controller.set_mappings(self.button_mappings)
+            self.controller.sensitivity = profile["sensitivity"]
+            self.controller.set_mouse_sensitivity(profile["mouse_sensitivity"])
+            self.controller.mouse_enabled = profile["mouse_enabled"]
             self.logging_enabled = profile["logging_enabled"]
             
             # Update GUI
-            self.sensitivity_var.set(self.sensitivity)
-            self.mouse_sensitivity_var.set(self.mouse_sensitivity)
-            self.mouse_enabled_var.set(self.mouse_enabled)
+            self.sensitivity_var.set(self.controller.sensitivity)
+            self.mouse_sensitivity_var.set(self.controller.mouse_sensitivity)
+            self.mouse_enabled_var.set(self.controller.mouse_enabled)
             self.logging_enabled_var.set(self.logging_enabled)
+            self.mouse_mode_var.set(profile.get("mouse_mode", DEFAULT_MOUSE_MODE))
+            self.update_mouse_mode()
+            try:
+                self.controller.set_curves(ProfileCurves.from_profile(profile, self.controller.sensitivity))
+                self.engine.call(self.controller.ramps.configure, parse_ramps(profile.get("ramps")))
+                stick_filter = StickFilter.from_profile(profile.get("stick_filter"))
+                self.stick_filter_var.set(stick_filter.kind)
+                self.set_stick_filter(stick_filter)
+                self.controller.macro_player.set_macros(parse_macros(profile.get("macros")))
+                self.controller.set_repeat(profile.get("repeat"))
+                self.output_var.set(profile.get("output", DEFAULT_OUTPUT))
+                self.set_output(self.output_var.get())
+            except ValueError as e:
+                self.log_status(f"Invalid settings in {profile_name}: {e}")
             
             # Update mapping display
             for button, var in self.mapping_vars.items():
@@ -492,24 +535,91 @@ class GamepadGUIPro:
         if profile_name != "Default" and profile_name in self.profiles:
             if messagebox.askyesno("Delete Profile", f"Are you sure you want to delete profile '{profile_name}'?"):
                 del self.profiles[profile_name]
+                self.profile_store.delete(profile_name)
                 self.update_profile_combo()
                 self.log_status(f"Deleted profile: {profile_name}")
                 
-    def save_profiles_to_file(self):
-        try:
-            with open('gamepad_profiles.json', 'w') as f:
-                json.dump(self.profiles, f, indent=2)
-        except Exception as e:
-            self.log_status(f"Error saving profiles: {e}")
-            
     def load_profiles_from_file(self):
-        try:
-            if os.path.exists('gamepad_profiles.json'):
-                with open('gamepad_profiles.json', 'r') as f:
-                    self.profiles = json.load(f)
-                self.update_profile_combo()
-        except Exception as e:
-            self.log_status(f"Error loading profiles: {e}")
+        # profiles/<name>.json - imported from gamepad_profiles.json on first use
+        profiles = self.profile_store.load()
+        for error in self.profile_store.errors:
+            self.log_status(f"Error loading profile {error}")
+        self.profile_store.errors.clear()
+        if profiles:
+            self.profiles = profiles
+        else:
+            # Nothing on disk yet - keep the built-in defaults
+            for name, profile in self.profiles.items():
+                self.profile_store.save(name, profile)
+        self.update_profile_combo()
+        self.start_profile_watcher()
+        
+    # ==========================
+    # Profile hot-reload
+    # ==========================
+    def start_profile_watcher(self):
+        self.profile_watcher = ProfileWatcher(self.profile_store.directory, self.on_profile_changed,
+                                              self.on_profile_removed, self.on_profile_error).start()
+        self.log_status(f"Watching {self.profile_store.directory}/ for profile edits ({self.profile_watcher.mode})")
+        
+    def on_profile_changed(self, update):
+        # Watcher thread - the file was parsed, validated and compiled there
+        if update.profile == self.profiles.get(update.name):
+            return      # our own save coming back
+        if update.name == self.current_profile:
+            # One engine call - swapped in whole between two report ticks
+            self.engine.call(self.controller.apply_profile, update)
+        self.profile_reloads.append((update.name, update))
+        
+    def on_profile_removed(self, name):
+        self.profile_reloads.append((name, None))
+        
+    def on_profile_error(self, filename, message):
+        self.log_status("Profile {} not reloaded: {}", filename, message)
+        
+    def apply_profile_reloads(self):
+        # Tk thread - profile list, and the widgets of the current profile
+        while self.profile_reloads:
+            name, update = self.profile_reloads.popleft()
+            if update is None:
+                if name == self.current_profile:
+                    self.log_status(f"Profile file of {name} removed - still active, save to write it again")
+                elif self.profiles.pop(name, None) is not None:
+                    self.update_profile_combo()
+                    self.log_status(f"Profile removed: {name}")
+                continue
+            self.profiles[name] = update.profile
+            self.update_profile_combo()
+            if name == self.current_profile:
+                self.show_reloaded_profile(update)
+            self.reload_pads(update)
+            self.log_status(f"Reloaded profile: {name}")
+            
+    def show_reloaded_profile(self, update):
+        # The engine already runs the new settings - only mirror them here
+        profile = update.profile
+        self.button_mappings = dict(profile["button_mappings"])
+        self.controller.sensitivity = float(profile["sensitivity"])
+        self.controller.mouse_enabled = profile["mouse_enabled"]
+        self.logging_enabled = profile["logging_enabled"]
+        self.sensitivity_var.set(self.controller.sensitivity)
+        self.mouse_sensitivity_var.set(self.controller.mouse_sensitivity)
+        self.mouse_enabled_var.set(self.controller.mouse_enabled)
+        self.logging_enabled_var.set(self.logging_enabled)
+        self.mouse_mode_var.set(update.settings.mouse_mode)
+        self.stick_filter_var.set(update.settings.stick_filter.kind)
+        self.output_var.set(update.settings.output)
+        self.set_output(update.settings.output)
+        # Only the mappings that changed - edits in the other fields stay
+        for button, var in self.mapping_vars.items():
+            key = self.button_mappings.get(button, '')
+            if var.get() != key:
+                var.set(key)
+        
+    def stop_profile_watcher(self):
+        if self.profile_watcher:
+            self.profile_watcher.stop()
+            self.profile_watcher = None
             
     def test_button_mapping(self, button_name):
         key = self.mapping_vars[button_name].get()
@@ -524,27 +634,67 @@ class GamepadGUIPro:
             if new_key:
                 self.button_mappings[button] = new_key
                 
+        self.controller.set_mappings(self.button_mappings)
         self.log_status("Button mappings updated!")
         
     def simulate_button_press(self, button_name):
         key = self.button_mappings.get(button_name)
         if key:
-            # Simulate key press
-            self.on_key_press(type('Key', (), {'char': key})())
-            self.root.after(100, lambda: self.on_key_release(type('Key', (), {'char': key})()))
+            # Simulate key press - tagged as a GUI click for the latency histograms
+            fake_key = type('Key', (), {'char': key})()
+            self.engine.post(KEY_DOWN, fake_key, source=GUI_CLICK)
+            # Released on the macro timer - exact 100 ms whatever the Tk load
+            self.controller.macro_player.call_later(0.1, self.engine.post, KEY_UP, fake_key, None, GUI_CLICK)
             
     # Rest of the methods (same as before)
     def update_sensitivity(self, value):
-        self.sensitivity = float(value)
-        self.sensitivity_label.config(text=f"Current: {self.sensitivity:.1f}")
+        sensitivity = float(value)
+        self.sensitivity_label.config(text=f"Current: {sensitivity:.1f}")
+        if sensitivity == self.controller.sensitivity:
+            return      # set from a profile, which brings its own curves
+        self.controller.set_sensitivity(sensitivity)
         
     def update_mouse_sensitivity(self, value):
-        self.mouse_sensitivity = float(value)
-        self.mouse_sensitivity_label.config(text=f"Current: {self.mouse_sensitivity:.1f}")
+        self.controller.set_mouse_sensitivity(float(value))
+        self.mouse_sensitivity_label.config(text=f"Current: {self.controller.mouse_sensitivity:.1f}")
+        
+    def update_mouse_mode(self, event=None):
+        self.set_mouse_mode(self.mouse_mode_var.get())
+        
+    def set_mouse_mode(self, mode):
+        self.controller.set_mouse_mode(mode)
+        self.log_status(f"Mouse mode: {mode}")
+        
+    def update_stick_filter(self, event=None):
+        self.set_stick_filter(StickFilter(self.stick_filter_var.get()))
+        
+    def set_stick_filter(self, stick_filter):
+        self.controller.set_stick_filter(stick_filter)
+        tick_hz = self.report_rate if self.report_rate != 'immediate' else 1000
+        self.log_status(f"Right stick filter: {stick_filter.kind} "
+                        f"({format_step_response(stick_filter.kind, stick_filter.params, tick_hz)})")
+        
+    def update_output(self, event=None):
+        self.set_output(self.output_var.get())
+        
+    def set_output(self, output):
+        # The new device is created here (UI thread); the engine thread switches over
+        try:
+            if not self.controller.set_output(output):
+                return
+        except Exception as e:
+            self.log_status(f"Error creating {output} output: {e}")
+            return
+        self.log_status(f"Output: {output}")
+        
+    def update_report_rate(self, event=None):
+        self.report_rate = parse_report_rate(self.report_rate_var.get())
+        self.controller.set_rate(self.report_rate)
+        self.log_status(f"Report rate: {self.report_rate}")
         
     def toggle_mouse_control(self):
-        self.mouse_enabled = self.mouse_enabled_var.get()
-        status = "Enabled" if self.mouse_enabled else "Disabled"
+        self.controller.set_mouse_enabled(self.mouse_enabled_var.get())
+        status = "Enabled" if self.controller.mouse_enabled else "Disabled"
         self.log_status(f"Mouse control: {status}")
         
     def toggle_logging(self):
@@ -552,30 +702,141 @@ class GamepadGUIPro:
         status = "Enabled" if self.logging_enabled else "Disabled"
         self.log_status(f"Logging: {status}")
         
-    def log_status(self, message):
+    def log_status(self, message, *args):
+        # Safe from any thread - message.format(*args) only runs when the
+        # render loop flushes the entry to the widget (a few times per second)
         if self.logging_enabled:
-            timestamp = time.strftime("%H:%M:%S")
-            log_message = f"[{timestamp}] {message}\n"
-            self.status_text.insert(tk.END, log_message)
-            self.status_text.see(tk.END)
+            self.status_log.append(message, args)
+            
+    def on_frame(self):
+        # Render loop, every frame (Tk thread)
+        self.apply_profile_reloads()
+        self.flush_status_log()
+        
+    def flush_status_log(self):
+        self.status_log.flush(self.status_text)
             
     def clear_status(self):
+        self.status_log.clear()
         self.status_text.delete(1.0, tk.END)
         
-    def update_left_joystick_visual(self, x, y):
-        # Update visual representation
-        width = self.controller_canvas.winfo_reqwidth()
-        height = self.controller_canvas.winfo_reqheight()
-        center_x, center_y = width*0.25, height*0.5
-        
-        knob_x = center_x + (x * 15)  # Scale to joystick area
-        knob_y = center_y - (y * 15)  # Invert Y for display
-        
-        # Keep knob within bounds
-        knob_x = max(center_x-15, min(center_x+15, knob_x))
-        knob_y = max(center_y-15, min(center_y+15, knob_y))
-        
-        self.controller_canvas.coords('left_joystick', knob_x-8, knob_y-8, knob_x+8, knob_y+8)
+    def update_latency_display(self):
+        text = self.engine.format_latency()
+        if self.input_server is not None:
+            text += "\n" + self.input_server.format_stats()
+        text += "\n" + self.controller.keys.format_stats()
+        text += "\n" + self.render_loop.format_stats()
+        text += "\n" + self.controller_art.format_stats()
+        self.latency_label.config(text=text)
+        self.pad_stats_label.config(text=self.controller.format_pad_stats(self.current_profile))
+        self.root.after(500, self.update_latency_display)
+        
+    def add_pad(self):
+        # Another virtual controller on the selected profile, in its own key zone
+        pads = self.pad_router.pads
+        if len(pads) + 1 >= MAX_PADS:
+            self.log_status(f"Up to {MAX_PADS} pads")
+            return
+        profile_name = self.profile_var.get()
+        profile = self.profiles.get(profile_name)
+        if profile is None:
+            self.log_status("Select a saved profile for the new pad")
+            return
+        try:
+            settings = pad_settings(profile_name, profile)
+            clash = self.pad_router.conflicts(settings.dispatch, self.controller.dispatch)
+            if clash:
+                raise ValueError(f"keys already in use: {', '.join(clash)}")
+            pad = VirtualPad(self.engine, len(pads) + 2, settings, self.backend)
+            self.pad_router.add(pad, self.controller.dispatch)
+        except Exception as e:
+            self.log_status(f"Cannot add pad with {profile_name}: {e}")
+            return
+        self.update_mouse_pad_combo()
+        self.log_status(f"Pad {pad.number} added: {profile_name}")
+        
+    def reload_pads(self, update):
+        # Extra pads on a reloaded profile get its new settings (same device and zone slot)
+        for pad in self.pad_router.pads:
+            if pad.profile != update.name:
+                continue
+            clash = self.pad_router.conflicts(update.settings.dispatch, self.controller.dispatch, pad)
+            if clash:
+                self.log_status(f"Pad {pad.number} keeps the old {update.name}: keys already in use: {', '.join(clash)}")
+                continue
+            if update.settings.output != pad.settings.output:
+                self.log_status(f"Pad {pad.number}: output change applies when the pad is added again")
+            self.engine.call(self.pad_router.update, pad, update.settings)
+        
+    def remove_pad(self):
+        if not self.pad_router.pads:
+            return
+        pad = self.pad_router.pads[-1]
+        if self.pad_router.mouse_pad is pad:
+            self.mouse_pad_var.set("P1")
+            self.engine.call(self.controller.assign_mouse, None)
+        self.pad_router.remove(pad)
+        pad.close()
+        self.update_mouse_pad_combo()
+        self.log_status(f"Pad {pad.number} removed")
+        
+    def update_mouse_pad_combo(self):
+        self.mouse_pad_combo['values'] = ["P1"] + [f"P{pad.number}" for pad in self.pad_router.pads]
+        
+    def update_mouse_pad(self, event=None):
+        number = int(self.mouse_pad_var.get()[1:])
+        pad = next((p for p in self.pad_router.pads if p.number == number), None)
+        self.engine.call(self.controller.assign_mouse, pad)
+        self.log_status(f"Mouse -> pad {number}")
+        
+    def dump_latency(self):
+        self.log_status("Latency (capture -> report submitted):")
+        for line in self.engine.format_latency().split('\n'):
+            self.log_status(line)
+        
+    def toggle_capture(self):
+        # Records every input event posted to the engine (replay: input_capture.py)
+        if self.capture is None:
+            try:
+                self.capture = InputCapture().start(self.engine)
+            except OSError as e:
+                self.log_status(f"Error starting capture: {e}")
+                return
+            self.capture_btn.config(text="⏹ Stop Recording")
+            self.log_status(f"Recording input to {self.capture.path}")
+        else:
+            self.stop_capture()
+            
+    def stop_capture(self):
+        if self.capture is not None:
+            capture, self.capture = self.capture, None
+            capture.stop()
+            self.capture_btn.config(text="⏺ Record Input")
+            self.log_status(f"Saved {capture.records} input events to {capture.path}")
+            
+    def toggle_input_server(self):
+        # Pad frames from other programs / machines (protocol: input_server.py)
+        if self.input_server is None:
+            try:
+                self.input_server = InputServer(self.controller).start()
+            except OSError as e:
+                self.log_status(f"Error starting network input: {e}")
+                return
+            self.server_btn.config(text="⏹ Stop Network Input")
+            self.log_status(f"Network input on {self.input_server.host}:{self.input_server.port} (UDP + TCP)")
+        else:
+            self.stop_input_server()
+            
+    def stop_input_server(self):
+        if self.input_server is not None:
+            server, self.input_server = self.input_server, None
+            server.stop()
+            self.server_btn.config(text="🌐 Network Input")
+            self.log_status(server.format_stats())
+            
+    def on_macro_done(self, run):
+        # Engine thread - per-step deadline -> report error
+        self.log_status(run.format())
         
     def start_controller(self):
         if not self.is_running:
@@ -591,22 +852,19 @@ class GamepadGUIPro:
             self.start_btn.config(state=tk.NORMAL)
             self.stop_btn.config(state=tk.DISABLED)
             self.log_status("Controller stopped!")
+            self.log_status(self.engine.format_stats())
+            self.log_status(self.controller.keys.format_stats())
             self.cleanup_listeners()
             
     def reset_controller(self):
-        # Reset all controller inputs
-        self.gamepad.left_joystick_float(0, 0)
-        self.gamepad.right_joystick_float(0, 0)
-        self.gamepad.left_trigger_float(0)
-        self.gamepad.right_trigger_float(0)
-        self.gamepad.update()
-        
-        # Reset visual
-        self.update_left_joystick_visual(0, 0)
+        # Reset all controller inputs (applied on the engine thread)
+        self.controller.reset()
         self.log_status("Controller reset!")
         
     def setup_listeners(self):
         if self.is_running:
+            from pynput import keyboard, mouse
+            
             # Keyboard listener
             self.keyboard_listener = keyboard.Listener(
                 on_press=self.on_key_press,
@@ -623,195 +881,65 @@ class GamepadGUIPro:
             self.keyboard_listener.stop()
         if self.mouse_listener:
             self.mouse_listener.stop()
+        self.controller.release_keys()
             
+    # Listener callbacks - only enqueue, the controller's engine thread applies them
     def on_key_press(self, key):
-        try:
-            if hasattr(key, 'char') and key.char:
-                char = key.char.lower()
-                
-                # Movement keys
-                if char in ['w', 'a', 's', 'd']:
-                    self.pressed_keys.add(char)
-                    self.update_movement()
-                    
-                # Check button mappings
-                for button, mapped_key in self.button_mappings.items():
-                    if char == mapped_key:
-                        self.press_button_visual(button)
-                        self.press_gamepad_button(button)
-                        break
-                        
-        except Exception as e:
-            self.log_status(f"Error in key press: {e}")
-            
-    def on_key_release(self, key):
-        try:
-            if hasattr(key, 'char') and key.char:
-                char = key.char.lower()
-                
-                # Movement keys
-                if char in ['w', 'a', 's', 'd']:
-                    self.pressed_keys.discard(char)
-                    self.update_movement()
-                    
-                # Check button mappings
-                for button, mapped_key in self.button_mappings.items():
-                    if char == mapped_key:
-                        self.release_gamepad_button(button)
-                        break
-                        
-        except Exception as e:
-            self.log_status(f"Error in key release: {e}")
-            
-    def press_gamepad_button(self, button_name):
-        button_map = {
-            'A': vg.XUSB_BUTTON.XUSB_GAMEPAD_A,
-            'B': vg.XUSB_BUTTON.XUSB_GAMEPAD_B,
-            'X': vg.XUSB_BUTTON.XUSB_GAMEPAD_X,
-            'Y': vg.XUSB_BUTTON.XUSB_GAMEPAD_Y,
-            'Back': vg.XUSB_BUTTON.XUSB_GAMEPAD_BACK,
-            'Start': vg.XUSB_BUTTON.XUSB_GAMEPAD_START,
-            'Guide': vg.XUSB_BUTTON.XUSB_GAMEPAD_GUIDE,
-            'DPad_Up': vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP,
-            'DPad_Down': vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN,
-            'DPad_Left': vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT,
-            'DPad_Right': vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT
-        }
-        
-        if button_name in button_map:
-            self.gamepad.press_button(button_map[button_name])
-            self.gamepad.update()
-            self.log_status(f"Button {button_name} pressed")
-        elif button_name == 'LT':
-            self.gamepad.left_trigger_float(1.0)
-            self.gamepad.update()
-            self.log_status("LT pressed")
-        elif button_name == 'RT':
-            self.gamepad.right_trigger_float(1.0)
-            self.gamepad.update()
-            self.log_status("RT pressed")
-            
-    def release_gamepad_button(self, button_name):
-        button_map = {
-            'A': vg.XUSB_BUTTON.XUSB_GAMEPAD_A,
-            'B': vg.XUSB_BUTTON.XUSB_GAMEPAD_B,
-            'X': vg.XUSB_BUTTON.XUSB_GAMEPAD_X,
-            'Y': vg.XUSB_BUTTON.XUSB_GAMEPAD_Y,
-            'Back': vg.XUSB_BUTTON.XUSB_GAMEPAD_BACK,
-            'Start': vg.XUSB_BUTTON.XUSB_GAMEPAD_START,
-            'Guide': vg.XUSB_BUTTON.XUSB_GAMEPAD_GUIDE,
-            'DPad_Up': vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP,
-            'DPad_Down': vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN,
-            'DPad_Left': vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT,
-            'DPad_Right': vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT
-        }
-        
-        if button_name in button_map:
-            self.gamepad.release_button(button_map[button_name])
-            self.gamepad.update()
-            self.log_status(f"Button {button_name} released")
-        elif button_name == 'LT':
-            self.gamepad.left_trigger_float(0)
-            self.gamepad.update()
-            self.log_status("LT released")
-        elif button_name == 'RT':
-            self.gamepad.right_trigger_float(0)
-            self.gamepad.update()
-            self.log_status("RT released")
-            
-    def press_button_visual(self, button_name):
-        # Visual feedback for button press
-        tag_map = {
-            'A': 'btn_A', 'B': 'btn_B', 'X': 'btn_X', 'Y': 'btn_Y',
-            'Back': 'btn_Back', 'Start': 'btn_Start', 'Guide': 'btn_Guide',
-            'LT': 'btn_LT', 'RT': 'btn_RT'
-        }
-        
-        if button_name in tag_map:
-            tag = tag_map[button_name]
-            # Change color temporarily
-            self.controller_canvas.itemconfig(tag, fill='#ffffff')
-            self.root.after(100, lambda: self.reset_button_color(tag, button_name))
-            
-    def reset_button_color(self, tag, button_name):
-        color_map = {
-            'A': '#ff0000', 'B': '#00ff00', 'X': '#0000ff', 'Y': '#ffff00',
-            'Back': '#ff8800', 'Start': '#ff8800', 'Guide': '#ff8800',
-            'LT': '#8800ff', 'RT': '#8800ff'
-        }
-        self.controller_canvas.itemconfig(tag, fill=color_map.get(button_name, '#666666'))
+        self.controller.key_down(key)
         
-    def update_movement(self):
-        x, y = 0.0, 0.0
-        
-        if 'w' in self.pressed_keys: y += 1.0
-        if 's' in self.pressed_keys: y -= 1.0
-        if 'a' in self.pressed_keys: x -= 1.0
-        if 'd' in self.pressed_keys: x += 1.0
-        
-        # Normalize diagonal movement
-        if x != 0 and y != 0:
-            x *= 0.707
-            y *= 0.707
-            
-        # Apply sensitivity
-        adjusted_x = x * self.sensitivity
-        adjusted_y = y * self.sensitivity
-        
-        # Update controller
-        self.gamepad.left_joystick_float(adjusted_x, adjusted_y)
-        self.gamepad.update()
-        
-        # Update visual
-        self.update_left_joystick_visual(x, y)
+    def on_key_release(self, key):
+        self.controller.key_up(key)
         
-        if x != 0 or y != 0:
-            self.log_status(f"Left joystick: X={adjusted_x:.2f}, Y={adjusted_y:.2f}")
-            
     def on_mouse_move(self, x, y):
-        if not self.mouse_enabled or not self.is_running:
-            return
-            
-        # Calculate distance from center
-        dx = (x - self.mouse_center_x) / self.mouse_center_x
-        dy = (y - self.mouse_center_y) / self.mouse_center_y
-        
-        # Apply sensitivity and limit values
-        dx = max(-1.0, min(1.0, dx * self.mouse_sensitivity))
-        dy = max(-1.0, min(1.0, dy * self.mouse_sensitivity))
-        
-        # Update right joystick
-        self.gamepad.right_joystick_float(dx, -dy)
-        self.gamepad.update()
-        
-        if abs(dx) > 0.1 or abs(dy) > 0.1:
-            self.log_status(f"Right joystick: X={dx:.2f}, Y={-dy:.2f}")
+        if self.is_running:
+            self.controller.mouse_move(x, y)
             
     def run(self):
         self.log_status("🎮 Virtual Xbox Controller Professional Ready!")
         self.log_status("Press 'Start' to begin")
-        self.load_profiles_from_file()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        # Profiles and the render loop wait for the first frame (finish_startup)
+        self.root.bind('<Map>', self.on_map)
         self.root.mainloop()
         
+    # ==========================
+    # Startup
+    # ==========================
+    def on_map(self, event):
+        # The window is on screen - the next idle round draws the first frame
+        if event.widget is self.root:
+            self.root.unbind('<Map>')
+            self.root.after_idle(self.finish_startup)
+            
+    def finish_startup(self):
+        self.startup.mark_first_frame()
+        # Pillow body images from now on (the first frame drew the vector body)
+        self.controller_art.use_images()
+        self.load_profiles_from_file()
+        self.render_loop = RenderLoop(self.root, self.engine, self.pad_view.render, self.on_frame)
+        self.render_loop.start()
+        self.update_latency_display()
+        self.startup.mark("profiles + render loop")
+        self.log_status(f"Started in {self.startup.elapsed_ms():.0f} ms")
+        self.startup.finish()
+        
     def on_closing(self):
         self.stop_controller()
         self.reset_controller()
-        self.save_profiles_to_file()
+        self.stop_capture()
+        self.stop_input_server()
+        self.controller.close()
+        self.stop_profile_watcher()
+        self.profile_store.close()
+        # Closed before the first frame - the render loop never started
+        if self.render_loop:
+            self.render_loop.stop()
         self.root.destroy()
 
-# Add rounded rectangle method to Canvas
-def create_rounded_rectangle(self, x1, y1, x2, y2, radius=10, **kwargs):
-    points = []
-    for x, y in [(x1, y1 + radius), (x1, y1), (x1 + radius, y1),
-                 (x2 - radius, y1), (x2, y1), (x2, y1 + radius),
-                 (x2, y2 - radius), (x2, y2), (x2 - radius, y2),
-                 (x1 + radius, y2), (x1, y2), (x1, y2 - radius)]:
-        points.extend([x, y])
-    return self.create_polygon(points, smooth=True, **kwargs)
-
-tk.Canvas.create_rounded_rectangle = create_rounded_rectangle
-
 if __name__ == "__main__":
-    app = GamepadGUIPro()
+    import argparse
+    parser = argparse.ArgumentParser(description="Virtual Xbox Controller - Professional GUI")
+    parser.add_argument('--startup-profile', action='store_true', help="print where the startup time goes")
+    args = parser.parse_args()
+    app = GamepadGUIPro(startup=StartupProfile(print if args.startup_profile else None))
     app.run()
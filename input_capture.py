@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+🎞️ Input Capture
+Compact binary recording of raw input events and memory-mapped replay.
+
+A capture is a 24-byte header followed by fixed-width 20-byte records:
+
+    header: magic 'GPIC', version u16, record size u16,
+            start perf_counter_ns i64, start wall-clock time f64
+    record: t_ns i64 (since start), kind u8, source u8, pad u16, a i32, b i32
+
+Key events store the normalized key identity in `a` (code point for
+printable keys, named keys and virtual key codes above that); mouse moves
+store the cursor position in `a`/`b`. Listener threads only append the
+event to a deque; a background thread packs and writes them in blocks.
+
+Replay memory-maps the file and streams the records back into
+ControllerEngine.post() - the same entry point the listener callbacks use -
+at real time (or scaled) or as fast as possible, so even multi-hour
+captures never sit in RAM:
+
+    python input_capture.py info captures/session.gpic
+    python input_capture.py replay captures/session.gpic --frontend pro --fast
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import deque
+
+from controller_engine import KEY_DOWN, KEY_UP, MOUSE_MOVE, SOURCES
+from key_dispatch import normalize_key
+
+MAGIC = b'GPIC'
+VERSION = 1
+HEADER = struct.Struct('<4sHHqd')
+RECORD = struct.Struct('<qBBxxii')
+
+CAPTURE_DIR = 'captures'
+CAPTURE_EXTENSION = '.gpic'
+# Writer wake-up period and file buffer size
+CAPTURE_FLUSH_MS = 100
+BLOCK_SIZE = 1 << 20
+
+RECORDED_KINDS = (KEY_DOWN, KEY_UP, MOUSE_MOVE)
+NO_SOURCE = 255
+_SOURCE_CODES = {source: i for i, source in enumerate(SOURCES)}
+
+# Key identity codes: code points < NAME_BASE, pynput Key names, then virtual key codes
+NAME_BASE = 0x110000
+VK_BASE = 0x200000
+NO_KEY = -1
+KEY_NAMES = (
+    'alt', 'alt_gr', 'alt_l', 'alt_r', 'backspace', 'caps_lock', 'cmd', 'cmd_l', 'cmd_r',
+    'ctrl', 'ctrl_l', 'ctrl_r', 'delete', 'down', 'end', 'enter', 'esc', 'home', 'insert',
+    'left', 'menu', 'num_lock', 'page_down', 'page_up', 'pause', 'print_screen', 'right',
+    'scroll_lock', 'shift', 'shift_l', 'shift_r', 'space', 'tab', 'up',
+    'media_next', 'media_play_pause', 'media_previous', 'media_volume_down',
+    'media_volume_mute', 'media_volume_up',
+) + tuple(f'f{n}' for n in range(1, 21))
+_NAME_CODES = {name: NAME_BASE + i for i, name in enumerate(KEY_NAMES)}
+
+_INT32_MIN = -(1 << 31)
+_INT32_MAX = (1 << 31) - 1
+
+
+def key_code(identity):
+    """normalize_key() result -> int32 code"""
+    if isinstance(identity, str):
+        if len(identity) == 1:
+            return ord(identity)
+        return _NAME_CODES.get(identity, NO_KEY)
+    if isinstance(identity, int) and 0 <= identity < _INT32_MAX - VK_BASE:
+        return VK_BASE + identity
+    return NO_KEY
+
+
+class CapturedKey:
+    """Replayed key - normalize_key() gives back the recorded identity"""
+    __slots__ = ('char', 'name', 'vk')
+
+    def __init__(self, char=None, name=None, vk=None):
+        self.char = char
+        self.name = name
+        self.vk = vk
+
+    def __repr__(self):
+        return repr(self.char or self.name or self.vk)
+
+
+_replay_keys = {}
+
+
+def decode_key(code):
+    key = _replay_keys.get(code)
+    if key is None:
+        if code == NO_KEY:
+            key = CapturedKey()
+        elif code < NAME_BASE:
+            key = CapturedKey(char=chr(code))
+        elif code < VK_BASE:
+            key = CapturedKey(name=KEY_NAMES[code - NAME_BASE])
+        else:
+            key = CapturedKey(vk=code - VK_BASE)
+        _replay_keys[code] = key
+    return key
+
+
+def default_capture_path(directory=CAPTURE_DIR):
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, time.strftime('session-%Y%m%d-%H%M%S') + CAPTURE_EXTENSION)
+
+
+def _clamp(value):
+    value = int(round(value))
+    return _INT32_MIN if value < _INT32_MIN else _INT32_MAX if value > _INT32_MAX else value
+
+
+# ==========================
+# Recording
+# ==========================
+class InputCapture:
+    def __init__(self, path=None, flush_ms=CAPTURE_FLUSH_MS):
+        self.path = path or default_capture_path()
+        self.flush_interval = flush_ms / 1000
+        self.records = 0
+        self.engine = None
+        self.start_ns = 0
+        self._pending = deque()
+        self._codes = {}
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+        self._file = None
+
+    def start(self, engine=None):
+        """Open the file and start the writer; with an engine, capture everything posted to it"""
+        self._file = open(self.path, 'wb', buffering=BLOCK_SIZE)
+        self.start_ns = time.perf_counter_ns()
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, self.start_ns, time.time()))
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="input-capture", daemon=True)
+        self._thread.start()
+        if engine is not None:
+            self.engine = engine
+            engine.capture = self
+        return self
+
+    def record(self, event):
+        """Queue an InputEvent (any thread) - packed and written by the writer thread"""
+        self._pending.append(event)
+
+    def stop(self):
+        """Detach, write everything still queued and close the file"""
+        if self.engine is not None:
+            self.engine.capture = None
+            self.engine = None
+        if not self._running:
+            return
+        self._running = False
+        self._wake.set()
+        self._thread.join()
+        self._file.close()
+
+    @property
+    def running(self):
+        return self._running
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            stopping = not self._running
+            self._write_pending()
+            if stopping:
+                break
+
+    def _write_pending(self):
+        pending = self._pending
+        count = len(pending)
+        if not count:
+            return
+        size = RECORD.size
+        block = bytearray(count * size)
+        pack_into = RECORD.pack_into
+        start = self.start_ns
+        codes = self._codes
+        offset = 0
+        for _ in range(count):
+            event = pending.popleft()
+            if event.kind == MOUSE_MOVE:
+                a, b = _clamp(event.a), _clamp(event.b)
+            else:
+                identity = normalize_key(event.a)
+                a = codes.get(identity)
+                if a is None:
+                    a = codes[identity] = key_code(identity)
+                b = 0
+            pack_into(block, offset, event.ts - start, event.kind,
+                      _SOURCE_CODES.get(event.source, NO_SOURCE), a, b)
+            offset += size
+        self._file.write(block)
+        self.records += count
+
+
+# ==========================
+# Replay
+# ==========================
+class CaptureReader:
+    """Memory-mapped capture file; iterating yields raw (t_ns, kind, source, a, b) records"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._map) < HEADER.size:
+                raise ValueError(f"Not an input capture: {path}")
+            magic, version, record_size, self.start_ns, self.start_time = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"Not an input capture: {path}")
+            if version != VERSION or record_size != RECORD.size:
+                raise ValueError(f"Unsupported capture version {version} (record size {record_size})")
+        except Exception:
+            self.close()
+            raise
+        # A trailing partial record (capture cut short) is ignored
+        self.count = (len(self._map) - HEADER.size) // RECORD.size
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        unpack_from = RECORD.unpack_from
+        data = self._map
+        size = RECORD.size
+        for offset in range(HEADER.size, HEADER.size + self.count * size, size):
+            yield unpack_from(data, offset)
+
+    def record(self, index):
+        return RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+
+    @property
+    def duration_ns(self):
+        return self.record(self.count - 1)[0] if self.count else 0
+
+    def events(self):
+        """Records decoded for engine.post(): (t_ns, kind, a, b, source)"""
+        for t, kind, source, a, b in self:
+            source = SOURCES[source] if source < len(SOURCES) else None
+            if kind == MOUSE_MOVE:
+                yield t, kind, a, b, source
+            else:
+                yield t, kind, decode_key(a), None, source
+
+    def summary(self):
+        kinds = {KEY_DOWN: 0, KEY_UP: 0, MOUSE_MOVE: 0}
+        for record in self:
+            kinds[record[1]] = kinds.get(record[1], 0) + 1
+        return {
+            'records': self.count,
+            'duration_s': self.duration_ns / 1_000_000_000,
+            'recorded_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.start_time)),
+            'key_down': kinds[KEY_DOWN],
+            'key_up': kinds[KEY_UP],
+            'mouse_move': kinds[MOUSE_MOVE],
+        }
+
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def replay(reader, engine, speed=1.0, stop=None):
+    """Post a capture into an engine; speed 1.0 = recorded timing, None/0 = as fast as possible
+
+    stop is an optional threading.Event that aborts the replay. Returns the number of events posted.
+    """
+    post = engine.post
+    posted = 0
+    start = time.perf_counter_ns()
+    for t, kind, a, b, source in reader.events():
+        if speed:
+            delay = start + t / speed - time.perf_counter_ns()
+            if delay > 0:
+                time.sleep(delay / 1_000_000_000)
+        if stop is not None and stop.is_set():
+            break
+        post(kind, a, b, source)
+        posted += 1
+    return posted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or replay an input capture")
+    sub = parser.add_subparsers(dest='command', required=True)
+    info = sub.add_parser('info', help="show what a capture contains")
+    info.add_argument('path')
+    play = sub.add_parser('replay', help="replay a capture into a headless front-end")
+    play.add_argument('path')
+    play.add_argument('--frontend', default='pro', choices=('pro', 'enhanced', 'standard', 'console'))
+    play.add_argument('--backend', default='recording', help="'recording' or 'vgamepad' to drive the real pad")
+    play.add_argument('--speed', type=float, default=1.0, help="timing scale (2.0 = twice as fast)")
+    play.add_argument('--fast', action='store_true', help="as fast as possible, ignoring timestamps")
+    args = parser.parse_args(argv)
+
+    with CaptureReader(args.path) as reader:
+        if args.command == 'info':
+            for name, value in reader.summary().items():
+                print(f"{name:>12}: {value}")
+            return
+
+        from benchmark import open_frontend
+        from report_scheduler import DEFAULT_REPORT_RATE
+
+        engine = open_frontend(args.frontend, DEFAULT_REPORT_RATE, False, args.backend)[0]
+        print(f"▶️ Replaying {len(reader)} events into {args.frontend} ({args.backend})...")
+        wall = time.perf_counter()
+        posted = replay(reader, engine, None if args.fast else args.speed)
+        engine.stop()
+        wall = time.perf_counter() - wall
+        print(f"✅ {posted} events in {wall:.2f}s ({posted / max(wall, 1e-9):.0f} events/s)")
+        print(engine.format_stats())
+
+
+if __name__ == '__main__':
+    main()
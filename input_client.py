@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+📡 Input Client
+Sends pad frames to an input server (see input_server.py) - a reference
+client for the protocol and a load generator for testing it.
+
+The built-in pattern sweeps the left stick in a circle, the right stick
+the other way, ramps the triggers and cycles A/B/X/Y. --reorder swaps
+some packets to exercise the out-of-order detection. --loopback runs a
+headless server in the same process, on the in-memory backend, so the
+whole path can be checked on one machine without a driver:
+
+    python input_client.py --loopback --rate 5000 --batch 4
+    python input_client.py --port 28960 --tcp --duration 10
+"""
+
+import argparse
+import math
+import random
+import socket
+import time
+
+from input_server import DEFAULT_HOST, DEFAULT_PORT, InputServer, pack_packet
+from key_dispatch import XUSB_BUTTONS
+
+_PATTERN_BUTTONS = tuple(XUSB_BUTTONS[name] for name in ('A', 'B', 'X', 'Y'))
+
+
+class InputClient:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, tcp=False, pad=0):
+        self.address = (host, port)
+        self.tcp = tcp
+        self.pad = pad
+        self.seq = 0
+        self.sent_frames = 0
+        self.sent_packets = 0
+        if tcp:
+            self.sock = socket.create_connection(self.address)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def pack(self, states):
+        """states: (buttons, lt, rt, lx, ly, rx, ry) tuples -> numbered packet"""
+        frames = []
+        for state in states:
+            self.seq = (self.seq + 1) & 0xFFFFFFFF
+            frames.append((self.seq,) + tuple(state))
+        return pack_packet(self.pad, frames)
+
+    def send_packet(self, packet, frames):
+        if self.tcp:
+            self.sock.sendall(packet)
+        else:
+            self.sock.sendto(packet, self.address)
+        self.sent_packets += 1
+        self.sent_frames += frames
+
+    def send(self, states):
+        self.send_packet(self.pack(states), len(states))
+
+    def close(self):
+        self.sock.close()
+
+
+def pattern(i, rate):
+    """Pad state number i of the test sweep (one full turn per second)"""
+    angle = 2 * math.pi * i / rate
+    lx = round(32767 * math.cos(angle))
+    ly = round(32767 * math.sin(angle))
+    trigger = (i * 255 // rate) % 256
+    buttons = _PATTERN_BUTTONS[(i * 4 // rate) % len(_PATTERN_BUTTONS)]
+    return (buttons, trigger, 255 - trigger, lx, ly, -lx, ly)
+
+
+def run(client, rate=1000, batch=1, duration_s=5.0, reorder_pct=0.0):
+    """Send the pattern at rate frames/s in packets of batch frames; returns frames sent"""
+    packets = int(rate * duration_s) // batch
+    interval_ns = batch * 1_000_000_000 // rate
+    held = None     # a packet delayed by --reorder goes out after the next one
+    start = time.perf_counter_ns()
+    for n in range(packets):
+        delay = start + n * interval_ns - time.perf_counter_ns()
+        if delay > 0:
+            time.sleep(delay / 1_000_000_000)
+        packet = client.pack([pattern(n * batch + k, rate) for k in range(batch)])
+        if held is None and reorder_pct and random.random() * 100 < reorder_pct:
+            held = packet
+            continue
+        client.send_packet(packet, batch)
+        if held is not None:
+            client.send_packet(held, batch)
+            held = None
+    if held is not None:
+        client.send_packet(held, batch)
+    return client.sent_frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Send test pad frames to an input server")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--tcp', action='store_true', help="use the TCP fallback")
+    parser.add_argument('--pad', type=int, default=0, help="target pad (0 = first)")
+    parser.add_argument('--rate', type=int, default=1000, help="frames per second")
+    parser.add_argument('--batch', type=int, default=1, help="frames per packet")
+    parser.add_argument('--duration', type=float, default=5.0, help="seconds")
+    parser.add_argument('--reorder', type=float, default=0.0, metavar='PCT',
+                        help="percentage of packets sent late (out of order)")
+    parser.add_argument('--loopback', action='store_true',
+                        help="start a headless server in this process and report what it saw")
+    args = parser.parse_args(argv)
+
+    server = controller = engine = None
+    if args.loopback:
+        from pad_controller import PadController
+
+        controller = PadController('recording').start()
+        engine = controller.engine
+        server = InputServer(controller, args.host, 0).start()
+        args.port = server.port
+
+    client = InputClient(args.host, args.port, args.tcp, args.pad)
+    print(f"📡 Sending {args.rate} frames/s in batches of {args.batch} to "
+          f"{args.host}:{args.port} ({'TCP' if args.tcp else 'UDP'})...")
+    wall = time.perf_counter()
+    try:
+        run(client, args.rate, args.batch, args.duration, args.reorder)
+    finally:
+        client.close()
+    wall = time.perf_counter() - wall
+    print(f"✅ {client.sent_frames} frames in {client.sent_packets} packets, "
+          f"{wall:.2f}s ({client.sent_frames / max(wall, 1e-9):.0f} frames/s)")
+
+    if server is not None:
+        # Let the last packets arrive and the engine apply them
+        time.sleep(0.3)
+        print(server.format_stats())
+        server.stop()
+        controller.close()
+        print(engine.format_stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+🌐 Input Server
+Drive the virtual pads from other programs and machines over UDP or TCP.
+
+Clients (bots, accessibility devices, test rigs) send packets holding a
+batch of complete pad states. Everything is little-endian:
+
+    packet: magic 'GPNF', version u8, pad u8 (0 = first pad), frame count u16
+    frame:  sequence u32, buttons u16 (XUSB bits), lt u8, rt u8,
+            lx i16, ly i16, rx i16, ry i16
+
+UDP is the fast path, one packet per datagram. TCP on the same port
+number is the fallback for networks that drop UDP, with the same packets
+back to back on the stream. Each client has its own sequence numbers,
+which wrap around. A frame that is not newer than the last accepted one
+is out of order and is dropped. A gap in the numbers is counted as lost
+frames, until a late frame from the gap shows up. Rate, loss and drops
+are kept per client.
+
+A packet's accepted frames reach the engine thread as one event, with
+the NETWORK source, so they get their own latency histogram. There each
+frame goes through the pad's own input path (PadController /
+VirtualPad.apply_network): merged with the keys and the mouse - buttons
+OR'ed, the higher trigger, sticks added - through the pad's curves, and
+sent on the next report tick like any other change. The server can run
+on its own, without a front-end, or inside one:
+
+    python input_server.py --backend vgamepad
+    python test_gamepad.py --listen
+    python input_client.py --loopback        # local end-to-end test
+"""
+
+import argparse
+import socket
+import struct
+import threading
+import time
+
+from controller_engine import CALL, NETWORK
+from key_dispatch import XUSB_BUTTONS
+from report_scheduler import DEFAULT_REPORT_RATE, parse_report_rate
+
+MAGIC = b'GPNF'
+VERSION = 1
+HEADER = struct.Struct('<4sBBH')
+FRAME = struct.Struct('<IHBBhhhh')
+# Keeps a full packet well inside one UDP datagram
+MAX_FRAMES = 1024
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 28960
+# Listener wake-up period (checks for stop())
+POLL_S = 0.2
+# Per-client rate window
+RATE_WINDOW_NS = 1_000_000_000
+# How far back a late frame can still take itself off the lost count
+LATE_WINDOW = 1024
+
+_SEQ_MASK = 0xFFFFFFFF
+_SEQ_HALF = 0x80000000
+_ALL_BUTTONS = sum(XUSB_BUTTONS.values())
+
+
+def pack_packet(pad, frames):
+    """frames: (seq, buttons, lt, rt, lx, ly, rx, ry) tuples -> packet bytes"""
+    if len(frames) > MAX_FRAMES:
+        raise ValueError(f"At most {MAX_FRAMES} frames per packet")
+    packet = bytearray(HEADER.size + FRAME.size * len(frames))
+    HEADER.pack_into(packet, 0, MAGIC, VERSION, pad, len(frames))
+    offset = HEADER.size
+    for frame in frames:
+        FRAME.pack_into(packet, offset, *frame)
+        offset += FRAME.size
+    return bytes(packet)
+
+
+def parse_header(data):
+    """-> (pad, frame count); raises ValueError"""
+    magic, version, pad, count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("bad magic")
+    if version != VERSION:
+        raise ValueError(f"unsupported version {version}")
+    if count > MAX_FRAMES:
+        raise ValueError(f"too many frames ({count})")
+    return pad, count
+
+
+def parse_packet(data):
+    """-> (pad, [frame tuple, ...]); raises ValueError"""
+    if len(data) < HEADER.size:
+        raise ValueError("short packet")
+    pad, count = parse_header(data)
+    if len(data) != HEADER.size + count * FRAME.size:
+        raise ValueError(f"length {len(data)} does not match {count} frames")
+    return pad, list(FRAME.iter_unpack(memoryview(data)[HEADER.size:]))
+
+
+class ClientStats:
+    """Sequence tracking and counters of one client (touched by one listener thread)"""
+
+    def __init__(self, name, transport):
+        self.name = name
+        self.transport = transport
+        self.packets = 0
+        self.frames = 0
+        self.out_of_order = 0
+        self.lost = 0
+        self.bad_packets = 0
+        self.last_seq = None
+        # Sequence numbers skipped by recent gaps - counted in lost
+        self._missing = set()
+        self.rate = 0.0
+        self.last_seen_ns = time.perf_counter_ns()
+        self._window_start_ns = self.last_seen_ns
+        self._window_frames = 0
+
+    def accept(self, frames):
+        """Frames newer than the last accepted one, in order; counts drops and gaps"""
+        accepted = []
+        last = self.last_seq
+        missing = self._missing
+        for frame in frames:
+            seq = frame[0]
+            if last is not None:
+                delta = (seq - last) & _SEQ_MASK
+                if delta == 0 or delta >= _SEQ_HALF:
+                    self.out_of_order += 1
+                    # Arrived late, not lost
+                    if seq in missing:
+                        missing.discard(seq)
+                        self.lost -= 1
+                    continue
+                self.lost += delta - 1
+                for gap in range(max(delta - LATE_WINDOW, 1), delta):
+                    missing.add((last + gap) & _SEQ_MASK)
+            last = seq
+            accepted.append(frame)
+        self.last_seq = last
+        if len(missing) > LATE_WINDOW:
+            self._missing = {seq for seq in missing if (last - seq) & _SEQ_MASK <= LATE_WINDOW}
+        self.packets += 1
+        self.frames += len(accepted)
+
+        now = time.perf_counter_ns()
+        self.last_seen_ns = now
+        self._window_frames += len(accepted)
+        elapsed = now - self._window_start_ns
+        if elapsed >= RATE_WINDOW_NS:
+            self.rate = self._window_frames * 1_000_000_000 / elapsed
+            self._window_start_ns = now
+            self._window_frames = 0
+        return accepted
+
+    def frames_per_s(self):
+        now = time.perf_counter_ns()
+        if now - self.last_seen_ns >= RATE_WINDOW_NS:
+            return 0.0      # idle
+        if self.rate:
+            return self.rate
+        # Less than one window so far
+        return self._window_frames * 1_000_000_000 / max(now - self._window_start_ns, 1)
+
+    def summary(self):
+        expected = self.frames + self.lost
+        return {
+            'client': self.name,
+            'transport': self.transport,
+            'packets': self.packets,
+            'frames': self.frames,
+            'frames_per_s': self.frames_per_s(),
+            'lost': self.lost,
+            'loss_pct': 100.0 * self.lost / expected if expected else 0.0,
+            'out_of_order': self.out_of_order,
+            'bad_packets': self.bad_packets,
+        }
+
+    def format(self):
+        s = self.summary()
+        return (f"{s['transport']} {s['client']}: {s['frames']} frames ({s['frames_per_s']:.0f}/s), "
+                f"lost {s['lost']} ({s['loss_pct']:.1f}%), out of order {s['out_of_order']}, "
+                f"bad {s['bad_packets']}")
+
+
+class InputServer:
+    def __init__(self, controller, host=DEFAULT_HOST, port=DEFAULT_PORT, tcp=True):
+        # controller: the PadController whose pads the frames drive
+        self.controller = controller
+        self.engine = controller.engine
+        self.host = host
+        self.port = port
+        self.tcp = tcp
+        self.clients = {}
+        # Frames for a pad that does not exist
+        self.unknown_pad = 0
+        self._udp = None
+        self._tcp = None
+        self._threads = []
+        self._connections = set()
+        self._running = False
+
+    # ==========================
+    # Lifecycle
+    # ==========================
+    def start(self):
+        """Bind UDP (and TCP on the same port number); port 0 picks a free one"""
+        self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._udp.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._udp.bind((self.host, self.port))
+        self._udp.settimeout(POLL_S)
+        self.port = self._udp.getsockname()[1]
+        if self.tcp:
+            try:
+                self._tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self._tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                self._tcp.bind((self.host, self.port))
+                self._tcp.listen()
+                self._tcp.settimeout(POLL_S)
+            except OSError:
+                self._udp.close()
+                raise
+        self._running = True
+        self._spawn(self._run_udp, "input-server-udp")
+        if self._tcp:
+            self._spawn(self._run_tcp, "input-server-tcp")
+        return self
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        for conn in list(self._connections):
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+        self._udp.close()
+        if self._tcp:
+            self._tcp.close()
+
+    @property
+    def running(self):
+        return self._running
+
+    def _spawn(self, target, name, *args):
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    # ==========================
+    # Listener threads
+    # ==========================
+    def _run_udp(self):
+        sock = self._udp
+        clients = self.clients
+        while self._running:
+            try:
+                data, address = sock.recvfrom(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            client = clients.get(address)
+            if client is None:
+                client = clients[address] = ClientStats(f"{address[0]}:{address[1]}", 'udp')
+            self.handle_packet(data, client)
+
+    def _run_tcp(self):
+        while self._running:
+            try:
+                conn, address = self._tcp.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            client = ClientStats(f"{address[0]}:{address[1]}", 'tcp')
+            self.clients[('tcp',) + address] = client
+            self._spawn(self._run_tcp_client, f"input-server-{client.name}", conn, client)
+
+    def _run_tcp_client(self, conn, client):
+        # Blocking reads - stop() shuts the connection down to end them
+        conn.settimeout(None)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._connections.add(conn)
+        stream = conn.makefile('rb')
+        try:
+            while self._running:
+                header = stream.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    break
+                try:
+                    pad, count = parse_header(header)
+                except ValueError:
+                    # The stream is out of step - nothing after this can be trusted
+                    client.bad_packets += 1
+                    break
+                body = stream.read(count * FRAME.size)
+                if len(body) < count * FRAME.size:
+                    break
+                self.handle_frames(pad, list(FRAME.iter_unpack(body)), client)
+        except OSError:
+            pass
+        finally:
+            self._connections.discard(conn)
+            stream.close()
+            conn.close()
+
+    def handle_packet(self, data, client):
+        try:
+            pad, frames = parse_packet(data)
+        except (ValueError, struct.error):
+            client.bad_packets += 1
+            return
+        self.handle_frames(pad, frames, client)
+
+    def handle_frames(self, pad, frames, client):
+        accepted = client.accept(frames)
+        if accepted:
+            self.engine.post(CALL, self._apply_frames, (pad, accepted), NETWORK)
+
+    # ==========================
+    # Engine thread
+    # ==========================
+    def _apply_frames(self, pad, frames):
+        pads = self.controller.pad_router.pads
+        if pad == 0:
+            target = self.controller
+        elif pad <= len(pads):
+            target = pads[pad - 1]
+        else:
+            self.unknown_pad += len(frames)
+            return
+        for _, buttons, lt, rt, lx, ly, rx, ry in frames:
+            target.apply_network(buttons & _ALL_BUTTONS, lt / 255, rt / 255,
+                                 (lx / 32767, ly / 32767), (rx / 32767, ry / 32767))
+
+    # ==========================
+    # Metrics
+    # ==========================
+    def stats(self):
+        return [client.summary() for client in list(self.clients.values())]
+
+    def format_stats(self):
+        clients = list(self.clients.values())
+        if not clients:
+            return f"Network input: listening on {self.host}:{self.port}, no clients"
+        lines = [f"Network input on {self.host}:{self.port}:"]
+        lines.extend(f"  {client.format()}" for client in clients)
+        if self.unknown_pad:
+            lines.append(f"  {self.unknown_pad} frames for pads that do not exist")
+        return '\n'.join(lines)
+
+
+def main(argv=None):
+    from output_backends import DEFAULT_BACKEND
+    from pad_controller import PadController
+
+    parser = argparse.ArgumentParser(description="Network input server driving a virtual pad")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="address to bind ('0.0.0.0' for all interfaces)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--no-tcp', action='store_true', help="UDP only")
+    parser.add_argument('--backend', default=DEFAULT_BACKEND, help="'vgamepad' or 'recording'")
+    parser.add_argument('--rate', type=parse_report_rate, default=DEFAULT_REPORT_RATE,
+                        help="report rate: 125/250/500/1000 or 'immediate'")
+    parser.add_argument('--interval', type=float, default=2.0, help="seconds between stats lines")
+    args = parser.parse_args(argv)
+
+    controller = PadController(args.backend, args.rate).start()
+    engine = controller.engine
+    server = InputServer(controller, args.host, args.port, not args.no_tcp).start()
+    print(f"🌐 Listening on {args.host}:{server.port} (UDP{'' if args.no_tcp else ' + TCP'}) - Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(args.interval)
+            print(server.format_stats())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        controller.close()
+        print(engine.format_stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+⌨️ Key Dispatch
+Compiles a profile's button mappings into a key -> actions table.
+
+Every key event is resolved with a single dict lookup on the normalized
+key identity, no matter how many bindings the profile has. The table is
+rebuilt only when the mappings change (apply / load profile).
+"""
+
+from collections import namedtuple
+
+# Action kinds
+BUTTON = 0      # digital button - mask is the XUSB report bit
+TRIGGER = 1     # analog trigger - value is the pressed level (0.0 - 1.0)
+STICK = 2       # left stick contribution - value is the (x, y) direction
+CONTROL = 3     # front-end command (sensitivity, mouse toggle...) - value is the argument
+MACRO = 4       # timed state sequence - name is the macro name (see macros.py)
+
+# button_mappings entries "macro:<name>": key bind a profile macro
+MACRO_PREFIX = 'macro:'
+
+KeyAction = namedtuple('KeyAction', 'kind name mask value')
+
+# XUSB report button bits (same values as vg.XUSB_BUTTON)
+XUSB_BUTTONS = {
+    'DPad_Up': 0x0001,
+    'DPad_Down': 0x0002,
+    'DPad_Left': 0x0004,
+    'DPad_Right': 0x0008,
+    'Start': 0x0010,
+    'Back': 0x0020,
+    'Guide': 0x0400,
+    'A': 0x1000,
+    'B': 0x2000,
+    'X': 0x4000,
+    'Y': 0x8000,
+}
+
+# Prebuilt actions for every logical button name used in the profiles
+BUTTON_ACTIONS = {name: KeyAction(BUTTON, name, mask, 1.0) for name, mask in XUSB_BUTTONS.items()}
+BUTTON_ACTIONS['LT'] = KeyAction(TRIGGER, 'LT', 0, 1.0)
+BUTTON_ACTIONS['RT'] = KeyAction(TRIGGER, 'RT', 0, 1.0)
+
+# Left stick contribution of each movement key
+MOVEMENT_KEYS = {
+    'w': (0.0, 1.0),
+    's': (0.0, -1.0),
+    'a': (-1.0, 0.0),
+    'd': (1.0, 0.0),
+}
+
+DEFAULT_BUTTON_MAPPINGS = {
+    'A': 't', 'B': 'y', 'X': 'g', 'Y': 'h',
+    'Back': 'z', 'Start': 'x', 'Guide': 'c',
+    'LT': 'u', 'RT': 'o',
+    'DPad_Up': '1', 'DPad_Down': '2', 'DPad_Left': '3', 'DPad_Right': '4'
+}
+
+
+def normalize_key(key):
+    """Return a hashable identity for a pynput key (or a fake key with .char)
+
+    Printable keys -> lower-case char, special keys -> keyboard.Key name
+    ('space', 'page_up'...), anything else -> virtual key code.
+    """
+    char = getattr(key, 'char', None)
+    if char:
+        return char.lower()
+    name = getattr(key, 'name', None)
+    if name:
+        return name
+    return getattr(key, 'vk', None)
+
+
+def compile_mappings(button_mappings, movement_keys=MOVEMENT_KEYS, extra=None):
+    """Build {key identity: (action, ...)} from a profile's button mappings
+
+    extra is an optional {key identity: action} dict for front-end commands.
+    A key bound to several things (e.g. a button mapped onto a movement key)
+    keeps all of its actions, in the same order the old if/elif code applied them.
+    """
+    table = {}
+
+    def add(key, action):
+        table[key] = table.get(key, ()) + (action,)
+
+    for key, direction in movement_keys.items():
+        add(key, KeyAction(STICK, key, 0, direction))
+
+    for button_name, key in button_mappings.items():
+        action = BUTTON_ACTIONS.get(button_name)
+        if action is None and button_name.startswith(MACRO_PREFIX):
+            action = KeyAction(MACRO, button_name[len(MACRO_PREFIX):], 0, None)
+        if action and key:
+            add(key.lower(), action)
+
+    if extra:
+        for key, action in extra.items():
+            add(key, action)
+
+    return table
@@ -0,0 +1,83 @@
+"""
+🔁 Key Repeat
+Per-key down/up state machine in front of the key dispatch.
+
+While a key is held the OS keeps delivering key-down events (auto-repeat,
+~30/s after a short delay). KeyStates passes the first down of each key
+and drops the repeats before they are posted to the engine - no queue
+entry, no dispatch, no update() or log line - and counts them. A binding
+may use its repeats as turbo instead: every repeat toggles the key
+(release, press, release...), so the button pulses at half the OS repeat
+rate for as long as it is held.
+
+Profile - binding (button name or "macro:<name>") -> policy, default "drop":
+
+    "repeat": {"A": "turbo", "RT": "turbo"}
+"""
+
+from controller_engine import KEY_DOWN, KEY_UP
+
+REPEAT_DROP = 'drop'
+REPEAT_TURBO = 'turbo'
+REPEAT_POLICIES = (REPEAT_DROP, REPEAT_TURBO)
+
+# Key states (released keys have none)
+_DOWN = 1
+_TURBO_UP = 2       # still held, released by turbo
+
+
+def parse_repeat(data, button_mappings):
+    """Profile "repeat" -> {key identity: policy} of the bindings that do not drop; raises ValueError"""
+    policies = {}
+    for binding, policy in (data or {}).items():
+        if policy not in REPEAT_POLICIES:
+            raise ValueError(f"Unknown repeat policy for {binding}: {policy}")
+        key = button_mappings.get(binding)
+        if key and policy != REPEAT_DROP:
+            policies[key.lower()] = policy
+    return policies
+
+
+class KeyStates:
+    """Held keys of one keyboard - only touched by the thread that reads the keyboard"""
+
+    def __init__(self, policies=None):
+        # {key identity: policy}, replaced whole when the bindings change
+        self.policies = policies or {}
+        self.states = {}
+        self.presses = 0
+        self.dropped = 0
+        self.turbo = 0
+
+    def down(self, key_id):
+        """Event kind to post for a key-down, or None to drop it"""
+        state = self.states.get(key_id)
+        if state is None:
+            self.states[key_id] = _DOWN
+            self.presses += 1
+            return KEY_DOWN
+        if self.policies.get(key_id) == REPEAT_TURBO:
+            self.turbo += 1
+            if state == _DOWN:
+                self.states[key_id] = _TURBO_UP
+                return KEY_UP
+            self.states[key_id] = _DOWN
+            return KEY_DOWN
+        self.dropped += 1
+        return None
+
+    def up(self, key_id):
+        """False if turbo already released the key; keys never seen going down are released"""
+        return self.states.pop(key_id, None) != _TURBO_UP
+
+    def reset(self):
+        """Forget the held keys - their releases will not be seen (listener stopped)"""
+        self.states.clear()
+
+    def reset_stats(self):
+        self.presses = 0
+        self.dropped = 0
+        self.turbo = 0
+
+    def format_stats(self):
+        return f"Keys: {self.presses} presses, {self.dropped} auto-repeats dropped, {self.turbo} turbo"
@@ -0,0 +1,94 @@
+"""
+⏲️ Latency Histogram
+Fixed-size HDR-style histogram of nanosecond latencies.
+
+Values are bucketed log-linearly: exact below 2**SUB_BITS ns, then 16
+linear sub-buckets per power of two (~6.25% worst-case error), which covers
+1 ns - 18 minutes in a few hundred counters. record() is O(1) and never
+allocates, so it can run on the engine thread for every event.
+"""
+
+from array import array
+
+SUB_BITS = 5
+_SUB_COUNT = 1 << SUB_BITS          # exact buckets 0 .. 31
+_HALF = _SUB_COUNT // 2             # sub-buckets per power of two above that
+_MAX_EXPONENT = 36
+BUCKETS = _SUB_COUNT + _MAX_EXPONENT * _HALF
+
+PERCENTILES = (50, 95, 99)
+
+
+def _index(value):
+    shift = value.bit_length() - SUB_BITS
+    if shift <= 0:
+        return value
+    if shift > _MAX_EXPONENT:
+        return BUCKETS - 1
+    return _SUB_COUNT + (shift - 1) * _HALF + (value >> shift) - _HALF
+
+
+def _upper_bound(index):
+    # Highest value that lands in this bucket (reported percentiles never under-state)
+    if index < _SUB_COUNT:
+        return index
+    shift, sub = divmod(index - _SUB_COUNT, _HALF)
+    shift += 1
+    return ((sub + _HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * BUCKETS))
+        self.reset()
+
+    def reset(self):
+        for i in range(BUCKETS):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value_ns):
+        if value_ns < 0:
+            value_ns = 0
+        self.counts[_index(value_ns)] += 1
+        if not self.count or value_ns < self.min:
+            self.min = value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+        self.count += 1
+        self.total += value_ns
+
+    def percentile(self, p):
+        """Value (ns) below which p% of the recorded latencies fall"""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * p // 100))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n:
+                seen += n
+                if seen >= rank:
+                    return min(_upper_bound(i), self.max)
+        return self.max
+
+    def summary(self):
+        """{'count', 'mean_us', 'min_us', 'p50_us', 'p95_us', 'p99_us', 'max_us'}"""
+        s = {
+            'count': self.count,
+            'mean_us': self.total / self.count / 1000 if self.count else 0.0,
+            'min_us': self.min / 1000,
+        }
+        for p in PERCENTILES:
+            s[f'p{p}_us'] = self.percentile(p) / 1000
+        s['max_us'] = self.max / 1000
+        return s
+
+    def format(self):
+        s = self.summary()
+        if not s['count']:
+            return "no samples"
+        return (f"n={s['count']} p50 {s['p50_us']:.0f}us p95 {s['p95_us']:.0f}us "
+                f"p99 {s['p99_us']:.0f}us max {s['max_us']:.0f}us")
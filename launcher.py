@@ -2,10 +2,18 @@
 """
 🎮 Virtual Xbox Controller Launcher
 Choose between GUI and Console versions
+
+Interfaces are imported only once chosen. --startup-profile skips the
+menu and prints where the startup time of one GUI goes:
+
+    python launcher.py --startup-profile pro
 """
 
+import argparse
+import importlib
 import sys
-import os
+
+STARTUP_PROFILES = ('pro', 'enhanced', 'standard')
 
 def show_menu():
     print("🎮 Virtual Xbox Controller Launcher")
@@ -37,14 +45,28 @@ def show_menu():
     print("   - Lightweight and fast")
     print("   - Full keyboard and mouse support")
     print()
-    print("5. ❌ Exit")
+    print("5. 📊 Benchmark")
+    print("   - Headless input storm on every interface")
+    print("   - Events/s, reports/s, CPU, memory, latency")
+    print("   - Saves benchmark_results.json")
+    print()
+    print("6. ❌ Exit")
     print()
     
-def launch_professional_gui():
+def import_interface(name, startup=None):
+    """Import a front-end module; with a startup profile, timed module by module"""
+    if startup is None:
+        return importlib.import_module(name)
+    with startup.timed_imports():
+        module = importlib.import_module(name)
+    startup.mark(f"import {name}")
+    return module
+
+def launch_professional_gui(startup=None):
     try:
         print("🏆 Launching Professional GUI version...")
-        import gamepad_gui_pro
-        app = gamepad_gui_pro.GamepadGUIPro()
+        gamepad_gui_pro = import_interface('gamepad_gui_pro', startup)
+        app = gamepad_gui_pro.GamepadGUIPro(startup=startup)
         app.run()
     except ImportError as e:
         print(f"❌ Error importing Professional GUI module: {e}")
@@ -53,11 +75,11 @@ def launch_professional_gui():
     except Exception as e:
         print(f"❌ Error launching Professional GUI: {e}")
 
-def launch_enhanced_gui():
+def launch_enhanced_gui(startup=None):
     try:
         print("🚀 Launching Enhanced GUI version...")
-        import gamepad_gui_enhanced
-        app = gamepad_gui_enhanced.GamepadGUIEnhanced()
+        gamepad_gui_enhanced = import_interface('gamepad_gui_enhanced', startup)
+        app = gamepad_gui_enhanced.GamepadGUIEnhanced(startup=startup)
         app.run()
     except ImportError as e:
         print(f"❌ Error importing Enhanced GUI module: {e}")
@@ -66,11 +88,11 @@ def launch_enhanced_gui():
     except Exception as e:
         print(f"❌ Error launching Enhanced GUI: {e}")
 
-def launch_gui():
+def launch_gui(startup=None):
     try:
         print("🚀 Launching Standard GUI version...")
-        import gamepad_gui
-        app = gamepad_gui.GamepadGUI()
+        gamepad_gui = import_interface('gamepad_gui', startup)
+        app = gamepad_gui.GamepadGUI(startup=startup)
         app.run()
     except ImportError as e:
         print(f"❌ Error importing GUI module: {e}")
@@ -83,18 +105,43 @@ def launch_console():
     try:
         print("🚀 Launching console version...")
         import test_gamepad
+        test_gamepad.main()
     except ImportError as e:
         print(f"❌ Error importing console module: {e}")
         print("Make sure test_gamepad.py exists in the current directory")
     except Exception as e:
         print(f"❌ Error launching console version: {e}")
 
-def main():
+def launch_benchmark():
+    try:
+        print("📊 Running headless benchmark...")
+        import benchmark
+        benchmark.main(['--json', 'benchmark_results.json'])
+    except ImportError as e:
+        print(f"❌ Error importing benchmark module: {e}")
+    except Exception as e:
+        print(f"❌ Error running benchmark: {e}")
+
+def profile_startup(name):
+    from startup_profile import StartupProfile
+    startup = StartupProfile(print)
+    launch = {'pro': launch_professional_gui, 'enhanced': launch_enhanced_gui, 'standard': launch_gui}[name]
+    launch(startup)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Virtual Xbox Controller launcher")
+    parser.add_argument('--startup-profile', choices=STARTUP_PROFILES, metavar='GUI',
+                        help=f"launch one GUI ({', '.join(STARTUP_PROFILES)}) and print its startup timing")
+    args = parser.parse_args(argv)
+    if args.startup_profile:
+        profile_startup(args.startup_profile)
+        return
+    
     while True:
         show_menu()
         
         try:
-            choice = input("Enter your choice (1-5): ").strip()
+            choice = input("Enter your choice (1-6): ").strip()
             
             if choice == '1':
                 launch_professional_gui()
@@ -109,10 +156,13 @@ def main():
                 launch_console()
                 break
             elif choice == '5':
+                launch_benchmark()
+                break
+            elif choice == '6':
                 print("👋 Goodbye!")
                 sys.exit(0)
             else:
-                print("❌ Invalid choice. Please enter 1, 2, 3, 4, or 5.")
+                print("❌ Invalid choice. Please enter 1, 2, 3, 4, 5, or 6.")
                 print()
                 
         except KeyboardInterrupt:
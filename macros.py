@@ -0,0 +1,317 @@
+"""
+🎬 Macros
+Timed sequences of controller states with sub-millisecond step timing.
+
+A macro is a list of steps, each a full pad state held for hold_ms:
+
+    {"buttons": ["A"], "lt": 0.0, "rt": 1.0, "left": [0.0, 1.0], "right": [0.0, 0.0], "hold_ms": 16.7}
+
+Missing fields are released / centered. Profiles keep macros under
+"macros" and bind one to a key with a "macro:<name>" entry in
+button_mappings. A macro owns the pad while it plays and leaves it
+neutral after the last step.
+
+One MacroPlayer thread works through a deadline queue with a hybrid
+timer: it sleeps until SPIN_NS before a deadline, then spins (yielding the
+GIL) for the rest. Steps go to the engine with call_now(), which cuts the
+tick wait short, so each step's report is sent at its deadline rather than
+on the next report tick. The error between the deadline and the report
+submission is kept per step. The same queue runs plain timed calls
+(call_later), e.g. the release of a simulated GUI click.
+"""
+
+import heapq
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+
+from key_dispatch import XUSB_BUTTONS
+from output_backends import axis_to_int16, trigger_to_uint8
+
+# Sleep until this long before a deadline, then spin - covers sleep overshoot
+SPIN_NS = 2_000_000 if sys.platform == 'win32' else 1_000_000
+# The first step is scheduled this far ahead so it is timed like the others
+START_LEAD_NS = 2_000_000
+# Finished runs kept for inspection
+RESULTS_KEPT = 20
+
+STEP_FIELDS = ('buttons', 'lt', 'rt', 'left', 'right', 'hold_ms')
+_ALL_BUTTONS = sum(XUSB_BUTTONS.values())
+
+MacroStep = namedtuple('MacroStep', 'buttons mask lt rt left right hold_ns')
+
+# Applied after the last step
+NEUTRAL = MacroStep((), 0, 0.0, 0.0, (0.0, 0.0), (0.0, 0.0), 0)
+
+
+def _stick(value, field):
+    if value is None:
+        return (0.0, 0.0)
+    x, y = (float(v) for v in value)
+    if not (-1.0 <= x <= 1.0 and -1.0 <= y <= 1.0):
+        raise ValueError(f"Invalid {field} stick: {value}")
+    return (x, y)
+
+
+def _trigger(value, field):
+    value = float(value)
+    if not 0.0 <= value <= 1.0:
+        raise ValueError(f"Invalid {field}: {value}")
+    return value
+
+
+def parse_step(data):
+    for field in data:
+        if field not in STEP_FIELDS:
+            raise ValueError(f"Unknown macro step field: {field}")
+    buttons = tuple(data.get('buttons') or ())
+    mask = 0
+    for name in buttons:
+        if name not in XUSB_BUTTONS:
+            raise ValueError(f"Unknown macro button: {name}")
+        mask |= XUSB_BUTTONS[name]
+    hold_ms = float(data.get('hold_ms', 0.0))
+    if hold_ms <= 0:
+        raise ValueError(f"Invalid hold_ms: {hold_ms}")
+    return MacroStep(buttons, mask,
+                     _trigger(data.get('lt', 0.0), 'lt'), _trigger(data.get('rt', 0.0), 'rt'),
+                     _stick(data.get('left'), 'left'), _stick(data.get('right'), 'right'),
+                     int(hold_ms * 1_000_000))
+
+
+def parse_macros(data):
+    """Profile "macros" dict -> {name: (MacroStep, ...)}; raises ValueError on bad steps"""
+    macros = {}
+    for name, steps in (data or {}).items():
+        if not steps:
+            raise ValueError(f"Macro {name} has no steps")
+        try:
+            macros[name] = tuple(parse_step(step) for step in steps)
+        except (TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid step in macro {name}: {e}")
+    return macros
+
+
+def macros_to_profile(macros):
+    return {name: [{'buttons': list(step.buttons), 'lt': step.lt, 'rt': step.rt,
+                    'left': list(step.left), 'right': list(step.right),
+                    'hold_ms': step.hold_ns / 1_000_000} for step in steps]
+            for name, steps in macros.items()}
+
+
+def wait_until(deadline_ns, wake=None, spin_ns=SPIN_NS):
+    """Hybrid timer: sleep to spin_ns before the deadline, then spin
+
+    Returns False (without waiting further) if wake was set during the sleep.
+    """
+    while True:
+        remaining = deadline_ns - time.perf_counter_ns()
+        if remaining <= spin_ns:
+            break
+        if wake is None:
+            time.sleep((remaining - spin_ns) / 1_000_000_000)
+        elif wake.wait((remaining - spin_ns) / 1_000_000_000):
+            wake.clear()
+            return False
+    while time.perf_counter_ns() < deadline_ns:
+        time.sleep(0)
+    return True
+
+
+class MacroRun:
+    """One playback; errors_ns is filled in on the engine thread as steps go out"""
+
+    def __init__(self, name, steps):
+        self.name = name
+        self.steps = steps
+        # Deadline -> report submitted, per step plus the final release
+        self.errors_ns = []
+        self.done = threading.Event()
+
+    def summary(self):
+        errors = [e / 1000 for e in self.errors_ns]
+        return {
+            'name': self.name,
+            'steps': len(self.steps),
+            'avg_error_us': sum(errors) / len(errors) if errors else 0.0,
+            'max_error_us': max(errors, default=0.0),
+            'errors_us': errors,
+        }
+
+    def format(self):
+        s = self.summary()
+        steps = ' '.join(f"{e:.0f}" for e in s['errors_us'])
+        return (f"Macro {s['name']}: {s['steps']} steps, timing error avg {s['avg_error_us']:.0f}us "
+                f"max {s['max_error_us']:.0f}us (per step, us: {steps})")
+
+
+class MacroPlayer:
+    def __init__(self, engine, macros=None, on_done=None):
+        self.engine = engine
+        self.macros = macros or {}
+        # on_done(run) - called on the engine thread when a run finished
+        self.on_done = on_done
+        self.results = deque(maxlen=RESULTS_KEPT)
+
+        self._timeline = []     # heap of (deadline_ns, seq, fn, args)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()          # timeline changed
+        self._engine_wake = threading.Event()   # engine.wake while a macro plays
+        self._active = 0
+        self._current = None    # MacroRun playing - steps of any other run are stale
+        self._running = False
+        self._thread = None
+
+    # ==========================
+    # Any thread
+    # ==========================
+    def set_macros(self, macros):
+        self.macros = macros
+
+    @property
+    def playing(self):
+        return self._active > 0
+
+    def play(self, name):
+        """Start a macro; returns its MacroRun, or None if unknown or one is already playing"""
+        steps = self.macros.get(name)
+        if not steps:
+            return None
+        with self._lock:
+            if self._active:
+                return None
+            self._active += 1
+            self.engine.wake = self._engine_wake
+            run = self._current = MacroRun(name, steps)
+        deadline = time.perf_counter_ns() + START_LEAD_NS
+        entries = []
+        for index, step in enumerate(steps + (NEUTRAL,)):
+            entries.append((deadline, self.engine.call_now, (self._apply_step, run, index, step, deadline)))
+            deadline += step.hold_ns
+        self._schedule(entries)
+        return run
+
+    def call_later(self, delay_s, fn, *args):
+        """Run fn(*args) on the player thread after delay_s, on the same precise timer"""
+        self._schedule([(time.perf_counter_ns() + int(delay_s * 1_000_000_000), fn, args)])
+
+    def _schedule(self, entries):
+        with self._lock:
+            for deadline, fn, args in entries:
+                self._seq += 1
+                heapq.heappush(self._timeline, (deadline, self._seq, fn, args))
+        self._wake.set()
+
+    # ==========================
+    # Lifecycle
+    # ==========================
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        _timer_resolution(True)
+        self._thread = threading.Thread(target=self._run, name="macro-player", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._wake.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        # Drop what is still scheduled; a run cut short counts as done, so
+        # play() works again after a restart
+        with self._lock:
+            self._timeline.clear()
+            self._active = 0
+            run, self._current = self._current, None
+        if run is not None:
+            run.done.set()
+        self.engine.wake = None
+        _timer_resolution(False)
+
+    # ==========================
+    # Player thread
+    # ==========================
+    def _run(self):
+        timeline = self._timeline
+        while self._running:
+            with self._lock:
+                deadline = timeline[0][0] if timeline else None
+            if deadline is None:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            if not wait_until(deadline, self._wake):
+                continue    # something new was scheduled - re-check the earliest deadline
+            with self._lock:
+                _, _, fn, args = heapq.heappop(timeline)
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"⚠️ Macro timer error: {e}")
+
+    # ==========================
+    # Engine thread
+    # ==========================
+    def _apply_step(self, run, index, step, deadline):
+        if run is not self._current:
+            return      # stopped - already handed to the engine when the player stopped
+        engine = self.engine
+        gamepad = engine.gamepad
+        state = engine.state
+
+        gamepad.release_button(_ALL_BUTTONS & ~step.mask)
+        gamepad.press_button(step.mask)
+        gamepad.left_trigger(trigger_to_uint8(step.lt))
+        gamepad.right_trigger(trigger_to_uint8(step.rt))
+        gamepad.left_joystick(axis_to_int16(step.left[0]), axis_to_int16(step.left[1]))
+        gamepad.right_joystick(axis_to_int16(step.right[0]), axis_to_int16(step.right[1]))
+
+        scheduler = engine.scheduler
+        scheduler.request_update()
+        if not scheduler.immediate:
+            scheduler.flush()
+        run.errors_ns.append(time.perf_counter_ns() - deadline)
+
+        for name in XUSB_BUTTONS:
+            if name in step.buttons:
+                state.press(name)
+            else:
+                state.release(name)
+        state.set_trigger('LT', step.lt)
+        state.set_trigger('RT', step.rt)
+        state.set_left_stick(*step.left)
+        state.set_right_stick(*step.right)
+
+        if index == len(run.steps):
+            self._finish(run)
+
+    def _finish(self, run):
+        with self._lock:
+            self._active -= 1
+            self._current = None
+            if not self._active:
+                self.engine.wake = None
+        self.results.append(run)
+        run.done.set()
+        if self.on_done:
+            self.on_done(run)
+
+
+def _timer_resolution(high):
+    # Windows sleeps in ~15.6 ms steps by default; ask for 1 ms while the player runs
+    if sys.platform != 'win32':
+        return
+    try:
+        import ctypes
+        winmm = ctypes.windll.winmm
+        if high:
+            winmm.timeBeginPeriod(1)
+        else:
+            winmm.timeEndPeriod(1)
+    except (ImportError, AttributeError, OSError):
+        pass
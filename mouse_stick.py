@@ -0,0 +1,108 @@
+"""
+🖱️ Mouse Stick
+Relative (delta) mouse -> right stick mapping.
+
+Mouse moves only accumulate a delta on the engine thread; the stick value
+is computed once per report tick from whatever arrived since the last
+tick, so the cost stays flat whatever the mouse polling rate is. Cursor
+speed goes through an acceleration curve and is clamped; when the mouse
+stops, the stick decays back to center over time instead of snapping.
+"""
+
+import math
+
+MOUSE_MODES = ('absolute', 'relative')
+DEFAULT_MOUSE_MODE = 'absolute'
+
+# Cursor speed (px/s) that gives full deflection at sensitivity 1.0
+FULL_SPEED_PX_S = 1500.0
+# >1.0: slow moves stay precise, fast flicks ramp up quicker
+DEFAULT_CURVE_EXPONENT = 1.5
+# Time constant of the return to center once the mouse stops
+DEFAULT_DECAY_MS = 40.0
+# Idle time before decay starts - covers the gap between 125 Hz mouse reports
+HOLD_NS = 10_000_000
+# Longest gap a delta is averaged over; older motion counts as a fresh start
+MAX_WINDOW_NS = 50_000_000
+# Below this the stick is considered centered
+CENTER_EPSILON = 0.002
+
+
+class RelativeMouseStick:
+    def __init__(self, sensitivity=0.5, exponent=DEFAULT_CURVE_EXPONENT,
+                 decay_ms=DEFAULT_DECAY_MS, max_output=1.0):
+        self.sensitivity = sensitivity
+        self.exponent = exponent
+        self.decay_ms = decay_ms
+        self.max_output = max_output
+        self.reset()
+
+    def reset(self):
+        self.last_pos = None
+        self.acc_x = 0
+        self.acc_y = 0
+        self.x = 0.0
+        self.y = 0.0
+        self._last_tick_ns = None
+        self._last_motion_ns = None
+
+    def add_position(self, x, y):
+        """Accumulate the delta from the previous cursor position (cheap, per event)"""
+        last = self.last_pos
+        self.last_pos = (x, y)
+        if last is not None:
+            self.acc_x += x - last[0]
+            self.acc_y += y - last[1]
+
+    def curve(self, speed):
+        """Cursor speed (px/s) -> stick magnitude (0.0 - max_output)"""
+        level = speed * self.sensitivity / FULL_SPEED_PX_S
+        level = level ** self.exponent
+        return level if level < self.max_output else self.max_output
+
+    def update(self, now_ns):
+        """Advance one tick; returns (x, y) when the stick moved, else None
+
+        y is in stick orientation (mouse up = stick up).
+        """
+        last_tick = self._last_tick_ns
+        self._last_tick_ns = now_ns
+        if last_tick is None:
+            return None
+
+        dx = self.acc_x
+        dy = self.acc_y
+        if dx or dy:
+            self.acc_x = 0
+            self.acc_y = 0
+            # Average over the time since the previous motion so slow
+            # polling (fewer events than ticks) does not read as bursts
+            since = self._last_motion_ns
+            window = now_ns - since if since is not None else 0
+            if window > MAX_WINDOW_NS or window <= 0:
+                # First motion after a pause - assume a slow mouse report gap
+                # rather than reading a single delta over one short tick
+                window = max(now_ns - last_tick, HOLD_NS)
+            self._last_motion_ns = now_ns
+
+            distance = math.hypot(dx, dy)
+            level = self.curve(distance * 1_000_000_000 / window)
+            x = dx / distance * level
+            y = -dy / distance * level
+        else:
+            if not self.x and not self.y:
+                return None
+            since = self._last_motion_ns
+            if since is not None and now_ns - since < HOLD_NS:
+                return None
+            decay = math.exp(-(now_ns - last_tick) / (self.decay_ms * 1_000_000))
+            x = self.x * decay
+            y = self.y * decay
+            if abs(x) < CENTER_EPSILON and abs(y) < CENTER_EPSILON:
+                x = y = 0.0
+
+        if x == self.x and y == self.y:
+            return None
+        self.x = x
+        self.y = y
+        return x, y
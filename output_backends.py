@@ -0,0 +1,441 @@
+"""
+🔌 Output Backends
+Where controller reports go once the engine submits them.
+
+All backends share the vgamepad-style setters the front-ends already use
+(press_button, left_joystick_float, ...) and keep the pending state as a
+quantized XUSB report. update() hands that report to submit(), the only
+method a backend has to implement - unless it is byte-identical to the
+last report sent, in which case it is counted and suppressed. A button
+or trigger pressed and released again between two reports is latched: it
+goes out pressed, and the report scheduler sends the release on its next
+tick.
+
+- VGamepadBackend:  the real virtual Xbox 360 pad (needs the ViGEm driver)
+- RecordingBackend: in-memory ring buffer of timestamped reports, for
+                    headless benchmarking and report-stream comparisons
+- DS4Backend:       a virtual DualShock 4 - the XUSB report goes through
+                    precomputed translation tables (buttons, PS button,
+                    d-pad direction, uint8 axes)
+- DS4RecordingBackend: the same translation into an in-memory DS4 sink
+
+Profiles pick the controller type with "output" ('x360' or 'ds4');
+backend_for() finds the backend giving that type on the same sink
+(real driver or memory).
+"""
+
+import time
+from array import array
+
+DEFAULT_BACKEND = 'vgamepad'
+
+# Controller types a profile can ask for
+OUTPUTS = ('x360', 'ds4')
+DEFAULT_OUTPUT = 'x360'
+
+NEUTRAL_REPORT = (0, 0, 0, 0, 0, 0, 0)
+
+# Values stored per recorded report: timestamp + the 7 report fields
+RECORD_FIELDS = ('ts_ns', 'buttons', 'lt', 'rt', 'lx', 'ly', 'rx', 'ry')
+RECORD_WIDTH = len(RECORD_FIELDS)
+DEFAULT_RECORD_CAPACITY = 65536
+
+
+def axis_to_int16(value):
+    """Float stick axis (-1.0 - 1.0) to the driver's int16, clamped"""
+    value = round(value * 32767)
+    if value > 32767:
+        return 32767
+    if value < -32768:
+        return -32768
+    return value
+
+
+def trigger_to_uint8(value):
+    """Float trigger (0.0 - 1.0) to the driver's uint8, clamped"""
+    value = round(value * 255)
+    if value > 255:
+        return 255
+    if value < 0:
+        return 0
+    return value
+
+
+class OutputBackend:
+    """Pending XUSB report state; subclasses implement submit(report)"""
+    name = 'base'
+    output = 'x360'
+    sink = 'driver'     # 'driver' or 'memory'
+
+    def __init__(self):
+        self.buttons = 0
+        self.lt = 0
+        self.rt = 0
+        self.lx = 0
+        self.ly = 0
+        self.rx = 0
+        self.ry = 0
+
+        # Buttons pressed / highest trigger values since the last report, and
+        # whether that report showed a tap that was already released
+        self.pressed = 0
+        self.lt_peak = 0
+        self.rt_peak = 0
+        self.latched = False
+
+        # Diff layer - skip reports the driver would not see as a change
+        self.suppress_duplicates = True
+        self.last_report = None
+        self.submitted = 0
+        self.suppressed = 0
+
+    # vgamepad-compatible setters
+    def press_button(self, button):
+        button = int(button)
+        self.buttons |= button
+        self.pressed |= button
+
+    def release_button(self, button):
+        self.buttons &= ~int(button)
+
+    def left_trigger_float(self, value):
+        self.left_trigger(trigger_to_uint8(value))
+
+    def right_trigger_float(self, value):
+        self.right_trigger(trigger_to_uint8(value))
+
+    def left_joystick_float(self, x, y):
+        self.lx = axis_to_int16(x)
+        self.ly = axis_to_int16(y)
+
+    def right_joystick_float(self, x, y):
+        self.rx = axis_to_int16(x)
+        self.ry = axis_to_int16(y)
+
+    # Raw driver values (already shaped by a response curve table)
+    def left_trigger(self, value):
+        self.lt = value
+        if value > self.lt_peak:
+            self.lt_peak = value
+
+    def right_trigger(self, value):
+        self.rt = value
+        if value > self.rt_peak:
+            self.rt_peak = value
+
+    def left_joystick(self, x, y):
+        self.lx = x
+        self.ly = y
+
+    def right_joystick(self, x, y):
+        self.rx = x
+        self.ry = y
+
+    def report(self):
+        """(buttons, lt, rt, lx, ly, rx, ry) exactly as the driver would see it"""
+        return (self.buttons, self.lt, self.rt, self.lx, self.ly, self.rx, self.ry)
+
+    def load_report(self, report):
+        """Set the pending state from a report() tuple (switching devices)"""
+        self.buttons, self.lt, self.rt, self.lx, self.ly, self.rx, self.ry = report
+
+    def update(self):
+        report = self.report()
+        # A tap shorter than a report interval still reaches the driver
+        buttons = self.pressed & ~self.buttons
+        # Triggers only when they were released in the last report as well
+        # (a release ramp is not a tap)
+        last = self.last_report or NEUTRAL_REPORT
+        lt = 0 if self.lt or last[1] else self.lt_peak
+        rt = 0 if self.rt or last[2] else self.rt_peak
+        self.pressed = self.lt_peak = self.rt_peak = 0
+        self.latched = bool(buttons or lt or rt)
+        if self.latched:
+            report = (report[0] | buttons, lt or report[1], rt or report[2]) + report[3:]
+        if report == self.last_report and self.suppress_duplicates:
+            self.suppressed += 1
+            return
+        self.last_report = report
+        # False: the device-specific report did not change (e.g. DS4 axis quantization)
+        if self.submit(report) is False:
+            self.suppressed += 1
+            return
+        self.submitted += 1
+
+    def diff_stats(self):
+        total = self.submitted + self.suppressed
+        return {
+            'reports_sent': self.submitted,
+            'reports_suppressed': self.suppressed,
+            'suppressed_pct': 100.0 * self.suppressed / total if total else 0.0,
+        }
+
+    def submit(self, report):
+        raise NotImplementedError
+
+
+class VGamepadBackend(OutputBackend):
+    name = 'vgamepad'
+
+    def __init__(self):
+        super().__init__()
+        # Imported here so the other backends run without the ViGEm driver
+        import vgamepad as vg
+        self.pad = vg.VX360Gamepad()
+
+    def submit(self, report):
+        buttons, lt, rt, lx, ly, rx, ry = report
+        pad = self.pad
+        pad.report.wButtons = buttons
+        pad.left_trigger(lt)
+        pad.right_trigger(rt)
+        pad.left_joystick(lx, ly)
+        pad.right_joystick(rx, ry)
+        pad.update()
+
+
+class RecordingBackend(OutputBackend):
+    """Records every submitted report with a perf_counter_ns timestamp
+
+    Reports go into one preallocated array used as a ring buffer, so
+    recording never allocates on the hot path; once full, the oldest
+    reports are overwritten (see dropped).
+    """
+    name = 'recording'
+    sink = 'memory'
+
+    def __init__(self, capacity=DEFAULT_RECORD_CAPACITY):
+        super().__init__()
+        self.capacity = capacity
+        self.buffer = array('q', bytes(8 * RECORD_WIDTH * capacity))
+        self._slot = 0
+
+    def submit(self, report):
+        buf = self.buffer
+        i = self._slot
+        buf[i] = time.perf_counter_ns()
+        buf[i + 1], buf[i + 2], buf[i + 3], buf[i + 4], buf[i + 5], buf[i + 6], buf[i + 7] = report
+        i += RECORD_WIDTH
+        self._slot = 0 if i >= len(buf) else i
+
+    def __len__(self):
+        return min(self.submitted, self.capacity)
+
+    @property
+    def dropped(self):
+        return max(self.submitted - self.capacity, 0)
+
+    def clear(self):
+        self.submitted = 0
+        self.suppressed = 0
+        self._slot = 0
+        # The next report is recorded even if it repeats the last one - a
+        # cleared recording starts with its initial state
+        self.last_report = None
+
+    def records(self):
+        """Yield (ts_ns, buttons, lt, rt, lx, ly, rx, ry) oldest first"""
+        buf = self.buffer
+        count = len(self)
+        start = self._slot if self.submitted > self.capacity else 0
+        for n in range(count):
+            i = ((start // RECORD_WIDTH + n) % self.capacity) * RECORD_WIDTH
+            yield tuple(buf[i:i + RECORD_WIDTH])
+
+    def save(self, path):
+        """Write the recorded stream as CSV (one report per line)"""
+        with open(path, 'w') as f:
+            f.write(','.join(RECORD_FIELDS) + '\n')
+            for record in self.records():
+                f.write(','.join(map(str, record)) + '\n')
+
+
+# ==========================
+# DualShock 4
+# ==========================
+# DS4_REPORT wButtons bits (same values as vg.DS4_BUTTONS); the low nibble is the d-pad direction
+DS4_BUTTONS = {
+    'Square': 1 << 4,
+    'Cross': 1 << 5,
+    'Circle': 1 << 6,
+    'Triangle': 1 << 7,
+    'L1': 1 << 8,
+    'R1': 1 << 9,
+    'L2': 1 << 10,
+    'R2': 1 << 11,
+    'Share': 1 << 12,
+    'Options': 1 << 13,
+    'L3': 1 << 14,
+    'R3': 1 << 15,
+}
+# bSpecial bits (vg.DS4_SPECIAL_BUTTONS)
+DS4_SPECIAL_PS = 1 << 0
+
+# d-pad directions (vg.DS4_DPAD_DIRECTIONS): N, NE, E, SE, S, SW, W, NW, none
+DS4_DPAD_NONE = 8
+_DPAD_DIRECTIONS = {
+    (0, 1): 0, (1, 1): 1, (1, 0): 2, (1, -1): 3,
+    (0, -1): 4, (-1, -1): 5, (-1, 0): 6, (-1, 1): 7, (0, 0): DS4_DPAD_NONE,
+}
+
+# XUSB bit -> DS4 wButtons bit, or the PS button in bSpecial (kept above bit 16)
+_XUSB_TO_DS4 = {
+    0x0010: DS4_BUTTONS['Options'],     # Start
+    0x0020: DS4_BUTTONS['Share'],       # Back
+    0x0040: DS4_BUTTONS['L3'],          # left thumb
+    0x0080: DS4_BUTTONS['R3'],          # right thumb
+    0x0100: DS4_BUTTONS['L1'],          # left shoulder
+    0x0200: DS4_BUTTONS['R1'],          # right shoulder
+    0x0400: DS4_SPECIAL_PS << 16,       # Guide
+    0x1000: DS4_BUTTONS['Cross'],       # A
+    0x2000: DS4_BUTTONS['Circle'],      # B
+    0x4000: DS4_BUTTONS['Square'],      # X
+    0x8000: DS4_BUTTONS['Triangle'],    # Y
+}
+
+
+def _dpad_direction(bits):
+    # XUSB d-pad bits: up 1, down 2, left 4, right 8 - opposite pairs cancel
+    x = (1 if bits & 8 else 0) - (1 if bits & 4 else 0)
+    y = (1 if bits & 1 else 0) - (1 if bits & 2 else 0)
+    return _DPAD_DIRECTIONS[(x, y)]
+
+
+def _build_byte_table(shift):
+    # XUSB button byte -> DS4 wButtons | bSpecial << 16, one entry per byte value
+    table = []
+    for byte in range(256):
+        bits = byte << shift
+        value = 0
+        for xusb, ds4 in _XUSB_TO_DS4.items():
+            if bits & xusb:
+                value |= ds4
+        if shift == 0:
+            value |= _dpad_direction(bits & 0xF)
+        table.append(value)
+    return tuple(table)
+
+
+_DS4_LOW = _build_byte_table(0)
+_DS4_HIGH = _build_byte_table(8)
+
+
+def ds4_report(report):
+    """XUSB (buttons, lt, rt, lx, ly, rx, ry) -> DS4 (wButtons, bSpecial, lt, rt, lx, ly, rx, ry)
+
+    DS4 axes are uint8 centered on 128 with Y pointing down; pressed
+    triggers also set the L2/R2 button bits like a real pad.
+    """
+    buttons, lt, rt, lx, ly, rx, ry = report
+    value = _DS4_LOW[buttons & 0xFF] | _DS4_HIGH[(buttons >> 8) & 0xFF]
+    if lt:
+        value |= DS4_BUTTONS['L2']
+    if rt:
+        value |= DS4_BUTTONS['R2']
+    return (value & 0xFFFF, value >> 16, lt, rt,
+            (lx + 32768) >> 8, min((32768 - ly) >> 8, 255),
+            (rx + 32768) >> 8, min((32768 - ry) >> 8, 255))
+
+
+class DS4Backend(OutputBackend):
+    name = 'ds4'
+    output = 'ds4'
+
+    def __init__(self, pad=None):
+        super().__init__()
+        if pad is None:
+            import vgamepad as vg
+            pad = vg.VDS4Gamepad()
+        self.pad = pad
+        # Second diff layer: XUSB reports that only differ below DS4 axis resolution
+        self.last_ds4 = None
+
+    def submit(self, report):
+        ds4 = ds4_report(report)
+        if ds4 == self.last_ds4 and self.suppress_duplicates:
+            return False
+        self.last_ds4 = ds4
+        buttons, special, lt, rt, lx, ly, rx, ry = ds4
+        out = self.pad.report
+        out.wButtons = buttons
+        out.bSpecial = special
+        out.bTriggerL = lt
+        out.bTriggerR = rt
+        out.bThumbLX = lx
+        out.bThumbLY = ly
+        out.bThumbRX = rx
+        out.bThumbRY = ry
+        self.pad.update()
+
+
+class _DS4Fields:
+    __slots__ = ('wButtons', 'bSpecial', 'bTriggerL', 'bTriggerR', 'bThumbLX', 'bThumbLY', 'bThumbRX', 'bThumbRY')
+
+    def __init__(self):
+        self.wButtons = DS4_DPAD_NONE
+        self.bSpecial = 0
+        self.bTriggerL = self.bTriggerR = 0
+        self.bThumbLX = self.bThumbLY = self.bThumbRX = self.bThumbRY = 128
+
+
+class FakeDS4Pad:
+    """In-memory stand-in for vg.VDS4Gamepad - keeps the DS4 reports in a ring buffer"""
+
+    def __init__(self, capacity=DEFAULT_RECORD_CAPACITY):
+        self.report = _DS4Fields()
+        self.capacity = capacity
+        self.buffer = array('q', bytes(8 * 9 * capacity))
+        self.updates = 0
+        self._slot = 0
+
+    def update(self):
+        r = self.report
+        buf = self.buffer
+        i = self._slot
+        buf[i] = time.perf_counter_ns()
+        buf[i + 1], buf[i + 2], buf[i + 3], buf[i + 4] = r.wButtons, r.bSpecial, r.bTriggerL, r.bTriggerR
+        buf[i + 5], buf[i + 6], buf[i + 7], buf[i + 8] = r.bThumbLX, r.bThumbLY, r.bThumbRX, r.bThumbRY
+        i += 9
+        self._slot = 0 if i >= len(buf) else i
+        self.updates += 1
+
+
+class DS4RecordingBackend(DS4Backend):
+    """DS4 translation into a FakeDS4Pad - DS4 benchmarks without the driver"""
+    name = 'ds4_recording'
+    sink = 'memory'
+
+    def __init__(self, capacity=DEFAULT_RECORD_CAPACITY):
+        super().__init__(FakeDS4Pad(capacity))
+
+
+BACKENDS = {
+    VGamepadBackend.name: VGamepadBackend,
+    RecordingBackend.name: RecordingBackend,
+    DS4Backend.name: DS4Backend,
+    DS4RecordingBackend.name: DS4RecordingBackend,
+}
+
+
+def backend_for(backend, output):
+    """Backend name giving `output` on the same sink as `backend` (e.g. 'recording', 'ds4' -> 'ds4_recording')"""
+    if output not in OUTPUTS:
+        raise ValueError(f"Unknown output: {output}")
+    sink = BACKENDS[backend].sink
+    for name, backend_class in BACKENDS.items():
+        if backend_class.output == output and backend_class.sink == sink:
+            return name
+    raise ValueError(f"No {output} backend for {backend}")
+
+
+def stand_in_for(backend):
+    """In-memory backend of the same output type - takes the reports until a driver device is ready"""
+    return backend_for(RecordingBackend.name, BACKENDS[backend].output)
+
+
+def create_backend(name=DEFAULT_BACKEND, **kwargs):
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown output backend: {name}") from None
+    return backend_class(**kwargs)
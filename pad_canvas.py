@@ -0,0 +1,165 @@
+"""
+🎨 Pad Canvas
+Retained-mode view of the controller drawing on the Tk thread.
+
+The GUI creates its canvas items once and registers their integer item
+IDs here (stick knobs, trigger bars, buttons; plain Tk buttons work too).
+When the drawing is laid out again (resize) the items are registered
+again with their new geometry and keep showing the last state. Each frame
+render() compares the snapshot with what was last applied, marks only
+the changed properties dirty and applies them in one pass - no tag
+lookups, no delete/redraw. Released buttons fade back to their idle
+colour over FADE_MS on the render loop's clock instead of a root.after
+callback per press. Hovering a button thickens its outline through the
+same dirty pass.
+"""
+
+# Highlight fade after release - stepped through a precomputed palette
+FADE_MS = 150
+FADE_STEPS = 6
+HIGHLIGHT = '#ffffff'
+# Button outline width, normal / under the mouse
+OUTLINE_WIDTH = 2
+HOVER_WIDTH = 4
+
+
+def _rgb(color):
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+def fade_palette(idle, highlight=HIGHLIGHT, steps=FADE_STEPS):
+    """Colours from idle (level 0) to highlight (level 1)"""
+    (r0, g0, b0), (r1, g1, b1) = _rgb(idle), _rgb(highlight)
+    return [idle] + [f"#{r0 + (r1 - r0) * i // steps:02x}{g0 + (g1 - g0) * i // steps:02x}"
+                     f"{b0 + (b1 - b0) * i // steps:02x}" for i in range(1, steps)] + [highlight]
+
+
+class PadCanvas:
+    """Stick knobs and button highlights of one controller drawing"""
+
+    def __init__(self, canvas=None):
+        self.canvas = canvas
+        # name -> (apply(coords), center x, center y, travel, knob radius)
+        self.knobs = {}
+        # name -> (apply(coords), x1, y1, x2, y2) - filled from the left by the trigger level
+        self.bars = {}
+        # name -> (apply(color), palette)
+        self.buttons = {}
+        # name -> apply(width) - canvas buttons only
+        self.outlines = {}
+        # Last input per knob / bar, last value handed to each property, and
+        # the ones to apply this frame
+        self.values = {}
+        self.applied = {}
+        self.dirty = {}
+        self.lit = frozenset()
+        # Released button -> release time (render loop clock, s)
+        self.fades = {}
+        self.updates = 0
+
+    # ==========================
+    # Items - registered once, after the GUI has drawn them
+    # ==========================
+    def add_knob(self, name, item, center, travel, radius):
+        """Stick knob item for snapshot field name ('left' / 'right')"""
+        canvas = self.canvas
+        self.knobs[name] = (lambda coords: canvas.coords(item, *coords),
+                            center[0], center[1], travel, radius)
+        self.applied.pop(name, None)
+        self.set_stick(name, *self.values.get(name, (0.0, 0.0)))
+
+    def add_bar(self, name, item, bbox):
+        """Trigger bar item for snapshot field name ('lt' / 'rt')"""
+        canvas = self.canvas
+        self.bars[name] = (lambda coords: canvas.coords(item, *coords),) + tuple(bbox)
+        self.applied.pop(name, None)
+        self.set_bar(name, self.values.get(name, 0.0))
+
+    def add_button(self, name, item, idle):
+        canvas = self.canvas
+        self.buttons[name] = (lambda color: canvas.itemconfigure(item, fill=color), fade_palette(idle))
+        self.outlines[name] = lambda width: canvas.itemconfigure(item, width=width)
+
+    def add_widget(self, name, widget, idle):
+        """A Tk button instead of a canvas item - sunken while held"""
+        def apply(color):
+            widget.config(bg=color, relief='sunken' if color == HIGHLIGHT else 'raised')
+        self.buttons[name] = (apply, fade_palette(idle))
+
+    # ==========================
+    # Render loop (Tk thread)
+    # ==========================
+    def render(self, snap, lit, now):
+        """RenderLoop callback - True while a fade still needs frames"""
+        for name in self.knobs:
+            self.set_stick(name, *getattr(snap, name))
+        for name in self.bars:
+            self.set_bar(name, getattr(snap, name))
+        self.set_lit(lit, now)
+        self.flush()
+        return bool(self.fades)
+
+    def set_stick(self, name, x, y):
+        self.values[name] = (x, y)
+        apply, cx, cy, travel, r = self.knobs[name]
+        # Whole pixels - sub-pixel moves are not worth a canvas update
+        kx = round(cx + max(-1.0, min(1.0, x)) * travel)
+        ky = round(cy - max(-1.0, min(1.0, y)) * travel)
+        if self.applied.get(name) != (kx, ky):
+            self.applied[name] = (kx, ky)
+            self.dirty[name] = (apply, (kx - r, ky - r, kx + r, ky + r))
+
+    def set_bar(self, name, level):
+        self.values[name] = level
+        apply, x1, y1, x2, y2 = self.bars[name]
+        right = round(x1 + (x2 - x1) * max(0.0, min(1.0, level)))
+        if self.applied.get(name) != right:
+            self.applied[name] = right
+            self.dirty[name] = (apply, (x1, y1, right, y2))
+
+    def set_lit(self, lit, now):
+        if lit != self.lit:
+            for name in self.lit - lit:
+                if name in self.buttons:
+                    self.fades[name] = now
+            for name in lit - self.lit:
+                self.fades.pop(name, None)
+                self.paint(name, FADE_STEPS)
+            self.lit = lit
+        if self.fades:
+            for name, released in list(self.fades.items()):
+                step = FADE_STEPS - int((now - released) * 1000 * FADE_STEPS / FADE_MS)
+                if step <= 0:
+                    step = 0
+                    del self.fades[name]
+                self.paint(name, step)
+
+    def paint(self, name, step):
+        button = self.buttons.get(name)
+        if button is None:
+            return
+        apply, palette = button
+        color = palette[step]
+        if self.applied.get(name) != color:
+            self.applied[name] = color
+            self.dirty[name] = (apply, color)
+
+    def set_hover(self, name, hovering):
+        """Button outline under the mouse (Tk <Enter>/<Leave>)"""
+        apply = self.outlines.get(name)
+        if apply is None:
+            return
+        width = HOVER_WIDTH if hovering else OUTLINE_WIDTH
+        key = ('outline', name)
+        if self.applied.get(key, OUTLINE_WIDTH) != width:
+            self.applied[key] = width
+            self.dirty[key] = (apply, width)
+
+    def flush(self):
+        """Apply every changed property - one pass per frame"""
+        dirty = self.dirty
+        if dirty:
+            for apply, value in dirty.values():
+                apply(value)
+            self.updates += len(dirty)
+            dirty.clear()
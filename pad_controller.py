@@ -0,0 +1,567 @@
+"""
+🕹️ Pad Controller
+The headless controller every front-end drives: key and mouse input in,
+gamepad reports out.
+
+PadController owns the device, the engine (output thread, report
+scheduler, published PadState), the compiled key dispatch table and
+everything between a key press and the report: held keys, analog ramps,
+response curves, the mouse -> right stick path, macros and the extra pads
+(virtual_pads.py). The Professional, Enhanced and Standard GUIs and the
+console are views on top of it: their listener callbacks call key_down()
+/ key_up() / mouse_move(), their settings widgets call the set_*()
+methods, and they draw from engine.snapshot. There is one hot path, so
+benchmark.py measures the same code every front-end runs. Key auto-repeat
+is dropped (or turned into turbo) on the producer side, before the
+engine sees it (key_repeat.py).
+
+Threads: the producer side and the set_*() methods may be called from
+any thread (listeners, Tk); the apply_*() methods and the handlers run on
+the engine's output thread only.
+"""
+
+import threading
+
+from analog_ramps import RampBank
+from controller_engine import ControllerEngine, KEY_DOWN, KEY_UP, MOUSE_MOVE
+from key_dispatch import (BUTTON, CONTROL, DEFAULT_BUTTON_MAPPINGS, MACRO, STICK, TRIGGER, XUSB_BUTTONS,
+                          compile_mappings, normalize_key)
+from key_repeat import KeyStates, parse_repeat
+from macros import MacroPlayer
+from mouse_stick import DEFAULT_MOUSE_MODE, RelativeMouseStick
+from output_backends import DEFAULT_BACKEND, NEUTRAL_REPORT, backend_for, create_backend, stand_in_for
+from report_scheduler import DEFAULT_REPORT_RATE
+from response_curves import ProfileCurves
+from stick_filters import StickFilter
+from virtual_pads import MOUSE_CENTER, PadRouter
+
+# Log lines of the hot path - a front-end may pass its own wording (same fields)
+MESSAGES = {
+    'button_down': "Button {} pressed",
+    'button_up': "Button {} released",
+    'trigger_down': "{} pressed",
+    'trigger_up': "{} released",
+    'left_stick': "Left joystick: X={:.2f}, Y={:.2f}",
+    'right_stick': "Right joystick: X={:.2f}, Y={:.2f}",
+    'key_down_error': "Error in key press: {}",
+    'key_up_error': "Error in key release: {}",
+    'device_error': "❌ Virtual controller not available: {}",
+}
+
+# Absolute mouse moves smaller than this (from center) are not logged
+RIGHT_STICK_LOG_MIN = 0.1
+
+
+class PadController:
+    def __init__(self, backend=DEFAULT_BACKEND, rate=DEFAULT_REPORT_RATE, stand_in=False,
+                 button_mappings=DEFAULT_BUTTON_MAPPINGS, control_keys=None, controls=None, log=None,
+                 messages=None, on_macro_done=None):
+        # backend: 'vgamepad', 'ds4' or an in-memory one ('recording'...). With
+        # stand_in the matching in-memory backend takes the reports until
+        # start_device() has plugged in the real device (it takes a while)
+        self.backend = backend
+        self.gamepad = create_backend(stand_in_for(backend) if stand_in else backend)
+        self.output = self.gamepad.output
+
+        # Single output thread that owns the gamepad and coalesces state
+        # changes into one update() per report tick
+        self.rate = rate
+        self.engine = ControllerEngine(self.gamepad, self.handle_event, rate)
+        self.scheduler = self.engine.scheduler
+        self.state = self.engine.state
+
+        # log(message, *args) - formatted by the front-end (only if it shows it)
+        self.log = log
+        self.messages = dict(MESSAGES, **(messages or {}))
+        # Front-end commands bound to keys: {key identity: CONTROL action},
+        # applied as controls[action.name](*action.value) on the engine thread
+        self.control_keys = control_keys
+        self.controls = controls or {}
+
+        # Settings
+        self.sensitivity = 1.0
+        self.mouse_sensitivity = 0.5
+        self.mouse_enabled = True
+        self.mouse_center_x, self.mouse_center_y = MOUSE_CENTER
+
+        # Response curves - sensitivity and shaping compiled into lookup tables
+        self.curves = ProfileCurves(left_gain=self.sensitivity)
+        # Sensitivity waiting for its tables - a slider drag only builds the latest one
+        self._pending_gain = None
+        self._compiling = False
+        self._curve_lock = threading.Lock()
+
+        # Keyboard analog ramps - trigger attack/release and stick slew, stepped per tick
+        self.ramps = RampBank(self.apply_ramp, self.engine)
+
+        # Macros - timed state sequences on their own precise timer thread
+        self.macro_player = MacroPlayer(self.engine, on_done=on_macro_done)
+
+        # Extra virtual pads (2-4) - same engine and listeners, routed by key zone
+        self.pad_router = PadRouter()
+
+        # Relative mouse mode - deltas become stick velocity once per report tick
+        self.mouse_mode = DEFAULT_MOUSE_MODE
+        self.mouse_stick = RelativeMouseStick(self.mouse_sensitivity)
+
+        # Right stick smoothing - filtered once per tick towards mouse_target
+        self.stick_filter = StickFilter()
+        self.mouse_target = (0.0, 0.0)
+        # Right stick from the mouse, before the network's is added
+        self.mouse_right = (0.0, 0.0)
+
+        # Pad state from network clients (input_server.py), merged with the
+        # keys and the mouse: buttons OR'ed, triggers the higher of the two,
+        # sticks added - all through the same curves
+        self.net_buttons = 0
+        self.net_lt = 0.0
+        self.net_rt = 0.0
+        self.net_left = (0.0, 0.0)
+        self.net_right = (0.0, 0.0)
+
+        # Key -> actions table; actions applied by each held key, so the
+        # release undoes exactly those; movement keys held
+        self.button_mappings = button_mappings
+        self.dispatch = compile_mappings(button_mappings, extra=control_keys)
+        self.held_actions = {}
+        self.pressed_keys = set()
+
+        # Keyboard key states - auto-repeat policy per binding (profile "repeat")
+        self.repeat = {}
+        self.keys = KeyStates()
+
+    # ==========================
+    # Lifecycle
+    # ==========================
+    def start(self):
+        self.engine.start()
+        self.macro_player.start()
+        return self
+
+    def start_device(self, startup=None):
+        """Plug in the real device on a worker thread; it takes over from the stand-in when ready"""
+        if self.gamepad.name == self.backend:
+            return
+        threading.Thread(target=self.create_device, args=(self.output, startup),
+                         name="device-setup", daemon=True).start()
+
+    def create_device(self, output, startup=None):
+        try:
+            gamepad = create_backend(backend_for(self.backend, output))
+        except Exception as e:
+            if startup:
+                startup.mark("device failed")
+            self._log('device_error', e)
+            return
+        if startup:
+            startup.mark("device ready")
+        self.engine.call(self.attach_device, gamepad)
+
+    def attach_device(self, gamepad):
+        # Engine thread - unless a profile switched the output meanwhile (set_output made its own)
+        if gamepad.output == self.output and self.gamepad.sink == 'memory':
+            self.apply_output(gamepad)
+
+    def close(self):
+        """Stop macros and extra pads, apply what is queued, flush the last report"""
+        self.macro_player.stop()
+        for pad in self.pad_router.pads:
+            pad.close()
+        self.engine.stop()
+
+    # ==========================
+    # Producer side (any thread) - only enqueue, the engine thread applies them
+    # ==========================
+    def key_down(self, key):
+        # Auto-repeat of a held key is dropped here, or toggles the key (turbo)
+        kind = self.keys.down(normalize_key(key))
+        if kind is not None:
+            self.engine.post(kind, key)
+
+    def key_up(self, key):
+        if self.keys.up(normalize_key(key)):
+            self.engine.post(KEY_UP, key)
+
+    def mouse_move(self, x, y):
+        if self.mouse_enabled:
+            self.engine.post(MOUSE_MOVE, x, y)
+
+    # ==========================
+    # Settings (any thread) - built here, swapped in on the engine thread
+    # ==========================
+    def set_dispatch(self, dispatch):
+        # One reference swap - held keys keep the actions they pressed
+        self.dispatch = dispatch
+
+    def set_mappings(self, button_mappings):
+        self.button_mappings = button_mappings
+        self.set_dispatch(compile_mappings(button_mappings, extra=self.control_keys))
+        self.keys.policies = parse_repeat(self.repeat, button_mappings)
+
+    def set_repeat(self, repeat):
+        """Auto-repeat policy per binding ({"A": "turbo"}); raises ValueError"""
+        self.keys.policies = parse_repeat(repeat, self.button_mappings)
+        self.repeat = dict(repeat or {})
+
+    def set_sensitivity(self, sensitivity):
+        """Rebuild the stick tables for a new gain on a worker thread (any thread)"""
+        self.sensitivity = sensitivity
+        with self._curve_lock:
+            self._pending_gain = sensitivity
+            if self._compiling:
+                return
+            self._compiling = True
+        threading.Thread(target=self._compile_gain, name="curve-compile", daemon=True).start()
+
+    def _compile_gain(self):
+        # Worker thread - values set while a build runs collapse into one more build
+        while True:
+            with self._curve_lock:
+                gain = self._pending_gain
+                if gain is None:
+                    self._compiling = False
+                    return
+                self._pending_gain = None
+            self.set_curves(self.curves.with_gain(gain))
+
+    def set_curves(self, curves):
+        # Tables are built by the caller; the engine thread only swaps the reference
+        self.engine.call(self.apply_curves, curves)
+
+    def set_mouse_sensitivity(self, sensitivity):
+        self.mouse_sensitivity = sensitivity
+        self.mouse_stick.sensitivity = sensitivity
+
+    def set_mouse_enabled(self, enabled):
+        self.mouse_enabled = enabled
+        # A relative stick would keep its last velocity; a disabled one goes to center
+        if not enabled or self.mouse_mode == 'relative':
+            self.engine.call(self.recenter_mouse_stick)
+
+    def set_mouse_mode(self, mode):
+        self.mouse_mode = mode
+        self.engine.call(self.recenter_mouse_stick)
+        self.engine.call(self.update_mouse_hook)
+
+    def set_stick_filter(self, stick_filter):
+        self.engine.call(self.apply_stick_filter, stick_filter)
+
+    def set_rate(self, rate):
+        self.rate = rate
+        self.engine.set_rate(rate)
+
+    def set_output(self, output):
+        """Switch to an X360 / DS4 device; created here, switched over on the engine thread
+
+        False if it already is that output; creating the device may raise.
+        """
+        if output == self.output:
+            return False
+        gamepad = create_backend(backend_for(self.backend, output))
+        self.output = output
+        self.engine.call(self.apply_output, gamepad)
+        return True
+
+    def release_keys(self):
+        # The keyboard listener stopped - the next press of a key held now is a new press
+        self.keys.reset()
+
+    def reset(self):
+        # Neutral sticks and triggers, for this pad and the extra ones
+        self.keys.reset()
+        self.engine.call(self.apply_reset)
+        for pad in self.pad_router.pads:
+            self.engine.call(pad.reset)
+
+    # ==========================
+    # Engine thread
+    # ==========================
+    def handle_event(self, event):
+        # Keys in an extra pad's zone (and the mouse, if assigned) go to that pad
+        if self.pad_router.route(event):
+            return
+        if event.kind == MOUSE_MOVE:
+            self.apply_mouse_move(event.a, event.b)
+        elif event.kind == KEY_DOWN:
+            self.apply_key_down(event.a)
+        elif event.kind == KEY_UP:
+            self.apply_key_up(event.a)
+
+    def apply_key_down(self, key):
+        try:
+            key_id = normalize_key(key)
+            repeat = key_id in self.held_actions
+            # Auto-repeat applies what the first press did, even if the
+            # mappings were changed or reloaded since
+            actions = self.held_actions[key_id] if repeat else self.dispatch.get(key_id)
+            if not actions:
+                return
+            self.held_actions[key_id] = actions
+            for action in actions:
+                if action.kind == STICK:
+                    self.pressed_keys.add(action.name)
+                    self.update_movement()
+                elif action.kind == BUTTON or action.kind == TRIGGER:
+                    self.press_action(action)
+                elif action.kind == MACRO:
+                    # Key auto-repeat must not restart the macro
+                    if not repeat:
+                        self.macro_player.play(action.name)
+                elif action.kind == CONTROL:
+                    self.controls[action.name](*action.value)
+        except Exception as e:
+            self._log('key_down_error', e)
+
+    def apply_key_up(self, key):
+        try:
+            key_id = normalize_key(key)
+            actions = self.held_actions.pop(key_id, None) or self.dispatch.get(key_id)
+            if not actions:
+                return
+            for action in actions:
+                if action.kind == STICK:
+                    self.pressed_keys.discard(action.name)
+                    self.update_movement()
+                elif action.kind == BUTTON or action.kind == TRIGGER:
+                    self.release_action(action)
+        except Exception as e:
+            self._log('key_up_error', e)
+
+    def press_action(self, action):
+        if action.kind == TRIGGER:
+            # The trigger level follows its ramp (see apply_ramp)
+            self.ramps.set_target(action.name, action.value)
+            self._log('trigger_down', action.name)
+        else:
+            self.gamepad.press_button(action.mask)
+            self.scheduler.request_update()
+            self.state.press(action.name)
+            self._log('button_down', action.name)
+
+    def release_action(self, action):
+        if action.kind == TRIGGER:
+            self.ramps.set_target(action.name, 0.0)
+            self._log('trigger_up', action.name)
+        else:
+            # Still held if a network client holds it
+            if not action.mask & self.net_buttons:
+                self.gamepad.release_button(action.mask)
+                self.scheduler.request_update()
+                self.state.release(action.name)
+            self._log('button_up', action.name)
+
+    def update_movement(self):
+        x, y = 0.0, 0.0
+        pressed = self.pressed_keys
+        if 'w' in pressed: y += 1.0
+        if 's' in pressed: y -= 1.0
+        if 'a' in pressed: x -= 1.0
+        if 'd' in pressed: x += 1.0
+
+        # Normalize diagonal movement (1/√2)
+        if x != 0 and y != 0:
+            x *= 0.707
+            y *= 0.707
+
+        # Each axis follows its slew-limited ramp (see apply_ramp)
+        self.ramps.set_target('LX', x)
+        self.ramps.set_target('LY', y)
+
+        if x != 0 or y != 0:
+            self._log('left_stick', x * self.sensitivity, y * self.sensitivity)
+
+    def apply_ramp(self, name, value):
+        # RampBank callback - send the ramped value (merged with the
+        # network's) through the curve
+        if name == 'LT':
+            value = max(value, self.net_lt)
+            self.gamepad.left_trigger(self.curves.lt(value))
+            self.state.set_trigger(name, value)
+        elif name == 'RT':
+            value = max(value, self.net_rt)
+            self.gamepad.right_trigger(self.curves.rt(value))
+            self.state.set_trigger(name, value)
+        else:
+            x = max(-1.0, min(1.0, self.ramps.value('LX') + self.net_left[0]))
+            y = max(-1.0, min(1.0, self.ramps.value('LY') + self.net_left[1]))
+            curve = self.curves.left
+            self.gamepad.left_joystick(curve(x), curve(y))
+            self.state.set_left_stick(x, y)
+        self.scheduler.request_update()
+
+    def apply_mouse_move(self, x, y):
+        if self.mouse_mode == 'relative':
+            # Only accumulate here - update_mouse_stick runs once per tick
+            self.mouse_stick.add_position(x, y)
+            return
+
+        # Distance from center, with sensitivity, limited to the stick range
+        dx = (x - self.mouse_center_x) / self.mouse_center_x
+        dy = (y - self.mouse_center_y) / self.mouse_center_y
+        dx = max(-1.0, min(1.0, dx * self.mouse_sensitivity))
+        dy = max(-1.0, min(1.0, dy * self.mouse_sensitivity))
+
+        # Update right joystick (or leave it to the filter, once per tick)
+        if self.stick_filter.passthrough:
+            self.set_right_stick(dx, -dy)
+        else:
+            self.mouse_target = (dx, -dy)
+
+        if abs(dx) > RIGHT_STICK_LOG_MIN or abs(dy) > RIGHT_STICK_LOG_MIN:
+            self._log('right_stick', dx, -dy)
+
+    def update_mouse_stick(self, now_ns):
+        # Engine tick hook - relative mode and/or right stick filter
+        if self.mouse_mode == 'relative':
+            value = self.mouse_stick.update(now_ns)
+            if value:
+                self.mouse_target = value
+        x, y = self.stick_filter.filter(self.mouse_target[0], self.mouse_target[1], now_ns)
+        self.set_right_stick(x, y)
+
+    def set_right_stick(self, x, y):
+        # Mouse position plus the network's right stick, through the curve
+        self.mouse_right = (x, y)
+        x = max(-1.0, min(1.0, x + self.net_right[0]))
+        y = max(-1.0, min(1.0, y + self.net_right[1]))
+        curve = self.curves.right
+        rx, ry = curve(x), curve(y)
+        if rx != self.gamepad.rx or ry != self.gamepad.ry:
+            self.gamepad.right_joystick(rx, ry)
+            self.scheduler.request_update()
+        self.state.set_right_stick(x, y)
+
+    def update_mouse_hook(self):
+        # The right stick needs ticks in relative mode or when filtered
+        if self.mouse_mode == 'relative' or not self.stick_filter.passthrough:
+            self.engine.add_tick_hook(self.update_mouse_stick)
+        else:
+            self.engine.remove_tick_hook(self.update_mouse_stick)
+
+    def recenter_mouse_stick(self):
+        self.mouse_stick.reset()
+        self.stick_filter.reset()
+        self.mouse_target = (0.0, 0.0)
+        self.set_right_stick(0.0, 0.0)
+
+    def apply_network(self, buttons, lt, rt, left, right):
+        # A network frame (input_server.py), merged with what the keys and
+        # the mouse hold - a button the keyboard holds stays pressed
+        if buttons != self.net_buttons:
+            self.set_net_buttons(buttons)
+        self.net_lt, self.net_rt = lt, rt
+        self.net_left, self.net_right = left, right
+        for name in ('LT', 'RT', 'LX'):
+            self.apply_ramp(name, self.ramps.value(name))
+        self.set_right_stick(*self.mouse_right)
+
+    def set_net_buttons(self, buttons):
+        held = 0
+        for actions in self.held_actions.values():
+            for action in actions:
+                if action.kind == BUTTON:
+                    held |= action.mask
+        released = self.net_buttons & ~buttons & ~held
+        self.net_buttons = buttons
+        self.gamepad.release_button(released)
+        self.gamepad.press_button(buttons)
+        self.scheduler.request_update()
+        state = self.state
+        for name, mask in XUSB_BUTTONS.items():
+            if buttons & mask:
+                state.press(name)
+            elif released & mask:
+                state.release(name)
+
+    def apply_curves(self, curves):
+        self.curves = curves
+        for name in ('LX', 'LT', 'RT'):
+            self.apply_ramp(name, self.ramps.value(name))
+
+    def apply_stick_filter(self, stick_filter):
+        self.stick_filter = stick_filter
+        self.update_mouse_hook()
+
+    def apply_output(self, gamepad):
+        # Carry the current state over, leave the old device neutral
+        old = self.gamepad
+        gamepad.load_report(old.report())
+        old.load_report(NEUTRAL_REPORT)
+        old.update()
+        self.gamepad = gamepad
+        self.engine.set_gamepad(gamepad)
+        self.scheduler.request_update()
+
+    def apply_profile(self, update):
+        # A compiled profile (profile_watcher.ProfileUpdate) swapped in whole,
+        # between two report ticks; held keys keep the actions they pressed
+        settings = update.settings
+        self.button_mappings = update.profile['button_mappings']
+        # The watcher compiles the profile alone - this front-end's control keys go on top
+        if self.control_keys:
+            self.dispatch = compile_mappings(self.button_mappings, extra=self.control_keys)
+        else:
+            self.dispatch = update.dispatch
+        self.repeat = dict(update.profile.get('repeat') or {})
+        self.keys.policies = update.repeat
+        self.ramps.configure(settings.ramps)
+        self.apply_curves(settings.curves)
+        if settings.mouse_mode != self.mouse_mode:
+            self.mouse_mode = settings.mouse_mode
+            self.recenter_mouse_stick()
+        self.mouse_sensitivity = settings.mouse_sensitivity
+        self.mouse_stick.sensitivity = settings.mouse_sensitivity
+        self.apply_stick_filter(settings.stick_filter)
+        self.macro_player.set_macros(update.macros)
+
+    def assign_mouse(self, pad):
+        # The pad losing the mouse recenters its right stick (None = this pad)
+        old = self.pad_router.mouse_pad
+        if old is None:
+            self.recenter_mouse_stick()
+        else:
+            old.recenter_mouse_stick()
+        self.pad_router.mouse_pad = pad
+
+    def apply_reset(self):
+        # Held keys are forgotten (their releases may never come) and network
+        # clients start from neutral again as well
+        self.held_actions.clear()
+        self.pressed_keys.clear()
+        self.set_net_buttons(0)
+        self.gamepad.release_button(self.gamepad.buttons)
+        self.net_lt = self.net_rt = 0.0
+        self.net_left = self.net_right = (0.0, 0.0)
+        self.mouse_right = (0.0, 0.0)
+        self.gamepad.left_joystick_float(0, 0)
+        self.gamepad.right_joystick_float(0, 0)
+        self.gamepad.left_trigger_float(0)
+        self.gamepad.right_trigger_float(0)
+        self.scheduler.request_update()
+
+        state = self.state
+        for name in XUSB_BUTTONS:
+            state.release(name)
+        state.set_left_stick(0.0, 0.0)
+        state.set_right_stick(0.0, 0.0)
+        state.set_trigger('LT', 0.0)
+        state.set_trigger('RT', 0.0)
+        self.mouse_stick.reset()
+        self.stick_filter.reset()
+        self.mouse_target = (0.0, 0.0)
+        self.ramps.reset()
+
+    # ==========================
+    # Metrics
+    # ==========================
+    def format_pad_stats(self, profile):
+        pads = self.pad_router.pads
+        events = self.engine.events - sum(pad.events for pad in pads)
+        stats = [f"P1 {profile}: {events} ev / {self.gamepad.submitted} rpt"]
+        stats.extend(pad.format_stats() for pad in pads)
+        return " | ".join(stats)
+
+    def _log(self, message, *args):
+        log = self.log
+        if log is not None:
+            log(self.messages.get(message, message), *args)
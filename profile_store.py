@@ -0,0 +1,243 @@
+"""
+💾 Profile Store
+Crash-safe, incremental profile persistence off the UI thread.
+
+Each profile lives in its own file under profiles/, so saving one
+profile writes only that profile:
+
+    profiles/Default.json   {"name": "Default", "profile": {...}}
+
+Names that are not safe as file names are percent-encoded. Saves and
+deletes only queue the change; the profile is serialized right away (a
+consistent snapshot) and a writer thread puts it on disk once the changes
+stop for DEBOUNCE_MS, at most MAX_DELAY_MS after the first one. A burst
+of edits to one profile therefore costs a single write. Every write goes
+to a temporary file in the same directory, is fsync'ed and then
+atomically renamed over the old file, so a crash leaves either the old
+or the new version, never a torn one.
+
+On first use the old single-file gamepad_profiles.json is imported (and
+left in place as the shipped defaults).
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import quote, unquote
+
+PROFILE_DIR = 'profiles'
+LEGACY_PROFILES = 'gamepad_profiles.json'
+PROFILE_EXTENSION = '.json'
+TEMP_SUFFIX = '.tmp'
+
+# Quiet time before a write, and the longest a change may wait
+DEBOUNCE_MS = 300
+MAX_DELAY_MS = 2000
+
+_DELETE = None
+
+
+def profile_filename(name):
+    """Profile name -> file name (percent-encoded where needed)"""
+    return quote(name, safe=" -_()[]'+,") + PROFILE_EXTENSION
+
+
+def atomic_write(path, text):
+    """Write text to path via temp file + fsync + rename"""
+    temp = path + TEMP_SUFFIX
+    with open(temp, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
+
+
+def _fsync_dir(directory):
+    # Makes the renames themselves durable (POSIX only - Windows cannot open directories)
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def serialize_profile(name, profile):
+    return json.dumps({'name': name, 'profile': profile}, indent=2)
+
+
+class ProfileStore:
+    def __init__(self, directory=PROFILE_DIR, legacy_path=LEGACY_PROFILES,
+                 debounce_ms=DEBOUNCE_MS, max_delay_ms=MAX_DELAY_MS):
+        self.directory = directory
+        self.legacy_path = legacy_path
+        self.debounce = debounce_ms / 1000
+        self.max_delay = max_delay_ms / 1000
+
+        # name -> serialized profile, or _DELETE
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._idle = threading.Event()
+        self._idle.set()
+        self._first_change = None
+        self._last_change = None
+        self._running = False
+        self._thread = None
+
+        self.writes = 0
+        self.deletes = 0
+        self.errors = []
+
+    # ==========================
+    # Loading (startup)
+    # ==========================
+    def load(self):
+        """Read every profile -> {name: profile}; problems go to self.errors
+
+        Imports the legacy single file if the directory does not exist yet.
+        """
+        if not os.path.isdir(self.directory):
+            profiles = self._load_legacy()
+            for name, profile in profiles.items():
+                self.save(name, profile)
+            return profiles
+
+        profiles = {}
+        for filename in sorted(os.listdir(self.directory)):
+            if not filename.endswith(PROFILE_EXTENSION):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                name, profile = self.read_file(path)
+            except (OSError, ValueError) as e:
+                # One bad file costs one profile, not all of them
+                self.errors.append(f"{filename}: {e}")
+                continue
+            profiles[name] = profile
+        # Default first, the rest by name
+        if 'Default' in profiles:
+            profiles = {'Default': profiles.pop('Default'), **profiles}
+        return profiles
+
+    @staticmethod
+    def read_file(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or not isinstance(data.get('profile'), dict):
+            raise ValueError("not a profile file")
+        name = data.get('name') or unquote(os.path.basename(path)[:-len(PROFILE_EXTENSION)])
+        return name, data['profile']
+
+    def path_for(self, name):
+        return os.path.join(self.directory, profile_filename(name))
+
+    def _load_legacy(self):
+        if not os.path.exists(self.legacy_path):
+            return {}
+        try:
+            with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.errors.append(f"{self.legacy_path}: {e}")
+            return {}
+
+    # ==========================
+    # Changes (any thread)
+    # ==========================
+    def save(self, name, profile):
+        """Queue a profile for writing; serialized now, written by the writer thread"""
+        self._queue(name, serialize_profile(name, profile))
+
+    def delete(self, name):
+        self._queue(name, _DELETE)
+
+    def _queue(self, name, text):
+        self.start()
+        with self._lock:
+            self._pending[name] = text
+            now = time.monotonic()
+            if self._first_change is None:
+                self._first_change = now
+            self._last_change = now
+            self._idle.clear()
+            self._changed.notify()
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far is on disk; False on timeout"""
+        with self._lock:
+            # Skip the rest of the debounce wait
+            if self._first_change is not None:
+                self._first_change -= self.max_delay
+            self._changed.notify()
+        return self._idle.wait(timeout)
+
+    # ==========================
+    # Lifecycle
+    # ==========================
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="profile-writer", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout=5.0):
+        """Write what is still queued and stop the writer"""
+        if not self._running:
+            return
+        self.flush(timeout)
+        with self._lock:
+            self._running = False
+            self._changed.notify()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+    # ==========================
+    # Writer thread
+    # ==========================
+    def _run(self):
+        while True:
+            with self._lock:
+                while self._running and not self._pending:
+                    self._changed.wait()
+                if not self._pending:
+                    return
+                # Debounce: wait for a quiet period, bounded by max_delay
+                while self._running:
+                    now = time.monotonic()
+                    due = min(self._last_change + self.debounce, self._first_change + self.max_delay)
+                    if now >= due:
+                        break
+                    self._changed.wait(due - now)
+                pending, self._pending = self._pending, {}
+                self._first_change = self._last_change = None
+            self._write(pending)
+            with self._lock:
+                if not self._pending:
+                    self._idle.set()
+
+    def _write(self, pending):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            self.errors.append(f"{self.directory}: {e}")
+            return
+        for name, text in pending.items():
+            path = self.path_for(name)
+            try:
+                if text is _DELETE:
+                    if os.path.exists(path):
+                        os.remove(path)
+                    self.deletes += 1
+                else:
+                    atomic_write(path, text)
+                    self.writes += 1
+            except OSError as e:
+                self.errors.append(f"{name}: {e}")
+        try:
+            _fsync_dir(self.directory)
+        except OSError:
+            pass
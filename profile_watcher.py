@@ -0,0 +1,244 @@
+"""
+👀 Profile Watcher
+Picks up edits to the profile files (profiles/*.json) while the
+controller is running - no reload through the combo box, no restart of
+the listeners.
+
+A background thread compares each file's (mtime, size) with the last
+scan. On Linux an inotify watch on the directory wakes it as soon as a
+file is written or renamed into place, and the scan only runs then (plus
+a slow safety rescan); elsewhere it polls every POLL_MS. A change must
+hold still for SETTLE_MS before the file is read, so an editor that
+writes in several steps is not caught halfway.
+
+Only the changed file is parsed, validated and compiled (key dispatch,
+curves, ramps, filter, macros) - all still on the watcher thread - and
+handed over as one ProfileUpdate. The front-end swaps it in with a single
+engine.call(), i.e. between two report ticks; held keys keep the actions
+they pressed, so their release still undoes exactly those.
+"""
+
+import os
+import select
+import sys
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import unquote
+
+from key_dispatch import compile_mappings
+from key_repeat import parse_repeat
+from macros import parse_macros
+from profile_store import PROFILE_DIR, PROFILE_EXTENSION, ProfileStore
+from virtual_pads import pad_settings
+
+# Scan period without inotify, and the safety rescan with it
+POLL_MS = 500
+INOTIFY_RESCAN_MS = 5000
+# A changed file must keep its (mtime, size) this long before it is read
+SETTLE_MS = 50
+SETTLE_TRIES = 10
+
+# Fields the front-ends read without a default
+REQUIRED_FIELDS = ('button_mappings', 'sensitivity', 'mouse_sensitivity', 'mouse_enabled', 'logging_enabled')
+
+# inotify(7): written and closed, renamed in/out, created, deleted
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+# dispatch is pad 1's table (WASD movement), settings the full PadSettings
+# (extra pads use its dispatch, with the profile's movement_keys), repeat
+# the key auto-repeat policies
+ProfileUpdate = namedtuple('ProfileUpdate', 'name profile dispatch settings macros repeat')
+
+
+def compile_profile(name, profile):
+    """Validate a profile and compile everything the engine needs; raises ValueError"""
+    missing = [field for field in REQUIRED_FIELDS if field not in profile]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    try:
+        mappings = dict(profile['button_mappings'])
+        return ProfileUpdate(name, profile, compile_mappings(mappings),
+                             pad_settings(name, profile), parse_macros(profile.get('macros')),
+                             parse_repeat(profile.get('repeat'), mappings))
+    except (TypeError, AttributeError, KeyError) as e:
+        raise ValueError(f"invalid value: {e}")
+
+
+class _Inotify:
+    """Directory watch via libc inotify (Linux only) - None from open() when unavailable"""
+
+    @classmethod
+    def open(cls, directory):
+        if not sys.platform.startswith('linux'):
+            return None
+        try:
+            import ctypes
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            if libc.inotify_add_watch(fd, os.fsencode(directory), _IN_MASK) < 0:
+                os.close(fd)
+                return None
+        except (ImportError, AttributeError, OSError):
+            return None
+        return cls(fd)
+
+    def __init__(self, fd):
+        self.fd = fd
+        # Self-pipe so stop() can interrupt the select()
+        self.wake_r, self.wake_w = os.pipe()
+
+    def wait(self, timeout):
+        """True if the directory changed (events are drained), False on timeout/wake"""
+        ready, _, _ = select.select([self.fd, self.wake_r], [], [], timeout)
+        if self.fd not in ready:
+            return False
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def wake(self):
+        os.write(self.wake_w, b'x')
+
+    def close(self):
+        for fd in (self.fd, self.wake_r, self.wake_w):
+            os.close(fd)
+
+
+class ProfileWatcher:
+    def __init__(self, directory=PROFILE_DIR, on_change=None, on_remove=None, on_error=None,
+                 poll_ms=POLL_MS):
+        self.directory = directory
+        # on_change(ProfileUpdate), on_remove(name), on_error(filename, message) - watcher thread
+        self.on_change = on_change
+        self.on_remove = on_remove
+        self.on_error = on_error
+        self.poll = poll_ms / 1000
+
+        self.files = {}     # filename -> (mtime_ns, size)
+        self.names = {}     # filename -> profile name
+        self.inotify = None
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.scans = 0
+        self.reloads = 0
+        self.failures = 0
+
+    @property
+    def mode(self):
+        return 'inotify' if self.inotify else 'polling'
+
+    # ==========================
+    # Lifecycle
+    # ==========================
+    def start(self):
+        if self._thread is not None:
+            return self
+        # Whatever is on disk now was loaded already
+        self.files = self.scan()
+        self.inotify = _Inotify.open(self.directory)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profile-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        if self.inotify:
+            self.inotify.wake()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        if self.inotify:
+            self.inotify.close()
+            self.inotify = None
+
+    # ==========================
+    # Watcher thread
+    # ==========================
+    def scan(self):
+        """-> {filename: (mtime_ns, size)} of the profile files"""
+        self.scans += 1
+        files = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(PROFILE_EXTENSION):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue    # removed while scanning
+                        files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        return files
+
+    def _wait(self):
+        if self.inotify is None:
+            # The directory may appear later (first save) - watch it from then on
+            self.inotify = _Inotify.open(self.directory)
+        if self.inotify is None:
+            self._stop.wait(self.poll)
+        else:
+            self.inotify.wait(INOTIFY_RESCAN_MS / 1000)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wait()
+            if self._stop.is_set():
+                break
+            try:
+                self.check()
+            except Exception as e:
+                self.failures += 1
+                print(f"⚠️ Profile watcher error: {e}")
+
+    def check(self):
+        """Compare with the last scan and report what changed"""
+        files = self.scan()
+        if files == self.files:
+            return
+        # Let multi-step writes finish
+        for _ in range(SETTLE_TRIES):
+            time.sleep(SETTLE_MS / 1000)
+            settled = self.scan()
+            if settled == files:
+                break
+            files = settled
+        old, self.files = self.files, files
+
+        for filename in old:
+            if filename not in files:
+                name = self.names.pop(filename, None) or unquote(filename[:-len(PROFILE_EXTENSION)])
+                if self.on_remove:
+                    self.on_remove(name)
+        for filename, signature in files.items():
+            if old.get(filename) != signature:
+                self._reload(filename)
+
+    def _reload(self, filename):
+        try:
+            name, profile = ProfileStore.read_file(os.path.join(self.directory, filename))
+            update = compile_profile(name, profile)
+        except (OSError, ValueError) as e:
+            # Keeps the last good version; the next write is picked up again
+            self.failures += 1
+            if self.on_error:
+                self.on_error(filename, str(e))
+            return
+        self.names[filename] = name
+        self.reloads += 1
+        if self.on_change:
+            self.on_change(update)
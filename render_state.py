@@ -0,0 +1,156 @@
+"""
+🖼️ Render State
+Lock-free hand-off of controller state from the engine thread to Tk.
+
+The engine thread mutates a PadState while applying events and publishes
+an immutable RenderState snapshot after each report tick (a single
+attribute assignment). The Tk thread polls that reference from a
+root.after loop and only redraws when it changed (or while a highlight
+fade is running); the time each drawn frame takes is kept for the
+status panel.
+"""
+
+import time
+from collections import deque, namedtuple
+
+# ~60 FPS - fast enough for visual feedback, cheap for Tk
+RENDER_INTERVAL_MS = 16
+# How long a tap stays highlighted when it was shorter than a frame
+FLASH_MS = 100
+# Drawn frames kept for the frame time percentiles
+FRAME_TIME_WINDOW = 256
+
+RenderState = namedtuple('RenderState', 'seq left right lt rt buttons presses')
+
+
+class PadState:
+    """Mutable controller state - only touched by the engine thread"""
+
+    def __init__(self):
+        self.left = (0.0, 0.0)
+        self.right = (0.0, 0.0)
+        self.lt = 0.0
+        self.rt = 0.0
+        self.buttons = set()
+        # Press counters let the UI flash taps that start and end within one frame
+        self.presses = {}
+        self.seq = 0
+        self.changed = True
+
+    def press(self, name):
+        if name not in self.buttons:
+            self.buttons.add(name)
+            self.presses[name] = self.presses.get(name, 0) + 1
+            self.changed = True
+
+    def release(self, name):
+        if name in self.buttons:
+            self.buttons.discard(name)
+            self.changed = True
+
+    def set_trigger(self, name, value):
+        if name == 'LT':
+            if self.lt != value:
+                self.lt = value
+                self.changed = True
+        elif self.rt != value:
+            self.rt = value
+            self.changed = True
+        if value > 0:
+            self.press(name)
+        else:
+            self.release(name)
+
+    def set_left_stick(self, x, y):
+        if self.left != (x, y):
+            self.left = (x, y)
+            self.changed = True
+
+    def set_right_stick(self, x, y):
+        if self.right != (x, y):
+            self.right = (x, y)
+            self.changed = True
+
+    def snapshot(self):
+        self.seq += 1
+        self.changed = False
+        return RenderState(self.seq, self.left, self.right, self.lt, self.rt,
+                           frozenset(self.buttons), dict(self.presses))
+
+
+class RenderLoop:
+    """Polls the engine snapshot on the Tk thread and renders only on change"""
+
+    def __init__(self, root, engine, render, on_frame=None, interval_ms=RENDER_INTERVAL_MS):
+        self.root = root
+        self.engine = engine
+        # render(snapshot, lit_buttons, now) - called only when something visible
+        # changed; returns True while it animates (called again next frame)
+        self.render = render
+        # on_frame() - called every frame (e.g. to flush the status log)
+        self.on_frame = on_frame
+        self.interval_ms = interval_ms
+
+        self.snapshot = None
+        self.lit = frozenset()
+        self.flash_until = {}
+        self.animating = False
+        self.frames = 0
+        self.renders = 0
+        # Tk thread time of each drawn frame (render + on_frame), ms
+        self.frame_ms = deque(maxlen=FRAME_TIME_WINDOW)
+        self._after_id = None
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._frame)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _frame(self):
+        self.frames += 1
+        try:
+            snap = self.engine.snapshot
+            prev = self.snapshot
+            now = time.perf_counter()
+
+            if snap is not prev:
+                # Flash buttons whose press counter moved since the last frame
+                old_presses = prev.presses if prev else {}
+                for name, count in snap.presses.items():
+                    if old_presses.get(name, 0) != count:
+                        self.flash_until[name] = now + FLASH_MS / 1000
+
+            lit = set(snap.buttons)
+            if self.flash_until:
+                for name, until in list(self.flash_until.items()):
+                    if until > now:
+                        lit.add(name)
+                    else:
+                        del self.flash_until[name]
+            lit = frozenset(lit)
+
+            drawn = snap is not prev or lit != self.lit or self.animating
+            if drawn:
+                self.snapshot = snap
+                self.lit = lit
+                self.renders += 1
+                self.animating = bool(self.render(snap, lit, now))
+
+            if self.on_frame:
+                self.on_frame()
+            if drawn:
+                self.frame_ms.append((time.perf_counter() - now) * 1000)
+        finally:
+            self._after_id = self.root.after(self.interval_ms, self._frame)
+
+    def format_stats(self):
+        times = sorted(self.frame_ms)
+        if not times:
+            return f"Frames: {self.renders}/{self.frames} drawn"
+        p95 = times[min(len(times) - 1, len(times) * 95 // 100)]
+        return (f"Frames: {self.renders}/{self.frames} drawn, frame time "
+                f"avg {sum(times) / len(times):.2f} ms  p95 {p95:.2f} ms  max {times[-1]:.2f} ms")
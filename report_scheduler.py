@@ -0,0 +1,174 @@
+"""
+⏱️ Report Scheduler
+Coalesces gamepad state changes into one update() per tick
+
+Coalescing never swallows a tap: a button or trigger pressed and released
+within one tick is sent pressed (the backend latches it) and released on
+the next tick.
+"""
+
+import threading
+import time
+
+# Supported report rates (Hz) - 'immediate' sends on every request
+REPORT_RATES = (125, 250, 500, 1000, 'immediate')
+DEFAULT_REPORT_RATE = 250
+
+
+def parse_report_rate(value):
+    """Convert a rate coming from a combo box / profile to a valid rate"""
+    if value == 'immediate':
+        return value
+    rate = int(value)
+    if rate not in REPORT_RATES:
+        raise ValueError(f"Unsupported report rate: {value}")
+    return rate
+
+
+class ReportScheduler:
+    def __init__(self, gamepad, rate=DEFAULT_REPORT_RATE, threaded=True):
+        self.gamepad = gamepad
+
+        # Pending state flag - set by handlers, cleared by the tick
+        self._dirty = False
+
+        # Worker thread - when threaded=False the owner drives
+        # wait_next_tick()/tick() from its own loop
+        self.threaded = threaded
+        self._thread = None
+        self._running = False
+        self._next_tick_ns = 0
+
+        self.rate = None
+        self.interval_ns = 0
+        self.set_rate(rate)
+
+        self.reset_stats()
+
+    def set_rate(self, rate):
+        rate = parse_report_rate(rate)
+        was_running = self._running
+        if was_running:
+            self.stop()
+        self.rate = rate
+        self.interval_ns = 0 if rate == 'immediate' else 1_000_000_000 // rate
+        if was_running:
+            self.start()
+
+    @property
+    def immediate(self):
+        return self.rate == 'immediate'
+
+    def reset_stats(self):
+        self.requests = 0
+        self.updates = 0
+        self.ticks = 0
+        self.jitter_total_ns = 0
+        self.jitter_max_ns = 0
+        self.started_ns = time.perf_counter_ns()
+
+    def request_update(self):
+        """Mark the gamepad state as changed; it is sent on the next tick"""
+        self.requests += 1
+        if self.immediate:
+            self.gamepad.update()
+            self.updates += 1
+        else:
+            self._dirty = True
+
+    def tick(self):
+        """Send one report if anything changed since the previous tick"""
+        self.ticks += 1
+        if self._dirty:
+            # Clear before sending so a change made during update() is not lost
+            self._dirty = False
+            self.gamepad.update()
+            self.updates += 1
+            # A latched tap goes out released on the next tick
+            if self.gamepad.latched:
+                self._dirty = True
+
+    def flush(self):
+        """Send now if anything changed - for events that must not wait for the tick"""
+        if self._dirty:
+            self._dirty = False
+            self.gamepad.update()
+            self.updates += 1
+            if self.gamepad.latched:
+                self._dirty = True
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self.reset_stats()
+        self._next_tick_ns = time.perf_counter_ns()
+        if self.threaded and not self.immediate:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        # Flush whatever is still pending (a latched tap takes a second report)
+        while self._dirty:
+            self.flush()
+
+    def wait_next_tick(self, wake=None):
+        """Sleep until the next tick deadline and record how late we woke up
+
+        With a threading.Event, the wait ends early when it is set; returns
+        False in that case and the same deadline stays pending.
+        """
+        interval = self.interval_ns
+        deadline = self._next_tick_ns + interval
+        delay = deadline - time.perf_counter_ns()
+        if delay > 0:
+            if wake is None:
+                time.sleep(delay / 1_000_000_000)
+            elif wake.wait(delay / 1_000_000_000):
+                wake.clear()
+                return False
+        self._next_tick_ns = deadline
+
+        now = time.perf_counter_ns()
+        lateness = now - deadline
+        if lateness > 0:
+            self.jitter_total_ns += lateness
+            if lateness > self.jitter_max_ns:
+                self.jitter_max_ns = lateness
+        if lateness > interval:
+            # Fell behind (sleep overslept / system stall) - resync instead of bursting
+            self._next_tick_ns = now
+        return True
+
+    def _run(self):
+        while self._running and not self.immediate:
+            self.wait_next_tick()
+            self.tick()
+
+    def stats(self):
+        elapsed = max(time.perf_counter_ns() - self.started_ns, 1) / 1_000_000_000
+        ticks = max(self.ticks, 1)
+        return {
+            'rate': self.rate,
+            'elapsed_s': elapsed,
+            'requests': self.requests,
+            'updates': self.updates,
+            'coalesced': max(self.requests - self.updates, 0),
+            'achieved_tick_hz': self.ticks / elapsed,
+            'achieved_update_hz': self.updates / elapsed,
+            'jitter_avg_us': self.jitter_total_ns / ticks / 1000,
+            'jitter_max_us': self.jitter_max_ns / 1000,
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        if self.immediate:
+            return (f"Reports: immediate | {s['updates']} updates "
+                    f"({s['achieved_update_hz']:.0f}/s)")
+        return (f"Reports: {s['rate']} Hz target, {s['achieved_tick_hz']:.0f} Hz achieved | "
+                f"{s['updates']} updates for {s['requests']} requests | "
+                f"jitter avg {s['jitter_avg_us']:.0f}us max {s['jitter_max_us']:.0f}us")
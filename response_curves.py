@@ -0,0 +1,201 @@
+"""
+📈 Response Curves
+Per-profile stick/trigger shaping compiled into lookup tables.
+
+Each curve (deadzone, anti-deadzone, outer deadzone, exponent) plus the
+gain (sensitivity) is evaluated once when a profile is applied and stored
+as a table of final driver values - int16 for stick axes, uint8 for
+triggers - indexed by the quantized input. Applying a value on the engine
+thread is then one index computation and one table read.
+
+Tables are built with NumPy when it is installed and with plain Python
+otherwise; lookups always go through array.array so they stay cheap for
+single samples. apply_many() takes the NumPy path for batches.
+
+    python response_curves.py    # per-sample cost vs the float path
+"""
+
+import time
+from array import array
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Input resolution: stick axes cover -1.0 - 1.0, triggers 0.0 - 1.0
+STICK_STEPS = 4096
+TRIGGER_STEPS = 1024
+
+CurveSpec = namedtuple('CurveSpec', 'deadzone anti_deadzone outer_deadzone exponent')
+
+# Identity curve - no shaping, but the input is still quantized to
+# STICK_STEPS / TRIGGER_STEPS like any other table
+DEFAULT_CURVE = CurveSpec(0.0, 0.0, 1.0, 1.0)
+
+# Profile keys (see "curves" in gamepad_profiles.json)
+CURVE_NAMES = ('left_stick', 'right_stick', 'lt', 'rt')
+
+
+def parse_curve(data):
+    """Profile dict (missing keys -> identity) -> validated CurveSpec"""
+    if not data:
+        return DEFAULT_CURVE
+    spec = CurveSpec(float(data.get('deadzone', DEFAULT_CURVE.deadzone)),
+                     float(data.get('anti_deadzone', DEFAULT_CURVE.anti_deadzone)),
+                     float(data.get('outer_deadzone', DEFAULT_CURVE.outer_deadzone)),
+                     float(data.get('exponent', DEFAULT_CURVE.exponent)))
+    if not 0.0 <= spec.deadzone < spec.outer_deadzone <= 1.0:
+        raise ValueError(f"Invalid deadzones: {spec.deadzone} / {spec.outer_deadzone}")
+    if not 0.0 <= spec.anti_deadzone < 1.0:
+        raise ValueError(f"Invalid anti-deadzone: {spec.anti_deadzone}")
+    if spec.exponent <= 0:
+        raise ValueError(f"Invalid exponent: {spec.exponent}")
+    return spec
+
+
+def shape(spec, magnitude):
+    """Reference (float) curve: input magnitude 0.0 - 1.0 -> output 0.0 - 1.0"""
+    if magnitude <= spec.deadzone:
+        return 0.0
+    t = (magnitude - spec.deadzone) / (spec.outer_deadzone - spec.deadzone)
+    if t > 1.0:
+        t = 1.0
+    return spec.anti_deadzone + (1.0 - spec.anti_deadzone) * t ** spec.exponent
+
+
+def _build_table(spec, gain, steps, scale, signed):
+    """Output values for inputs i/steps, i in [-steps, steps] (signed) or [0, steps]"""
+    start = -steps if signed else 0
+    if np is not None:
+        inputs = np.arange(start, steps + 1, dtype=np.float64) / steps
+        magnitude = np.minimum(np.abs(inputs) * gain, 1.0)
+        t = np.clip((magnitude - spec.deadzone) / (spec.outer_deadzone - spec.deadzone), 0.0, 1.0)
+        out = spec.anti_deadzone + (1.0 - spec.anti_deadzone) * t ** spec.exponent
+        out = np.where(magnitude <= spec.deadzone, 0.0, out)
+        values = np.rint(np.copysign(out, inputs) * scale).astype(np.int64)
+        return values.tolist()
+    values = []
+    for i in range(start, steps + 1):
+        v = i / steps
+        out = shape(spec, min(abs(v) * gain, 1.0))
+        values.append(round(-out * scale if v < 0 else out * scale))
+    return values
+
+
+class StickCurve:
+    """Axis float (-1.0 - 1.0) -> driver int16 through a lookup table"""
+
+    def __init__(self, spec=DEFAULT_CURVE, gain=1.0):
+        self.spec = spec
+        self.gain = gain
+        self.table = array('h', _build_table(spec, gain, STICK_STEPS, 32767, True))
+        self._last = len(self.table) - 1
+
+    def __call__(self, value):
+        i = int(value * STICK_STEPS + STICK_STEPS + 0.5)
+        if i < 0:
+            i = 0
+        elif i > self._last:
+            i = self._last
+        return self.table[i]
+
+
+class TriggerCurve:
+    """Trigger float (0.0 - 1.0) -> driver uint8 through a lookup table"""
+
+    def __init__(self, spec=DEFAULT_CURVE, gain=1.0):
+        self.spec = spec
+        self.gain = gain
+        self.table = array('B', _build_table(spec, gain, TRIGGER_STEPS, 255, False))
+        self._last = len(self.table) - 1
+
+    def __call__(self, value):
+        i = int(value * TRIGGER_STEPS + 0.5)
+        if i < 0:
+            i = 0
+        elif i > self._last:
+            i = self._last
+        return self.table[i]
+
+
+class ProfileCurves:
+    """The four compiled curves of one profile - immutable once built, swapped whole"""
+
+    def __init__(self, specs=None, left_gain=1.0, right_gain=1.0):
+        specs = specs or {}
+        self.specs = {name: specs.get(name, DEFAULT_CURVE) for name in CURVE_NAMES}
+        self.left = StickCurve(self.specs['left_stick'], left_gain)
+        self.right = StickCurve(self.specs['right_stick'], right_gain)
+        self.lt = TriggerCurve(self.specs['lt'])
+        self.rt = TriggerCurve(self.specs['rt'])
+
+    @classmethod
+    def from_profile(cls, profile, left_gain=1.0, right_gain=1.0):
+        """Compile profile["curves"]; raises ValueError on bad values"""
+        data = profile.get('curves') or {}
+        return cls({name: parse_curve(data.get(name)) for name in CURVE_NAMES}, left_gain, right_gain)
+
+    def with_gain(self, left_gain=1.0, right_gain=1.0):
+        """Same curves, new sensitivity (recompiles the tables)"""
+        return ProfileCurves(self.specs, left_gain, right_gain)
+
+    def to_profile(self):
+        return {name: spec._asdict() for name, spec in self.specs.items()}
+
+
+def apply_many(curve, values):
+    """Batch lookup (replays, benchmarks) - NumPy fancy indexing when available"""
+    if isinstance(curve, StickCurve):
+        offset, steps = STICK_STEPS, STICK_STEPS
+    else:
+        offset, steps = 0, TRIGGER_STEPS
+    if np is not None:
+        table = np.frombuffer(curve.table, dtype=np.int16 if curve.table.typecode == 'h' else np.uint8)
+        index = np.clip(np.rint(np.asarray(values) * steps) + offset, 0, len(table) - 1).astype(np.intp)
+        return table[index]
+    return [curve(v) for v in values]
+
+
+def benchmark(samples=200_000, gain=1.3):
+    """Per-sample cost of the old float path vs the lookup table"""
+    from output_backends import axis_to_int16
+
+    inputs = [((i * 7919) % 2001) / 1000.0 - 1.0 for i in range(samples)]
+    spec = CurveSpec(0.1, 0.05, 0.95, 1.6)
+    stick = StickCurve(spec, gain)
+    results = {}
+
+    start = time.perf_counter_ns()
+    for v in inputs:
+        axis_to_int16(max(-1.0, min(1.0, v * gain)))
+    results['float_multiplier'] = (time.perf_counter_ns() - start) / samples
+
+    start = time.perf_counter_ns()
+    for v in inputs:
+        axis_to_int16(shape(spec, min(abs(v) * gain, 1.0)) * (1 if v >= 0 else -1))
+    results['float_curve'] = (time.perf_counter_ns() - start) / samples
+
+    start = time.perf_counter_ns()
+    for v in inputs:
+        stick(v)
+    results['lut'] = (time.perf_counter_ns() - start) / samples
+
+    if np is not None:
+        batch = np.asarray(inputs)
+        start = time.perf_counter_ns()
+        apply_many(stick, batch)
+        results['lut_numpy_batch'] = (time.perf_counter_ns() - start) / samples
+
+    start = time.perf_counter_ns()
+    StickCurve(spec, gain)
+    results['compile_us'] = (time.perf_counter_ns() - start) / 1000
+    return results
+
+
+if __name__ == '__main__':
+    print(f"Table build: {'numpy' if np is not None else 'python'}")
+    for name, value in benchmark().items():
+        unit = 'us' if name == 'compile_us' else 'ns/sample'
+        print(f"{name:>18}: {value:8.1f} {unit}")
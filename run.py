@@ -5,19 +5,17 @@
 """
 
 import sys
-import os
+from importlib.util import find_spec
 
 def check_requirements():
-    """فحص المتطلبات"""
-    try:
-        import vgamepad
-        import pynput
-        print("✅ جميع المتطلبات مثبتة")
-        return True
-    except ImportError as e:
-        print(f"❌ خطأ في المتطلبات: {e}")
+    """فحص المتطلبات - بدون استيرادها (vgamepad يحمّل مكتبة الـ driver عند الاستيراد)"""
+    missing = [name for name in ('vgamepad', 'pynput') if find_spec(name) is None]
+    if missing:
+        print(f"❌ خطأ في المتطلبات: {', '.join(missing)} غير مثبت")
         print("يرجى تثبيت المتطلبات باستخدام: pip install -r requirements.txt")
         return False
+    print("✅ جميع المتطلبات مثبتة")
+    return True
 
 def main():
     print("🎮 محاكي كونترولر Xbox الافتراضي")
@@ -33,6 +31,7 @@ def main():
     # تشغيل البرنامج الرئيسي
     try:
         import test_gamepad
+        test_gamepad.main()
     except KeyboardInterrupt:
         print("\n👋 تم إيقاف البرنامج بواسطة المستخدم")
     except Exception as e:
@@ -0,0 +1,157 @@
+"""
+⏱️ Startup Profile
+Where the time to the first frame goes.
+
+The front-ends mark each startup phase (imports, Tk root, engine,
+widgets, listeners, profiles, first frame); the virtual device is created
+on a worker thread in parallel and marked when it is ready. Times count
+from process creation where the OS tells us (Linux, Windows), otherwise
+from the creation of the profile.
+
+    python launcher.py --startup-profile pro
+    python gamepad_gui_pro.py --startup-profile
+
+Through the launcher the GUI module is imported under timed_imports(),
+which adds the modules it pulled in (inclusive time, nested ones
+indented), like a small python -X importtime.
+"""
+
+import builtins
+import os
+import sys
+import threading
+import time
+
+# Time-to-first-frame target
+TARGET_MS = 300
+# Imports shorter than this are left out of the breakdown
+IMPORT_MIN_MS = 1.0
+# Nesting levels shown in the import breakdown
+IMPORT_DEPTH = 2
+
+
+def process_age():
+    """Seconds since this process was created, or None if the OS does not say"""
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+            kernel32 = ctypes.windll.kernel32
+            created, exited, kernel, user, now = (wintypes.FILETIME() for _ in range(5))
+            if not kernel32.GetProcessTimes(kernel32.GetCurrentProcess(), ctypes.byref(created),
+                                            ctypes.byref(exited), ctypes.byref(kernel), ctypes.byref(user)):
+                return None
+            kernel32.GetSystemTimeAsFileTime(ctypes.byref(now))
+
+            def ticks(filetime):
+                return filetime.dwHighDateTime << 32 | filetime.dwLowDateTime
+            # FILETIME counts 100 ns units
+            return (ticks(now) - ticks(created)) / 10_000_000
+        with open('/proc/self/stat') as f:
+            # Field 22 (starttime, clock ticks after boot) - counted after the "(comm)" field
+            start_ticks = int(f.read().rpartition(')')[2].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return max(uptime - start_ticks / os.sysconf('SC_CLK_TCK'), 0.0)
+    except (ImportError, AttributeError, OSError, ValueError, IndexError):
+        return None
+
+
+class StartupProfile:
+    def __init__(self, output=None):
+        # output(text) - e.g. print; the breakdown goes there at finish(), later marks as they come
+        self.output = output
+        self.finished = False
+        age = process_age()
+        now = time.perf_counter()
+        self.from_process = age is not None
+        self.start = now - (age or 0.0)
+        self.marks = []     # (name, seconds since start)
+        self.imports = []   # (name, depth, seconds)
+        self.first_frame = None
+        self._lock = threading.Lock()
+        if self.from_process:
+            self.mark("interpreter + imports")
+
+    def mark(self, name):
+        """End of a phase (any thread); returns its time since start"""
+        at = time.perf_counter() - self.start
+        with self._lock:
+            self.marks.append((name, at))
+        if self.finished and self.output:
+            self.output(f"⏱️ {name} at {at * 1000:.1f} ms")
+        return at
+
+    def mark_first_frame(self):
+        self.first_frame = self.mark("first frame")
+
+    def finish(self):
+        """Startup done - print the breakdown (if there is an output)"""
+        if self.output and not self.finished:
+            self.output(self.format())
+        self.finished = True
+
+    def timed_imports(self):
+        """Context manager timing every module imported inside it"""
+        return _ImportTimer(self)
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.start) * 1000
+
+    def format(self):
+        origin = "process start" if self.from_process else "profile start"
+        lines = [f"⏱️ Startup profile (ms since {origin})"]
+        with self._lock:
+            marks = sorted(self.marks, key=lambda mark: mark[1])
+        last = 0.0
+        for name, at in marks:
+            # Phases follow each other, except what ran on a worker thread
+            parallel = name.startswith("device")
+            step = at if parallel else at - last
+            lines.append(f"  {at * 1000:8.1f}  +{step * 1000:7.1f}  {name}{'  (worker thread)' if parallel else ''}")
+            if not parallel:
+                last = at
+        if self.imports:
+            lines.append("  imports (inclusive):")
+            for name, depth, seconds in self.imports:
+                lines.append(f"  {'':8}  {seconds * 1000:8.1f}  {'  ' * depth}{name}")
+        if self.first_frame is not None:
+            verdict = "✅" if self.first_frame * 1000 <= TARGET_MS else "⚠️"
+            lines.append(f"{verdict} time to first frame: {self.first_frame * 1000:.0f} ms (target {TARGET_MS} ms)")
+        return "\n".join(lines)
+
+
+class _ImportTimer:
+    """Wraps builtins.__import__ while active; only modules actually loaded are timed"""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.depth = 0
+        self._import = None
+
+    def __enter__(self):
+        self._import = builtins.__import__
+        builtins.__import__ = self._timed_import
+        return self
+
+    def __exit__(self, *exc):
+        builtins.__import__ = self._import
+        return False
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._import(name, globals, locals, fromlist, level)
+        depth = self.depth
+        entry = [name, depth, 0.0]
+        # Listed in import order; nested imports fill in while this one runs
+        self.profile.imports.append(entry)
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            entry[2] = time.perf_counter() - start
+            self.depth = depth
+            if depth >= IMPORT_DEPTH or entry[2] * 1000 < IMPORT_MIN_MS:
+                imports = self.profile.imports
+                del imports[next(i for i in range(len(imports) - 1, -1, -1) if imports[i] is entry)]
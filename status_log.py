@@ -0,0 +1,81 @@
+"""
+📜 Status Log
+Bounded, batched status log for the GUI Text widget.
+
+Any thread appends (template, args) to a fixed-size ring; the Tk thread
+drains it a few times per second into the widget with a single insert and
+trims the widget to a line cap. Messages are formatted only when they are
+flushed, so entries that are dropped (ring overflow, more than a screenful
+in one flush) or never logged (logging disabled) are never formatted.
+"""
+
+import threading
+import time
+from collections import deque
+
+# Entries buffered between flushes - older ones are dropped first
+LOG_CAPACITY = 256
+# Widget refresh period
+LOG_FLUSH_MS = 250
+# Lines kept in the Text widget
+DEFAULT_LINE_CAP = 500
+
+
+class StatusLog:
+    def __init__(self, capacity=LOG_CAPACITY, line_cap=DEFAULT_LINE_CAP, flush_ms=LOG_FLUSH_MS):
+        self.entries = deque(maxlen=capacity)
+        self.line_cap = line_cap
+        self.flush_interval = flush_ms / 1000
+        self.dropped = 0
+        self._overflowed = 0    # entries pushed out of the ring since the last drain
+        self._lock = threading.Lock()
+        self._next_flush = 0.0
+
+    def append(self, template, args=()):
+        """Queue a message - template.format(*args) runs at flush time (any thread)"""
+        entry = (time.time(), template, args)
+        with self._lock:
+            if len(self.entries) == self.entries.maxlen:
+                self._overflowed += 1
+            self.entries.append(entry)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self._overflowed = 0
+
+    def drain(self):
+        """Pop everything queued -> (entries, number dropped since the last drain)"""
+        with self._lock:
+            entries = list(self.entries)
+            self.entries.clear()
+            dropped, self._overflowed = self._overflowed, 0
+        self.dropped += dropped
+        return entries, dropped
+
+    def flush(self, text, now=None):
+        """Write pending entries to a Tk Text widget; rate-limited to flush_ms"""
+        now = time.perf_counter() if now is None else now
+        if now < self._next_flush or not self.entries:
+            return False
+        self._next_flush = now + self.flush_interval
+
+        entries, dropped = self.drain()
+        # Lines that would be trimmed right away are dropped unformatted
+        if len(entries) > self.line_cap:
+            dropped += len(entries) - self.line_cap
+            entries = entries[-self.line_cap:]
+        lines = []
+        if dropped:
+            lines.append(f"[{time.strftime('%H:%M:%S')}] ... {dropped} log entries dropped\n")
+        for ts, template, args in entries:
+            message = template.format(*args) if args else template
+            lines.append(f"[{time.strftime('%H:%M:%S', time.localtime(ts))}] {message}\n")
+
+        text.insert('end', ''.join(lines))
+        # 'end' is one past the trailing newline
+        excess = int(text.index('end-1c').split('.')[0]) - 1 - self.line_cap
+        if excess > 0:
+            text.delete('1.0', f'{excess + 1}.0')
+        text.see('end')
+        return True
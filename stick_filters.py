@@ -0,0 +1,183 @@
+"""
+🎚️ Stick Filters
+Per-axis smoothing for the mouse-driven right stick.
+
+- passthrough: no filtering, no added lag
+- ema:         exponential moving average with a fixed cutoff frequency
+- one_euro:    One Euro filter - the cutoff rises with speed, so slow
+               aims are smoothed while fast flicks pass with little lag
+
+Filters run in the engine tick on the latest stick target and use the
+real elapsed time, so the behaviour does not depend on the report rate.
+Each axis keeps a few floats of state (__slots__, no per-sample
+allocation). step_response() measures the lag a filter adds to a full
+step so jitter can be traded against latency with numbers:
+
+    python stick_filters.py
+"""
+
+import math
+
+FILTERS = ('passthrough', 'ema', 'one_euro')
+DEFAULT_FILTER = 'passthrough'
+
+# Default parameters per filter kind (profile "stick_filter" overrides them)
+FILTER_DEFAULTS = {
+    'passthrough': {},
+    'ema': {'cutoff_hz': 15.0},
+    'one_euro': {'min_cutoff_hz': 1.0, 'beta': 0.5, 'd_cutoff_hz': 1.0},
+}
+
+_TWO_PI = 2.0 * math.pi
+
+
+def _alpha(cutoff_hz, dt_s):
+    # Smoothing factor of a first-order low-pass for this time step
+    tau = 1.0 / (_TWO_PI * cutoff_hz)
+    return 1.0 / (1.0 + tau / dt_s)
+
+
+class PassthroughFilter:
+    __slots__ = ()
+
+    def reset(self):
+        pass
+
+    def filter(self, value, dt_s):
+        return value
+
+
+class EmaFilter:
+    __slots__ = ('cutoff_hz', 'value', 'primed')
+
+    def __init__(self, cutoff_hz=15.0):
+        self.cutoff_hz = cutoff_hz
+        self.reset()
+
+    def reset(self):
+        self.value = 0.0
+        self.primed = False
+
+    def filter(self, value, dt_s):
+        if not self.primed:
+            self.primed = True
+            self.value = value
+            return value
+        self.value += _alpha(self.cutoff_hz, dt_s) * (value - self.value)
+        return self.value
+
+
+class OneEuroFilter:
+    __slots__ = ('min_cutoff_hz', 'beta', 'd_cutoff_hz', 'value', 'speed', 'primed')
+
+    def __init__(self, min_cutoff_hz=1.0, beta=0.5, d_cutoff_hz=1.0):
+        self.min_cutoff_hz = min_cutoff_hz
+        self.beta = beta
+        self.d_cutoff_hz = d_cutoff_hz
+        self.reset()
+
+    def reset(self):
+        self.value = 0.0
+        self.speed = 0.0
+        self.primed = False
+
+    def filter(self, value, dt_s):
+        if not self.primed:
+            self.primed = True
+            self.value = value
+            return value
+        # Smoothed speed drives the cutoff of the value filter
+        raw_speed = (value - self.value) / dt_s
+        self.speed += _alpha(self.d_cutoff_hz, dt_s) * (raw_speed - self.speed)
+        cutoff = self.min_cutoff_hz + self.beta * abs(self.speed)
+        self.value += _alpha(cutoff, dt_s) * (value - self.value)
+        return self.value
+
+
+_FILTER_CLASSES = {
+    'passthrough': PassthroughFilter,
+    'ema': EmaFilter,
+    'one_euro': OneEuroFilter,
+}
+
+
+def parse_filter(data):
+    """Profile "stick_filter" dict -> (kind, params) with defaults filled in"""
+    data = dict(data or {})
+    kind = data.pop('kind', DEFAULT_FILTER)
+    if kind not in FILTERS:
+        raise ValueError(f"Unknown stick filter: {kind}")
+    params = dict(FILTER_DEFAULTS[kind])
+    for key, value in data.items():
+        if key not in params:
+            raise ValueError(f"Unknown {kind} parameter: {key}")
+        value = float(value)
+        if value < 0 or (value == 0 and key.endswith('_hz')):
+            raise ValueError(f"Invalid {key}: {value}")
+        params[key] = value
+    return kind, params
+
+
+class StickFilter:
+    """Filter pair for the two axes of one stick"""
+
+    def __init__(self, kind=DEFAULT_FILTER, params=None):
+        params = dict(FILTER_DEFAULTS[kind], **(params or {}))
+        self.kind = kind
+        self.params = params
+        self.x = _FILTER_CLASSES[kind](**params)
+        self.y = _FILTER_CLASSES[kind](**params)
+        self._last_ns = None
+
+    @classmethod
+    def from_profile(cls, data):
+        return cls(*parse_filter(data))
+
+    @property
+    def passthrough(self):
+        return self.kind == 'passthrough'
+
+    def to_profile(self):
+        return dict(self.params, kind=self.kind)
+
+    def reset(self):
+        self.x.reset()
+        self.y.reset()
+        self._last_ns = None
+
+    def filter(self, x, y, now_ns):
+        last = self._last_ns
+        self._last_ns = now_ns
+        if last is None or now_ns <= last:
+            dt = 0.001
+        else:
+            dt = (now_ns - last) / 1_000_000_000
+        return self.x.filter(x, dt), self.y.filter(y, dt)
+
+
+def step_response(kind=DEFAULT_FILTER, params=None, tick_hz=250, duration_s=1.0):
+    """Lag added to a 0 -> 1 step: ms until the output reaches 50% / 90%"""
+    axis = _FILTER_CLASSES[kind](**dict(FILTER_DEFAULTS[kind], **(params or {})))
+    dt = 1.0 / tick_hz
+    axis.filter(0.0, dt)
+    t50 = t90 = None
+    for n in range(1, int(duration_s * tick_hz) + 1):
+        out = axis.filter(1.0, dt)
+        if t50 is None and out >= 0.5:
+            t50 = (n - 1) * dt * 1000
+        if out >= 0.9:
+            t90 = (n - 1) * dt * 1000
+            break
+    return {'t50_ms': t50, 't90_ms': t90}
+
+
+def format_step_response(kind, params=None, tick_hz=250):
+    r = step_response(kind, params, tick_hz)
+    fmt = lambda v: f"{v:.1f}ms" if v is not None else "n/a"
+    return f"step lag @{tick_hz} Hz: 50% {fmt(r['t50_ms'])}, 90% {fmt(r['t90_ms'])}"
+
+
+if __name__ == '__main__':
+    for kind in FILTERS:
+        for rate in (125, 250, 1000):
+            print(f"{kind:>12} {format_step_response(kind, tick_hz=rate)}")
@@ -1,269 +1,270 @@
-import vgamepad as vg
-from pynput import keyboard, mouse
+import argparse
 import sys
 import time
 import threading
+from pad_controller import PadController
+from macros import parse_macros
+from input_capture import InputCapture
+from input_server import InputServer, DEFAULT_HOST, DEFAULT_PORT
+from stick_filters import FILTERS, StickFilter, format_step_response
+from key_dispatch import CONTROL, KeyAction, DEFAULT_BUTTON_MAPPINGS, normalize_key
 
 # إعدادات الحساسية
 SENSITIVITY = 1.0  # يمكن تغييرها من 0.1 إلى 2.0
 ENABLE_LOGGING = True  # تفعيل/إلغاء تسجيل الحركات
+REPORT_RATE = 250  # معدل إرسال التقارير: 125/250/500/1000 أو 'immediate'
+OUTPUT_BACKEND = 'vgamepad'  # 'vgamepad' للكونترولر الحقيقي، 'ds4' لـ DualShock 4، أو 'recording' / 'ds4_recording' للتسجيل في الذاكرة
+STICK_FILTER = 'passthrough'  # تنعيم الـ joystick الأيمن: 'passthrough' أو 'ema' أو 'one_euro'
+# زمن الوصول من 0 إلى الضغط الكامل (ms) - 0 يعني فوري
+RAMPS = {
+    'trigger_attack_ms': 0.0,   # LT/RT عند الضغط
+    'trigger_release_ms': 0.0,  # LT/RT عند الإطلاق
+    'stick_attack_ms': 0.0,     # WASD لكل محور - مشي/جري حسب مدة الضغط
+    'stick_release_ms': 0.0,
+}
+# ماكرو: تسلسل حالات للكونترولر بتوقيت دقيق (أقل من 1ms) - كل خطوة تُثبت لمدة hold_ms
+MACROS = {
+    'jump_shot': [
+        {'buttons': ['A'], 'hold_ms': 50},
+        {'hold_ms': 16.7},
+        {'buttons': ['X'], 'rt': 1.0, 'hold_ms': 100},
+    ],
+}
+# ربط الماكرو بمفتاح: 'macro:<الاسم>': المفتاح
+MACRO_KEYS = {'macro:jump_shot': 'j'}
+# التكرار التلقائي للمفتاح المضغوط من النظام: 'drop' (يُتجاهل، الافتراضي) أو
+# 'turbo' (كل تكرار يضغط/يحرر الزر) - لكل زر، مثال {'A': 'turbo'}
+REPEAT = {}
 
-# إنشاء الكونترولر
-gamepad = vg.VX360Gamepad()
-print("🎮 Virtual Xbox Controller جاهز للعمل!")
-print(f"⚙️ حساسية الكونترولر: {SENSITIVITY}")
-print(f"📝 تسجيل الحركات: {'مفعل' if ENABLE_LOGGING else 'معطل'}")
-print("\n📋 تعليمات الاستخدام:")
-print("WASD - تحريك الـ joystick الأيسر (يدعم الحركة القطرية!)")
-print("  ↖️ W+A | ↗️ W+D | ↙️ S+A | ↘️ S+D")
-print("🖱️ حركة الماوس - تحريك الـ joystick الأيمن") 
-print("U/O - الضغط على LT/RT")
-print("T/Y/G/H - أزرار A/B/X/Y")
-print("Z/X/C - أزرار Back/Start/Guide")
-print("1/2/3/4 - D-Pad (أعلى/أسفل/يسار/يمين)")
-print("+/- - زيادة/تقليل حساسية الـ joystick")
-print("Page Up/Down - زيادة/تقليل حساسية الماوس")
-print("M - تفعيل/إلغاء تحكم الماوس")
-print("ESC أو Q - الخروج من البرنامج")
-print("\n🎯 اضغط على أي مفتاح للبدء...")
+# الكونترولر - يُنشأ في setup() (pad_controller.py: نفس المحرك الذي تستخدمه الواجهات)
+controller = None
+engine = None
 
-# متغيرات عالمية للحساسية والتسجيل
-current_sensitivity = SENSITIVITY
+# متغيرات عالمية للتسجيل
 logging_enabled = ENABLE_LOGGING
 
-# متغيرات الماوس
-mouse_sensitivity = 0.5  # حساسية الماوس (0.1 - 2.0)
-mouse_center_x = 960     # مركز الشاشة X
-mouse_center_y = 540     # مركز الشاشة Y
-mouse_enabled = True     # تفعيل/إلغاء دعم الماوس
-
-# تتبع حالة المفاتيح للحركة القطرية
-pressed_keys = set()
+# نصوص التسجيل في المسار السريع - نفس الحقول بصياغة الكونسول
+MESSAGES = {
+    'button_down': "🔴 ضغط زر: {}",
+    'button_up': "⚪ إطلاق زر: {}",
+    'trigger_down': "🔴 ضغط {}",
+    'trigger_up': "⚪ إطلاق {}",
+    'left_stick': "🕹️ Joystick أيسر: X={:.2f}, Y={:.2f}",
+    'right_stick': "🕹️ Joystick أيمن: X={:.2f}, Y={:.2f}",
+    'key_down_error': "⚠️ خطأ في معالجة المفتاح: {}",
+    'key_up_error': "⚠️ خطأ في إطلاق المفتاح: {}",
+    'device_error': "❌ الكونترولر الافتراضي غير متاح: {}",
+}
 
 # ==========================
 # دوال مساعدة للكونترولر
 # ==========================
-def log_action(action):
-    """تسجيل الحركات والأزرار المضغوطة"""
+def log_action(message, *args):
+    """تسجيل الحركات والأزرار المضغوطة (التنسيق فقط عند تفعيل التسجيل)"""
     if logging_enabled:
         timestamp = time.strftime("%H:%M:%S")
-        print(f"[{timestamp}] {action}")
-
-def press_button(btn):
-    log_action(f"🔴 ضغط زر: {btn}")
-    gamepad.press_button(btn)
-    gamepad.update()
-
-def release_button(btn):
-    log_action(f"⚪ إطلاق زر: {btn}")
-    gamepad.release_button(btn)
-    gamepad.update()
-
-def move_left_joystick(x=0.0, y=0.0):
-    # تطبيق الحساسية
-    adjusted_x = x * current_sensitivity
-    adjusted_y = y * current_sensitivity
-    log_action(f"🕹️ Joystick أيسر: X={adjusted_x:.2f}, Y={adjusted_y:.2f}")
-    gamepad.left_joystick_float(adjusted_x, adjusted_y)
-    gamepad.update()
-
-def move_right_joystick(x=0.0, y=0.0):
-    # تطبيق الحساسية
-    adjusted_x = x * current_sensitivity
-    adjusted_y = y * current_sensitivity
-    log_action(f"🕹️ Joystick أيمن: X={adjusted_x:.2f}, Y={adjusted_y:.2f}")
-    gamepad.right_joystick_float(adjusted_x, adjusted_y)
-    gamepad.update()
-
-def press_lt(value=1.0):
-    log_action(f"🔴 LT: {value:.2f}")
-    gamepad.left_trigger_float(value)
-    gamepad.update()
-
-def press_rt(value=1.0):
-    log_action(f"🔴 RT: {value:.2f}")
-    gamepad.right_trigger_float(value)
-    gamepad.update()
+        print(f"[{timestamp}] {message.format(*args)}")
 
-def dpad_press(direction):
-    log_action(f"🔴 D-Pad: {direction}")
-    gamepad.press_button(direction)
-    gamepad.update()
-
-def dpad_release(direction):
-    log_action(f"⚪ D-Pad: {direction}")
-    gamepad.release_button(direction)
-    gamepad.update()
+def set_sensitivity(sensitivity):
+    """الحساسية مدمجة في جداول المنحنى - للـ joystick الأيسر والأيمن"""
+    controller.sensitivity = sensitivity
+    controller.set_curves(controller.curves.with_gain(sensitivity, sensitivity))
 
 def adjust_sensitivity(change):
     """تغيير حساسية الكونترولر"""
-    global current_sensitivity
-    new_sensitivity = current_sensitivity + change
+    new_sensitivity = controller.sensitivity + change
     if 0.1 <= new_sensitivity <= 2.0:
-        current_sensitivity = new_sensitivity
-        print(f"⚙️ الحساسية الجديدة: {current_sensitivity:.1f}")
+        set_sensitivity(new_sensitivity)
+        print(f"⚙️ الحساسية الجديدة: {new_sensitivity:.1f}")
     else:
         print(f"⚠️ الحساسية يجب أن تكون بين 0.1 و 2.0")
 
 def adjust_mouse_sensitivity(change):
     """تغيير حساسية الماوس"""
-    global mouse_sensitivity
-    new_sensitivity = mouse_sensitivity + change
+    new_sensitivity = controller.mouse_sensitivity + change
     if 0.1 <= new_sensitivity <= 2.0:
-        mouse_sensitivity = new_sensitivity
-        print(f"🖱️ حساسية الماوس الجديدة: {mouse_sensitivity:.1f}")
+        controller.set_mouse_sensitivity(new_sensitivity)
+        print(f"🖱️ حساسية الماوس الجديدة: {new_sensitivity:.1f}")
     else:
         print(f"⚠️ حساسية الماوس يجب أن تكون بين 0.1 و 2.0")
 
-def on_mouse_move(x, y):
-    """معالجة حركة الماوس"""
-    if not mouse_enabled:
-        return
-    
-    # حساب المسافة من المركز
-    dx = (x - mouse_center_x) / mouse_center_x
-    dy = (y - mouse_center_y) / mouse_center_y
-    
-    # تطبيق الحساسية والحد من القيم
-    dx = max(-1.0, min(1.0, dx * mouse_sensitivity))
-    dy = max(-1.0, min(1.0, dy * mouse_sensitivity))
-    
-    # تحديث الـ joystick الأيمن
-    move_right_joystick(dx, -dy)  # عكس Y للاتجاه الطبيعي
-
 def toggle_mouse_control():
     """تفعيل/إلغاء تحكم الماوس"""
-    global mouse_enabled
-    mouse_enabled = not mouse_enabled
-    status = "مفعل" if mouse_enabled else "معطل"
+    # عند الإلغاء يعود الـ joystick الأيمن للمركز
+    controller.set_mouse_enabled(not controller.mouse_enabled)
+    status = "مفعل" if controller.mouse_enabled else "معطل"
     print(f"🖱️ تحكم الماوس: {status}")
-    if not mouse_enabled:
-        move_right_joystick(0, 0)  # إعادة تعيين الـ joystick الأيمن
 
-def calculate_movement():
-    """حساب الحركة بناءً على المفاتيح المضغوطة"""
-    x, y = 0.0, 0.0
-    
-    # تحقق من المفاتيح المضغوطة
-    if 'w' in pressed_keys: y += 1.0   # أعلى
-    if 's' in pressed_keys: y -= 1.0   # أسفل
-    if 'a' in pressed_keys: x -= 1.0   # يسار
-    if 'd' in pressed_keys: x += 1.0   # يمين
-    
-    # تطبيع الحركة القطرية (لتجنب الحركة السريعة جداً قطرياً)
-    if x != 0 and y != 0:
-        # تقسيم على √2 للحصول على سرعة طبيعية في الحركة القطرية
-        x *= 0.707  # 1/√2 ≈ 0.707
-        y *= 0.707
-    
-    return x, y
+def cycle_stick_filter():
+    """التبديل بين فلاتر التنعيم مع عرض التأخير المضاف"""
+    kind = FILTERS[(FILTERS.index(controller.stick_filter.kind) + 1) % len(FILTERS)]
+    stick_filter = StickFilter(kind)
+    controller.set_stick_filter(stick_filter)
+    controller.engine.call(controller.recenter_mouse_stick)
+    tick_hz = REPORT_RATE if REPORT_RATE != 'immediate' else 1000
+    print(f"🎚️ فلتر الـ joystick الأيمن: {kind} ({format_step_response(kind, stick_filter.params, tick_hz)})")
+
+def toggle_mouse_mode():
+    """التبديل بين الوضع المطلق والنسبي للماوس"""
+    mouse_mode = 'relative' if controller.mouse_mode == 'absolute' else 'absolute'
+    controller.set_mouse_mode(mouse_mode)
+    print(f"🖱️ وضع الماوس: {mouse_mode}")
 
-def update_left_joystick():
-    """تحديث الـ joystick الأيسر بناءً على المفاتيح المضغوطة"""
-    x, y = calculate_movement()
-    move_left_joystick(x, y)
+def dump_latency():
+    """عرض توزيع زمن الاستجابة لكل مصدر إدخال (p50/p95/p99/max)"""
+    print(f"⏲️ {engine.format_latency()}")
 
 # ==========================
 # ربط الكيبورد بالكونترولر
 # ==========================
+# مفاتيح التحكم: المفتاح -> (الدالة، المعاملات) - تُنفذ على thread المحرك
+control_handlers = {
+    'adjust_sensitivity': adjust_sensitivity,
+    'adjust_mouse_sensitivity': adjust_mouse_sensitivity,
+    'toggle_mouse_control': toggle_mouse_control,
+    'toggle_mouse_mode': toggle_mouse_mode,
+    'cycle_stick_filter': cycle_stick_filter,
+    'dump_latency': dump_latency,
+}
+control_keys = {
+    '+': KeyAction(CONTROL, 'adjust_sensitivity', 0, (0.1,)),
+    '-': KeyAction(CONTROL, 'adjust_sensitivity', 0, (-0.1,)),
+    'm': KeyAction(CONTROL, 'toggle_mouse_control', 0, ()),
+    'n': KeyAction(CONTROL, 'toggle_mouse_mode', 0, ()),
+    'f': KeyAction(CONTROL, 'cycle_stick_filter', 0, ()),
+    'l': KeyAction(CONTROL, 'dump_latency', 0, ()),
+    'page_up': KeyAction(CONTROL, 'adjust_mouse_sensitivity', 0, (0.1,)),
+    'page_down': KeyAction(CONTROL, 'adjust_mouse_sensitivity', 0, (-0.1,)),
+}
+
+# ==========================
+# دوال المراقبين - تضيف الأحداث للطابور فقط
+# ==========================
 def on_press(key):
-    try:
-        # مفاتيح الخروج
-        if key == keyboard.Key.esc or (hasattr(key, 'char') and key.char == 'q'):
-            print("\n👋 جاري الخروج من البرنامج...")
-            return False
-        
-        # مفاتيح التحكم في الحساسية
-        if hasattr(key, 'char') and key.char:
-            if key.char == '+':  # أو =
-                adjust_sensitivity(0.1)
-            elif key.char == '-':
-                adjust_sensitivity(-0.1)
-            elif key.char == 'm':
-                toggle_mouse_control()
-            elif key.char in ['w', 'a', 's', 'd']:
-                # إضافة المفتاح للمفاتيح المضغوطة
-                pressed_keys.add(key.char)
-                update_left_joystick()
-            elif key.char == 'u': press_lt(1.0)    # LT كامل
-            elif key.char == 'o': press_rt(1.0)    # RT كامل
-            elif key.char == 't': press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_A)
-            elif key.char == 'y': press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_B)
-            elif key.char == 'g': press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_X)
-            elif key.char == 'h': press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_Y)
-            elif key.char == 'z': press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_BACK)
-            elif key.char == 'x': press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_START)
-            elif key.char == 'c': press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_GUIDE)
-            elif key.char == '1': dpad_press(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP)
-            elif key.char == '2': dpad_press(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN)
-            elif key.char == '3': dpad_press(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT)
-            elif key.char == '4': dpad_press(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT)
-        
-        # مفاتيح خاصة للحساسية
-        if key == keyboard.Key.page_up:
-            adjust_mouse_sensitivity(0.1)
-        elif key == keyboard.Key.page_down:
-            adjust_mouse_sensitivity(-0.1)
-    except Exception as e:
-        print(f"⚠️ خطأ في معالجة المفتاح: {e}")
-        pass
+    # مفاتيح الخروج
+    if normalize_key(key) == 'esc' or getattr(key, 'char', None) == 'q':
+        print("\n👋 جاري الخروج من البرنامج...")
+        return False
+    controller.key_down(key)
 
 def on_release(key):
-    try:
-        if hasattr(key, 'char') and key.char:
-            if key.char in ['w','s','a','d']:
-                # إزالة المفتاح من المفاتيح المضغوطة
-                pressed_keys.discard(key.char)
-                update_left_joystick()
-            elif key.char == 'u': press_lt(0)
-            elif key.char == 'o': press_rt(0)
-            elif key.char == 't': release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_A)
-            elif key.char == 'y': release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_B)
-            elif key.char == 'g': release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_X)
-            elif key.char == 'h': release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_Y)
-            elif key.char == 'z': release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_BACK)
-            elif key.char == 'x': release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_START)
-            elif key.char == 'c': release_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_GUIDE)
-            elif key.char == '1': dpad_release(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP)
-            elif key.char == '2': dpad_release(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN)
-            elif key.char == '3': dpad_release(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT)
-            elif key.char == '4': dpad_release(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT)
-    except Exception as e:
-        print(f"⚠️ خطأ في إطلاق المفتاح: {e}")
-        pass
+    controller.key_up(key)
+
+def on_mouse_move(x, y):
+    controller.mouse_move(x, y)
+
+def on_macro_done(run):
+    """عرض خطأ التوقيت لكل خطوة بعد انتهاء الماكرو"""
+    if logging_enabled:
+        print(f"🎬 {run.format()}")
+
+def setup(backend=OUTPUT_BACKEND, rate=REPORT_RATE):
+    """إنشاء الكونترولر وتشغيل المحرك بدون مراقبي الإدخال (يُستخدم أيضاً في benchmark.py)"""
+    global controller, engine
+    # البدء من حالة نظيفة عند إعادة الاستدعاء
+    if controller:
+        controller.close()
+    # thread واحد يملك الكونترولر ويطبق الأحداث بالترتيب - جدول المفاتيح مترجم
+    # مسبقاً (بحث واحد في القاموس لكل حدث)، والمنحدرات تُحدّث مرة لكل tick
+    controller = PadController(backend, rate, button_mappings={**DEFAULT_BUTTON_MAPPINGS, **MACRO_KEYS},
+                               control_keys=control_keys, controls=control_handlers, log=log_action,
+                               messages=MESSAGES, on_macro_done=on_macro_done)
+    engine = controller.engine
+    set_sensitivity(SENSITIVITY)
+    controller.ramps.configure(RAMPS)
+    # الماكرو على thread مؤقت دقيق خاص به
+    controller.macro_player.set_macros(parse_macros(MACROS))
+    controller.set_stick_filter(StickFilter(STICK_FILTER))
+    controller.set_repeat(REPEAT)
+    controller.start()
+    return engine
 
 # ==========================
 # تشغيل مراقبي الكيبورد والماوس
 # ==========================
 def start_mouse_listener():
     """تشغيل مراقب الماوس في thread منفصل"""
+    from pynput import mouse
     try:
         with mouse.Listener(on_move=on_mouse_move) as mouse_listener:
             mouse_listener.join()
     except Exception as e:
         print(f"⚠️ خطأ في مراقب الماوس: {e}")
 
-# تشغيل مراقب الماوس في thread منفصل
-mouse_thread = threading.Thread(target=start_mouse_listener, daemon=True)
-mouse_thread.start()
+def main(argv=None):
+    """تشغيل نسخة الكونسول: الكونترولر + مراقبي الكيبورد والماوس"""
+    from pynput import keyboard
+
+    parser = argparse.ArgumentParser(description="Virtual Xbox Controller - console")
+    parser.add_argument('--capture', nargs='?', const='', metavar='PATH',
+                        help="record all input events to a binary capture (default: captures/session-*.gpic)")
+    parser.add_argument('--listen', nargs='?', const=str(DEFAULT_PORT), metavar='[HOST:]PORT',
+                        help=f"accept pad frames over UDP/TCP (default port {DEFAULT_PORT}, see input_client.py)")
+    args = parser.parse_args(argv)
+
+    setup()
+    # تسجيل الجلسة كاملة للإعادة لاحقاً: python input_capture.py replay FILE
+    capture = InputCapture(args.capture or None).start(engine) if args.capture is not None else None
+    # إدخال من برامج أو أجهزة أخرى عبر الشبكة
+    server = None
+    if args.listen:
+        host, _, port = args.listen.rpartition(':')
+        server = InputServer(controller, host or DEFAULT_HOST, int(port)).start()
+    print("🎮 Virtual Xbox Controller جاهز للعمل!")
+    print(f"⚙️ حساسية الكونترولر: {SENSITIVITY}")
+    print(f"📝 تسجيل الحركات: {'مفعل' if ENABLE_LOGGING else 'معطل'}")
+    print(f"⏱️ معدل التقارير: {REPORT_RATE}")
+    print("\n📋 تعليمات الاستخدام:")
+    print("WASD - تحريك الـ joystick الأيسر (يدعم الحركة القطرية!)")
+    print("  ↖️ W+A | ↗️ W+D | ↙️ S+A | ↘️ S+D")
+    print("🖱️ حركة الماوس - تحريك الـ joystick الأيمن") 
+    print("U/O - الضغط على LT/RT")
+    print("T/Y/G/H - أزرار A/B/X/Y")
+    print("Z/X/C - أزرار Back/Start/Guide")
+    print("1/2/3/4 - D-Pad (أعلى/أسفل/يسار/يمين)")
+    print("+/- - زيادة/تقليل حساسية الـ joystick")
+    print("Page Up/Down - زيادة/تقليل حساسية الماوس")
+    print("M - تفعيل/إلغاء تحكم الماوس")
+    print("N - التبديل بين وضع الماوس المطلق والنسبي")
+    print("F - تغيير فلتر تنعيم الـ joystick الأيمن")
+    print("L - عرض زمن الاستجابة (من الالتقاط حتى إرسال التقرير)")
+    print("J - تشغيل الماكرو jump_shot")
+    print("ESC أو Q - الخروج من البرنامج")
+    if capture:
+        print(f"⏺️ تسجيل الإدخال إلى: {capture.path}")
+    if server:
+        print(f"🌐 استقبال الإدخال عبر الشبكة على {server.host}:{server.port} (UDP + TCP)")
+    print("\n🎯 اضغط على أي مفتاح للبدء...")
+
+    # تشغيل مراقب الماوس في thread منفصل
+    mouse_thread = threading.Thread(target=start_mouse_listener, daemon=True)
+    mouse_thread.start()
 
-try:
-    with keyboard.Listener(on_press=on_press, on_release=on_release) as listener:
-        listener.join()
-except KeyboardInterrupt:
-    print("\n⚠️ تم إيقاف البرنامج بواسطة المستخدم")
-except Exception as e:
-    print(f"\n❌ خطأ غير متوقع: {e}")
-finally:
-    print("🔧 تنظيف الموارد...")
-    # إعادة تعيين الكونترولر إلى الحالة الافتراضية
     try:
-        move_left_joystick(0, 0)
-        move_right_joystick(0, 0)
-        press_lt(0)
-        press_rt(0)
-        gamepad.update()
-        print("✅ تم تنظيف الكونترولر بنجاح")
-    except:
-        pass
-    print("👋 وداعاً!")
+        with keyboard.Listener(on_press=on_press, on_release=on_release) as listener:
+            listener.join()
+    except KeyboardInterrupt:
+        print("\n⚠️ تم إيقاف البرنامج بواسطة المستخدم")
+    except Exception as e:
+        print(f"\n❌ خطأ غير متوقع: {e}")
+    finally:
+        print("🔧 تنظيف الموارد...")
+        # إعادة تعيين الكونترولر إلى الحالة الافتراضية
+        try:
+            controller.reset()
+            if capture:
+                capture.stop()
+                print(f"💾 تم حفظ {capture.records} حدث في {capture.path}")
+            if server:
+                server.stop()
+                print(f"🌐 {server.format_stats()}")
+            controller.close()
+            print(f"📊 {engine.format_stats()}")
+            print(f"⌨️ {controller.keys.format_stats()}")
+            print("✅ تم تنظيف الكونترولر بنجاح")
+        except:
+            pass
+        print("👋 وداعاً!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Network frames go through the pad's input path, merged with the keys"""
+
+from controller_engine import InputEvent, KEY_DOWN, KEY_UP
+from input_server import ClientStats, InputServer
+from pad_controller import PadController
+
+BUTTON_A = 0x1000
+BUTTON_B = 0x2000
+
+
+class Key:
+    def __init__(self, char):
+        self.char = char
+
+
+def test_frames_merge_with_held_keys():
+    # Not started - the test thread plays the engine thread
+    controller = PadController('recording')
+    server = InputServer(controller)
+    a = Key(controller.button_mappings['A'])
+
+    controller.handle_event(InputEvent(0, KEY_DOWN, a, None, None))
+    server._apply_frames(0, [(1, BUTTON_A | BUTTON_B, 255, 0, 0, 0, 0, 0),
+                             (2, 0, 0, 0, 0, 0, 0, 0)])
+    # The keyboard still holds A
+    assert controller.gamepad.buttons == BUTTON_A
+    assert controller.state.buttons == {'A'}
+
+    server._apply_frames(0, [(3, BUTTON_A, 0, 0, 0, 0, 0, 0)])
+    controller.handle_event(InputEvent(0, KEY_UP, a, None, None))
+    # ...and now the network does
+    assert controller.gamepad.buttons == BUTTON_A
+
+    server._apply_frames(0, [(4, 0, 0, 0, 0, 0, 0, 0)])
+    assert controller.gamepad.buttons == 0
+    assert not controller.state.buttons
+
+
+def test_reordered_frame_is_not_lost():
+    stats = ClientStats('client', 'udp')
+    frames = [(seq, 0, 0, 0, 0, 0, 0, 0) for seq in (1, 2, 4, 3, 5)]
+    accepted = stats.accept(frames)
+
+    assert [frame[0] for frame in accepted] == [1, 2, 4, 5]
+    assert stats.out_of_order == 1
+    assert stats.lost == 0
+
+    # A real gap stays lost; a repeat is only out of order
+    stats.accept([(8, 0, 0, 0, 0, 0, 0, 0), (8, 0, 0, 0, 0, 0, 0, 0), (7, 0, 0, 0, 0, 0, 0, 0)])
+    assert stats.lost == 1
+    assert stats.out_of_order == 3
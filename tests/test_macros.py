@@ -0,0 +1,51 @@
+"""Stopping a macro mid-run must leave the player ready to play again"""
+
+import time
+
+from controller_engine import ControllerEngine
+from macros import MacroPlayer, parse_macros
+from output_backends import create_backend
+
+BUTTON_A = 0x1000
+
+MACROS = parse_macros({
+    'hold': [{'buttons': ['A'], 'hold_ms': 500}, {'buttons': ['B'], 'hold_ms': 500}],
+    'tap': [{'buttons': ['A'], 'hold_ms': 5}],
+})
+
+
+def test_stop_mid_run_then_replay():
+    gamepad = create_backend('recording')
+    engine = ControllerEngine(gamepad, rate=1000)
+    player = MacroPlayer(engine, MACROS)
+    engine.start()
+    player.start()
+    try:
+        run = player.play('hold')
+        assert run is not None
+        # Let the first step go out, then stop while the second is still scheduled
+        for _ in range(200):
+            if run.errors_ns:
+                break
+            time.sleep(0.005)
+        assert len(run.errors_ns) == 1
+        player.stop()
+
+        assert run.done.is_set()
+        assert not player.playing
+        assert player._timeline == []
+
+        player.start()
+        replay = player.play('tap')
+        assert replay is not None
+        assert replay.done.wait(2.0)
+        assert list(player.results) == [replay]
+        # Both steps of the replay went out: the tap, then neutral
+        assert len(replay.errors_ns) == 2
+    finally:
+        player.stop()
+        engine.stop()
+
+    buttons = [record[1] for record in gamepad.records()]
+    assert buttons[0] == BUTTON_A
+    assert buttons[-1] == 0
@@ -0,0 +1,31 @@
+"""Reset leaves the pad neutral, even with keys still held"""
+
+from controller_engine import InputEvent, KEY_DOWN, KEY_UP
+from pad_controller import PadController
+
+
+class Key:
+    def __init__(self, char):
+        self.char = char
+
+
+def test_reset_releases_held_keys():
+    # Not started - the test thread plays the engine thread
+    controller = PadController('recording')
+    a = Key(controller.button_mappings['A'])
+    w = Key('w')
+
+    controller.handle_event(InputEvent(0, KEY_DOWN, a, None, None))
+    controller.handle_event(InputEvent(0, KEY_DOWN, w, None, None))
+    assert controller.gamepad.buttons
+    assert controller.pressed_keys == {'w'}
+
+    controller.apply_reset()
+    assert controller.gamepad.buttons == 0
+    assert not controller.state.buttons
+    assert not controller.held_actions
+    assert not controller.pressed_keys
+
+    # The release that comes after the reset changes nothing
+    controller.handle_event(InputEvent(0, KEY_UP, a, None, None))
+    assert controller.gamepad.buttons == 0
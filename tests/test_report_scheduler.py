@@ -0,0 +1,71 @@
+"""Report coalescing must not swallow button edges"""
+
+from output_backends import create_backend
+from report_scheduler import ReportScheduler
+
+BUTTON_A = 0x1000
+
+
+def test_tap_within_one_tick_sends_press_and_release():
+    gamepad = create_backend('recording')
+    scheduler = ReportScheduler(gamepad, 125, threaded=False)
+
+    # Pressed and released inside one 8 ms tick
+    gamepad.press_button(BUTTON_A)
+    scheduler.request_update()
+    gamepad.release_button(BUTTON_A)
+    scheduler.request_update()
+    scheduler.tick()
+    scheduler.tick()
+    scheduler.tick()
+
+    buttons = [record[1] for record in gamepad.records()]
+    assert buttons == [BUTTON_A, 0]
+
+
+def test_held_button_is_not_latched():
+    gamepad = create_backend('recording')
+    scheduler = ReportScheduler(gamepad, 125, threaded=False)
+
+    gamepad.press_button(BUTTON_A)
+    scheduler.request_update()
+    scheduler.tick()
+    scheduler.tick()
+    gamepad.release_button(BUTTON_A)
+    scheduler.request_update()
+    scheduler.tick()
+
+    buttons = [record[1] for record in gamepad.records()]
+    assert buttons == [BUTTON_A, 0]
+    assert scheduler.updates == 2
+
+
+def test_trigger_tap_within_one_tick_sends_press_and_release():
+    gamepad = create_backend('recording')
+    scheduler = ReportScheduler(gamepad, 125, threaded=False)
+
+    gamepad.right_trigger_float(1.0)
+    scheduler.request_update()
+    gamepad.right_trigger_float(0.0)
+    scheduler.request_update()
+    scheduler.tick()
+    scheduler.tick()
+
+    assert [record[3] for record in gamepad.records()] == [255, 0]
+
+
+def test_trigger_release_ramp_is_not_latched():
+    gamepad = create_backend('recording')
+    scheduler = ReportScheduler(gamepad, 125, threaded=False)
+
+    gamepad.right_trigger_float(1.0)
+    scheduler.request_update()
+    scheduler.tick()
+    # Released over two steps inside one tick
+    gamepad.right_trigger_float(0.5)
+    gamepad.right_trigger_float(0.0)
+    scheduler.request_update()
+    scheduler.tick()
+    scheduler.tick()
+
+    assert [record[3] for record in gamepad.records()] == [255, 0]
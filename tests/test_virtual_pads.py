@@ -0,0 +1,40 @@
+"""Extra pads: key routing across profile reloads"""
+
+from controller_engine import ControllerEngine, InputEvent, KEY_DOWN, KEY_UP
+from output_backends import NEUTRAL_REPORT, create_backend
+from virtual_pads import PadRouter, VirtualPad, pad_settings
+
+
+class Key:
+    def __init__(self, char):
+        self.char = char
+
+
+def event(kind, char):
+    return InputEvent(0, kind, Key(char), None, None)
+
+
+def profile(buttons, movement):
+    return {
+        'button_mappings': buttons,
+        'movement_keys': dict(zip(movement, ([0, 1], [0, -1], [-1, 0], [1, 0]))),
+    }
+
+
+def test_release_after_reload_unbinds_held_keys():
+    engine = ControllerEngine(create_backend('recording'))
+    router = PadRouter()
+    pad = VirtualPad(engine, 2, pad_settings('P2', profile({'A': 'i', 'RT': 'o'}, 'kmjl')), 'recording')
+    router.add(pad)
+
+    for char in 'iok':
+        assert router.route(event(KEY_DOWN, char))
+    assert pad.gamepad.report() != NEUTRAL_REPORT
+
+    # The reloaded profile moves every held key somewhere else
+    router.update(pad, pad_settings('P2', profile({'A': 'u', 'RT': 'p'}, 'tgfh')))
+    for char in 'iok':
+        assert router.route(event(KEY_UP, char))
+
+    assert pad.gamepad.report() == NEUTRAL_REPORT
+    assert not pad.held_actions
@@ -0,0 +1,355 @@
+"""
+👥 Virtual Pads
+Several virtual controllers driven from one process, engine and listener pair.
+
+The front-end's own pad is pad 1; up to MAX_PADS - 1 extra VirtualPads
+each get their own backend device, profile, key zone and report
+scheduler. The engine's single output thread applies the events of all
+pads and ticks every pad's scheduler on the same report tick, so their
+changes go out together, one update() per changed pad per tick.
+
+Routing is one more dict lookup: PadRouter merges the extra pads'
+compiled dispatch tables into a single key -> (pad, actions) table that
+the front-end checks before its own. A pad's key zone is its profile's
+button_mappings plus an optional "movement_keys" dict (default WASD,
+which pad 1 always uses):
+
+    "movement_keys": {"up": [0, 1], "down": [0, -1], "left": [-1, 0], "right": [1, 0]}
+
+Zones may not overlap with each other or with pad 1's bindings. The mouse
+drives the right stick of one pad at a time (PadRouter.mouse_pad).
+"""
+
+from collections import namedtuple
+
+from analog_ramps import RampBank, parse_ramps
+from controller_engine import KEY_UP, MOUSE_MOVE
+from key_dispatch import BUTTON, MOVEMENT_KEYS, STICK, TRIGGER, compile_mappings, normalize_key
+from mouse_stick import DEFAULT_MOUSE_MODE, MOUSE_MODES, RelativeMouseStick
+from output_backends import DEFAULT_BACKEND, DEFAULT_OUTPUT, backend_for, create_backend
+from response_curves import ProfileCurves
+from stick_filters import StickFilter
+
+# XInput serves four controllers
+MAX_PADS = 4
+
+# Screen center for the absolute mouse mode (same as the front-ends)
+MOUSE_CENTER = (960, 540)
+
+PadSettings = namedtuple('PadSettings', 'profile output dispatch curves ramps stick_filter mouse_mode mouse_sensitivity')
+
+
+def parse_movement_keys(data):
+    """Profile "movement_keys" ({key: [x, y]}) -> {key identity: (x, y)}"""
+    if not data:
+        return MOVEMENT_KEYS
+    keys = {}
+    for key, direction in data.items():
+        try:
+            x, y = (float(v) for v in direction)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid direction for movement key {key}: {direction}")
+        if not (-1.0 <= x <= 1.0 and -1.0 <= y <= 1.0):
+            raise ValueError(f"Invalid direction for movement key {key}: {direction}")
+        keys[key.lower()] = (x, y)
+    return keys
+
+
+def pad_settings(profile_name, profile):
+    """Compile everything a pad needs from a profile (UI thread); raises ValueError"""
+    mouse_mode = profile.get('mouse_mode', DEFAULT_MOUSE_MODE)
+    if mouse_mode not in MOUSE_MODES:
+        raise ValueError(f"Unknown mouse mode: {mouse_mode}")
+    dispatch = compile_mappings(profile.get('button_mappings') or {},
+                                parse_movement_keys(profile.get('movement_keys')))
+    output = profile.get('output', DEFAULT_OUTPUT)
+    backend_for(DEFAULT_BACKEND, output)     # validates the name
+    return PadSettings(
+        profile_name,
+        output,
+        dispatch,
+        ProfileCurves.from_profile(profile, float(profile.get('sensitivity', 1.0))),
+        parse_ramps(profile.get('ramps')),
+        StickFilter.from_profile(profile.get('stick_filter')),
+        mouse_mode,
+        float(profile.get('mouse_sensitivity', 0.5)),
+    )
+
+
+class VirtualPad:
+    """An extra controller - state is only touched on the engine thread after __init__"""
+
+    def __init__(self, engine, number, settings, backend=DEFAULT_BACKEND):
+        self.engine = engine
+        self.number = number
+        # X360 or DS4 as the profile asks, on the front-end's kind of sink
+        self.gamepad = create_backend(backend_for(backend, settings.output))
+        self.scheduler = engine.add_pad(self.gamepad)
+        self.ramps = RampBank(self.apply_ramp, engine)
+        self.mouse_stick = RelativeMouseStick()
+        self.mouse_target = (0.0, 0.0)
+        self.mouse_right = (0.0, 0.0)
+        # Network clients' state, merged like on pad 1 (PadController.apply_network)
+        self.net_buttons = 0
+        self.net_lt = 0.0
+        self.net_rt = 0.0
+        self.net_left = (0.0, 0.0)
+        self.net_right = (0.0, 0.0)
+        # Held movement keys -> their left stick direction
+        self.stick_keys = {}
+        self.held_actions = {}
+        self.events = 0
+        # Not routed yet - safe to apply from here
+        self.apply_settings(settings)
+
+    def apply_settings(self, settings):
+        self.settings = settings
+        self.curves = settings.curves
+        self.ramps.configure(settings.ramps)
+        self.stick_filter = settings.stick_filter
+        self.mouse_mode = settings.mouse_mode
+        self.mouse_stick.sensitivity = settings.mouse_sensitivity
+        self.recenter_mouse_stick()
+        self.update_mouse_hook()
+
+    @property
+    def dispatch(self):
+        return self.settings.dispatch
+
+    @property
+    def profile(self):
+        return self.settings.profile
+
+    # ==========================
+    # Keys
+    # ==========================
+    def press(self, key_id, actions):
+        self.events += 1
+        if key_id in self.held_actions:
+            return      # auto-repeat
+        self.held_actions[key_id] = actions
+        for action in actions:
+            if action.kind == STICK:
+                self.stick_keys[key_id] = action.value
+                self.update_movement()
+            elif action.kind == TRIGGER:
+                self.ramps.set_target(action.name, action.value)
+            elif action.kind == BUTTON:
+                self.gamepad.press_button(action.mask)
+                self.scheduler.request_update()
+
+    def release(self, key_id):
+        self.events += 1
+        actions = self.held_actions.pop(key_id, None)
+        if not actions:
+            return
+        for action in actions:
+            if action.kind == STICK:
+                self.stick_keys.pop(key_id, None)
+                self.update_movement()
+            elif action.kind == TRIGGER:
+                self.ramps.set_target(action.name, 0.0)
+            elif action.kind == BUTTON and not action.mask & self.net_buttons:
+                self.gamepad.release_button(action.mask)
+                self.scheduler.request_update()
+
+    def update_movement(self):
+        x = sum(direction[0] for direction in self.stick_keys.values())
+        y = sum(direction[1] for direction in self.stick_keys.values())
+        x = max(-1.0, min(1.0, x))
+        y = max(-1.0, min(1.0, y))
+        # Normalize diagonal movement
+        if x != 0 and y != 0:
+            x *= 0.707
+            y *= 0.707
+        self.ramps.set_target('LX', x)
+        self.ramps.set_target('LY', y)
+
+    def apply_ramp(self, name, value):
+        if name == 'LT':
+            self.gamepad.left_trigger(self.curves.lt(max(value, self.net_lt)))
+        elif name == 'RT':
+            self.gamepad.right_trigger(self.curves.rt(max(value, self.net_rt)))
+        else:
+            x = max(-1.0, min(1.0, self.ramps.value('LX') + self.net_left[0]))
+            y = max(-1.0, min(1.0, self.ramps.value('LY') + self.net_left[1]))
+            curve = self.curves.left
+            self.gamepad.left_joystick(curve(x), curve(y))
+        self.scheduler.request_update()
+
+    # ==========================
+    # Network frames (input_server.py)
+    # ==========================
+    def apply_network(self, buttons, lt, rt, left, right):
+        if buttons != self.net_buttons:
+            self.set_net_buttons(buttons)
+        self.net_lt, self.net_rt = lt, rt
+        self.net_left, self.net_right = left, right
+        for name in ('LT', 'RT', 'LX'):
+            self.apply_ramp(name, self.ramps.value(name))
+        self.set_right_stick(*self.mouse_right)
+
+    def set_net_buttons(self, buttons):
+        # A button a key holds stays pressed
+        held = 0
+        for actions in self.held_actions.values():
+            for action in actions:
+                if action.kind == BUTTON:
+                    held |= action.mask
+        self.gamepad.release_button(self.net_buttons & ~buttons & ~held)
+        self.gamepad.press_button(buttons)
+        self.net_buttons = buttons
+        self.scheduler.request_update()
+
+    # ==========================
+    # Mouse -> right stick
+    # ==========================
+    def apply_mouse_move(self, x, y):
+        self.events += 1
+        if self.mouse_mode == 'relative':
+            self.mouse_stick.add_position(x, y)
+            return
+        center_x, center_y = MOUSE_CENTER
+        sensitivity = self.mouse_stick.sensitivity
+        dx = max(-1.0, min(1.0, (x - center_x) / center_x * sensitivity))
+        dy = max(-1.0, min(1.0, (y - center_y) / center_y * sensitivity))
+        if self.stick_filter.passthrough:
+            self.set_right_stick(dx, -dy)
+        else:
+            self.mouse_target = (dx, -dy)
+
+    def update_mouse_stick(self, now_ns):
+        # Engine tick hook - relative mode and/or right stick filter
+        if self.mouse_mode == 'relative':
+            value = self.mouse_stick.update(now_ns)
+            if value:
+                self.mouse_target = value
+        x, y = self.stick_filter.filter(self.mouse_target[0], self.mouse_target[1], now_ns)
+        self.set_right_stick(x, y)
+
+    def set_right_stick(self, x, y):
+        # Mouse position plus the network's right stick, through the curve
+        self.mouse_right = (x, y)
+        curve = self.curves.right
+        rx = curve(max(-1.0, min(1.0, x + self.net_right[0])))
+        ry = curve(max(-1.0, min(1.0, y + self.net_right[1])))
+        if rx != self.gamepad.rx or ry != self.gamepad.ry:
+            self.gamepad.right_joystick(rx, ry)
+            self.scheduler.request_update()
+
+    def update_mouse_hook(self):
+        if self.mouse_mode == 'relative' or not self.stick_filter.passthrough:
+            self.engine.add_tick_hook(self.update_mouse_stick)
+        else:
+            self.engine.remove_tick_hook(self.update_mouse_stick)
+
+    def recenter_mouse_stick(self):
+        self.mouse_stick.reset()
+        self.stick_filter.reset()
+        self.mouse_target = (0.0, 0.0)
+        self.set_right_stick(0.0, 0.0)
+
+    # ==========================
+    # Lifecycle / metrics
+    # ==========================
+    def reset(self):
+        self.held_actions.clear()
+        self.stick_keys.clear()
+        self.net_buttons = 0
+        self.net_lt = self.net_rt = 0.0
+        self.net_left = self.net_right = (0.0, 0.0)
+        self.ramps.reset()
+        self.gamepad.release_button(self.gamepad.buttons)
+        self.gamepad.left_trigger_float(0)
+        self.gamepad.right_trigger_float(0)
+        self.gamepad.left_joystick_float(0, 0)
+        self.recenter_mouse_stick()
+
+    def close(self):
+        """Neutral report, then detach from the engine (any thread)"""
+        self.engine.call(self.reset)
+        self.engine.remove_tick_hook(self.update_mouse_stick)
+        self.engine.remove_pad(self.scheduler)
+
+    def stats(self):
+        stats = {'pad': self.number, 'profile': self.profile, 'events': self.events}
+        stats.update(self.gamepad.diff_stats())
+        return stats
+
+    def format_stats(self):
+        return f"P{self.number} {self.profile}: {self.events} ev / {self.gamepad.submitted} rpt"
+
+
+class PadRouter:
+    """Key -> (pad, actions) over the extra pads, plus the mouse assignment"""
+
+    def __init__(self):
+        self.pads = ()
+        self.table = {}
+        # Held key -> the extra pad that pressed it; its release goes back
+        # there even if a reload moved the key since (engine thread)
+        self.held = {}
+        # Pad whose right stick follows the mouse - None = the front-end's own pad
+        self.mouse_pad = None
+
+    def conflicts(self, dispatch, reserved=(), pad=None):
+        """Keys of dispatch already bound by reserved (pad 1) or another extra pad than pad"""
+        table = self.table
+        return sorted(str(key) for key in dispatch
+                      if key in reserved or (key in table and table[key][0] is not pad))
+
+    def add(self, pad, reserved=()):
+        clash = self.conflicts(pad.dispatch, reserved)
+        if clash:
+            raise ValueError(f"keys already in use: {', '.join(clash)}")
+        self.pads = self.pads + (pad,)
+        self._rebuild()
+
+    def remove(self, pad):
+        self.pads = tuple(p for p in self.pads if p is not pad)
+        self.held = {key: p for key, p in self.held.items() if p is not pad}
+        self._rebuild()
+
+    def update(self, pad, settings):
+        """Engine thread - new settings (e.g. a reloaded profile) for a routed pad"""
+        pad.apply_settings(settings)
+        self._rebuild()
+
+    def _rebuild(self):
+        # Built aside and swapped whole - the engine thread reads self.table
+        table = {}
+        for pad in self.pads:
+            for key, actions in pad.dispatch.items():
+                table[key] = (pad, actions)
+        self.table = table
+
+    def route(self, event):
+        """Engine thread - apply an event that belongs to an extra pad; False = not routed"""
+        if event.kind == MOUSE_MOVE:
+            pad = self.mouse_pad
+            if pad is None:
+                return False
+            pad.apply_mouse_move(event.a, event.b)
+            return True
+        if event.kind == KEY_UP:
+            # Released where it was pressed - not where the key is bound now
+            held = self.held
+            if not held:
+                return False
+            key_id = normalize_key(event.a)
+            pad = held.pop(key_id, None)
+            if pad is None:
+                return False
+            pad.release(key_id)
+            return True
+        table = self.table
+        if not table:
+            return False
+        key_id = normalize_key(event.a)
+        route = table.get(key_id)
+        if route is None:
+            return False
+        pad, actions = route
+        self.held[key_id] = pad
+        pad.press(key_id, actions)
+        return True